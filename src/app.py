@@ -22,7 +22,7 @@ from services.data.database import Database
 from services.sync.scheduler import Scheduler
 from services.media.image_service import ImageService
 from services.analytics.statistics_service import StatisticsService
-from services.sync.sync_manager import sync_images, sync_all, schedule_sync_tasks, sync_images_override
+from services.sync.sync_manager import sync_images, schedule_sync_tasks, sync_images_override
 
 # 配置日志
 logger = get_logger("flask_app")
@@ -62,7 +62,7 @@ def create_app(test_config=None):
         return None, None, None, None, None
         
     # 注册优雅关闭处理函数
-    register_shutdown_handler()
+    register_shutdown_handler(scheduler)
     
     return app, db, stats_service, scheduler, image_service
 
@@ -161,11 +161,17 @@ def initialize_components(app_config):
             
         return None, None, None, None
 
-def register_shutdown_handler():
-    """注册信号处理函数，用于优雅关闭应用"""
+def register_shutdown_handler(scheduler=None):
+    """注册信号处理函数，用于优雅关闭应用
+    
+    参数:
+        scheduler: 调度器实例，关闭时通知其定期任务退出
+    """
     def graceful_shutdown(signum, frame):
         logger.info("接收到关闭信号，正在关闭应用...")
-        # 这里可以添加清理逻辑，如关闭连接等
+        # 停止定期同步任务
+        if scheduler:
+            scheduler.shutdown()
         sys.exit(0)
 
     # 注册信号处理函数
@@ -202,7 +208,7 @@ def main():
     
     if args.sync:
         logger.info("执行启动时全量同步...")
-        success = sync_all(scheduler, incremental=False)
+        success = scheduler.sync_all_data(incremental=False)
         if success:
             logger.info("全量同步完成")
             # 同步完成后清除统计缓存
@@ -213,7 +219,7 @@ def main():
     # 如果指定了启动时增量同步
     elif args.sync_incremental:
         logger.info("执行启动时增量同步...")
-        success = sync_all(scheduler, incremental=True)
+        success = scheduler.sync_all_data(incremental=True)
         if success:
             logger.info("增量同步完成")
             stats_service.clear_caches()
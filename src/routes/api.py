@@ -80,6 +80,20 @@ def api_error(message: str, status_code: int = 400, error_type: str = 'BadReques
     }
     return jsonify(error_response), status_code
 
+def dashboard_response(data: Dict[str, Any], json_bytes: Optional[bytes]) -> tuple:
+    """创建仪表板响应，优先使用统计服务预先序列化的JSON
+    
+    参数:
+        data: 仪表板数据
+        json_bytes: 统计服务写入缓存的JSON字节，为None时按标准API响应序列化
+        
+    返回:
+        Flask响应元组
+    """
+    if json_bytes is None:
+        return api_response(data)
+    return current_app.response_class(json_bytes, mimetype='application/json'), 200
+
 def check_services() -> Optional[tuple]:
     """检查必要的服务实例是否已初始化
     
@@ -241,9 +255,10 @@ def get_statistics():
     
     try:
         skip_cache = validate_bool(request.args.get('skip_cache'), 'skip_cache', False)
-        result = stats_service.get_dashboard(type_=None, skip_cache=skip_cache)
+        result, json_bytes = stats_service.get_dashboard_with_json(type_=None, skip_cache=skip_cache)
         
-        return api_response(result)
+        # 优先返回预先序列化的JSON
+        return dashboard_response(result, json_bytes)
     except Exception as e:
         logger.error(f"获取统计数据失败: {e}")
         return api_error(f"获取统计数据失败: {str(e)}", status_code=500, error_type="InternalServerError")
@@ -516,9 +531,10 @@ def get_complete_stats():
     try:
         # 检查是否跳过缓存
         skip_cache = validate_bool(request.args.get('skip_cache'), 'skip_cache', False)
-        result = stats_service.get_dashboard(type_=None, skip_cache=skip_cache)
+        result, json_bytes = stats_service.get_dashboard_with_json(type_=None, skip_cache=skip_cache)
         
-        return api_response(result)
+        # 优先返回预先序列化的JSON
+        return dashboard_response(result, json_bytes)
     except Exception as e:
         logger.error(f"获取完整统计失败: {e}")
         return api_error(f"获取完整统计失败: {str(e)}", status_code=500, error_type="InternalServerError")
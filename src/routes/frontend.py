@@ -11,7 +11,7 @@ from datetime import datetime
 from utils.logger import get_logger
 from config import config
 from datetime import datetime
-from utils.serialization_utils import safe_serialize, safe_json_loads  # 添加安全序列化工具
+from utils.serialization_utils import safe_serialize, safe_serialize_many, safe_json_loads  # 添加安全序列化工具
 
 
 frontend_bp = Blueprint('frontend', __name__)
@@ -201,29 +201,8 @@ def type_page(type_):
                 offset=offset,
                 **filters  # 添加额外筛选条件
             )
-            # 获取总条目数（用于分页）
-            count_query = f"SELECT COUNT(*) as count FROM interests WHERE type = ?"
-            params = [type_]
-            
-            if status_param:
-                count_query += " AND status = ?"
-                params.append(status_param)
-                
-            if 'year' in filters:
-                count_query += " AND year = ?"
-                params.append(filters['year'])
-                
-            if 'genre' in filters:
-                count_query += " AND genres LIKE ?"
-                params.append(f"%{filters['genre']}%")
-                
-            if 'search_query' in filters:
-                count_query += " AND (card_subtitle LIKE ? OR title LIKE ?)"
-                params.append(f"%{filters['search_query']}%")
-                params.append(f"%{filters['search_query']}%")
-                
-            count_result = db.execute_query(count_query, tuple(params))
-            total = count_result[0]['count'] if count_result else 0
+            # 获取总条目数（用于分页），筛选条件与列表查询一致
+            total = db.count_interests(type_=type_, status=status_param, **filters)
             
             # 安全序列化处理
             items = _safe_serialize(items)
@@ -479,7 +458,9 @@ def _safe_serialize(obj):
     返回:
         可安全序列化的对象
     """
-    # 我们可以直接使用导入的 safe_serialize
+    # 记录列表按批处理，结构相同的记录无需逐个重新检查
+    if isinstance(obj, list):
+        return safe_serialize_many(obj)
     return safe_serialize(obj)
 
 def get_total_count():
@@ -7,6 +7,8 @@ CREATE TABLE IF NOT EXISTS schema_version (
 
 -- 插入初始版本记录
 INSERT OR IGNORE INTO schema_version (version, description) VALUES (1, '初始数据库结构');
+INSERT OR IGNORE INTO schema_version (version, description) VALUES (2, '新增标签关联表及索引');
+INSERT OR IGNORE INTO schema_version (version, description) VALUES (3, '新增同步水位表');
 
 -- 主数据表（统一内容类型存储）
 CREATE TABLE IF NOT EXISTS interests (
@@ -53,6 +55,48 @@ CREATE INDEX IF NOT EXISTS idx_interests_type ON interests(type);
 CREATE INDEX IF NOT EXISTS idx_interests_type_year ON interests(type, year);
 CREATE INDEX IF NOT EXISTS idx_interests_type_score ON interests(type, douban_score);
 
+-- 8. 覆盖索引，用于按类型和状态筛选后按时间排序，以及查询各状态最新时间戳
+CREATE INDEX IF NOT EXISTS idx_interests_type_status_ctime ON interests(type, status, create_time);
+
+-- 9. 部分索引，只包含尚未缓存本地图片的条目
+CREATE INDEX IF NOT EXISTS idx_interests_missing_image ON interests(id, type, title, cover_url)
+WHERE local_path IS NULL AND cover_url != '';
+
+-- 标签关联表，将genres字段中的JSON列表拆分为单独的行，便于按标签精确筛选
+CREATE TABLE IF NOT EXISTS interest_genres (
+    interest_id TEXT NOT NULL REFERENCES interests(id) ON DELETE CASCADE,
+    genre TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_interest_genres_genre ON interest_genres(genre, interest_id);
+CREATE INDEX IF NOT EXISTS idx_interest_genres_interest ON interest_genres(interest_id);
+
+-- 插入或修改genres时同步标签关联表（无效的JSON按空列表处理）
+CREATE TRIGGER IF NOT EXISTS sync_interest_genres_insert
+AFTER INSERT ON interests
+BEGIN
+    INSERT INTO interest_genres (interest_id, genre)
+    SELECT NEW.id, TRIM(value)
+    FROM json_each(CASE WHEN json_valid(NEW.genres) THEN NEW.genres ELSE '[]' END)
+    WHERE TRIM(value) != '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS sync_interest_genres_update
+AFTER UPDATE OF genres ON interests
+BEGIN
+    DELETE FROM interest_genres WHERE interest_id = OLD.id;
+    INSERT INTO interest_genres (interest_id, genre)
+    SELECT NEW.id, TRIM(value)
+    FROM json_each(CASE WHEN json_valid(NEW.genres) THEN NEW.genres ELSE '[]' END)
+    WHERE TRIM(value) != '';
+END;
+
+-- 同步水位表，记录上次同步时间点和预检条件请求的校验头，进程重启后仍然有效
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    name TEXT PRIMARY KEY,
+    ts TEXT NOT NULL
+);
+
 -- 创建触发器，自动更新update_time字段
 CREATE TRIGGER IF NOT EXISTS update_interests_timestamp 
 AFTER UPDATE ON interests
@@ -1,5 +1,6 @@
 import re
 import time
+import threading
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from utils.logger import get_logger
@@ -30,6 +31,7 @@ class DataAnalyzer:
         # 缓存
         self._cache = {}
         self._cache_times = {}
+        self._cache_lock = threading.Lock()
         
         logger.info("数据分析器初始化完成")
         
@@ -46,27 +48,67 @@ class DataAnalyzer:
         """
         now = time.time()
         
-        # 检查缓存是否有效
-        if (key in self._cache and key in self._cache_times and 
-            now - self._cache_times[key] < self.CACHE_TTL):
+        # 检查缓存是否有效（加锁读取，避免与清除缓存交错）
+        with self._cache_lock:
+            cached_time = self._cache_times.get(key)
+            is_fresh = cached_time is not None and key in self._cache and now - cached_time < self.CACHE_TTL
+            if is_fresh:
+                cached = self._cache[key]
+        if is_fresh:
             logger.debug(f"从缓存获取数据: {key}")
-            return self._cache[key]
+            return cached
             
         # 缓存不存在或已过期，重新获取数据
         logger.debug(f"重新获取数据: {key}")
         result = fetch_func(*args, **kwargs)
         
         # 更新缓存
-        self._cache[key] = result
-        self._cache_times[key] = now
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache_times[key] = now
         
         return result
         
-    def clear_cache(self):
-        """清除所有缓存"""
-        self._cache.clear()
-        self._cache_times.clear()
-        logger.info("已清除所有分析缓存")
+    @staticmethod
+    def related_cache_types(types) -> set:
+        """扩展受影响的内容类型，包含共用同一份统计数据的类型
+        
+        电影统计同时包含电视剧数据，且电影与剧集仪表板共用电影统计，
+        因此两者任一受影响时都需要一并清除
+        
+        参数:
+            types: 受影响的内容类型
+            
+        返回:
+            扩展后的内容类型集合
+        """
+        expanded = set(types)
+        if expanded & {'movie', 'tv'}:
+            expanded.update(('movie', 'tv'))
+        return expanded
+        
+    def clear_cache(self, types: Optional[set] = None):
+        """清除缓存
+        
+        参数:
+            types: 可选，只清除与这些内容类型相关的缓存（包括全部类型汇总的缓存），不提供则清除所有缓存
+        """
+        if types is None:
+            with self._cache_lock:
+                self._cache.clear()
+                self._cache_times.clear()
+            logger.info("已清除所有分析缓存")
+            return
+            
+        scopes = self.related_cache_types(types) | {'all', 'complete'}
+            
+        # 缓存键由下划线分隔，其中一段为内容类型或 all
+        with self._cache_lock:
+            stale_keys = [key for key in list(self._cache) if scopes.intersection(key.split('_'))]
+            for key in stale_keys:
+                self._cache.pop(key, None)
+                self._cache_times.pop(key, None)
+        logger.info(f"已清除 {len(stale_keys)} 条与 {sorted(types)} 相关的分析缓存")
         
     def _extract_metadata(self, content_type: str, card_subtitle: str) -> Dict[str, Any]:
         """从card_subtitle提取元数据
@@ -1019,20 +1061,22 @@ class DataAnalyzer:
                 'trends': {'labels': [], 'values': []}
             }
 
-    def fix_invalid_data(self) -> Dict[str, int]:
+    def fix_invalid_data(self) -> Dict[str, Any]:
         """修复数据库中的无效数据
         
         修复可能导致统计失败的无效数据格式
         
         返回:
-            dict: 修复的记录数统计
+            dict: 修复的记录数统计，affected_types 为涉及修复的内容类型列表
         """
         fixes = {
             'genres': 0,
             'card_subtitle': 0,
             'create_time': 0,
-            'total': 0
+            'total': 0,
+            'affected_types': []
         }
+        affected_types = set()
         
         try:
             # 1. 修复无效的genres JSON
@@ -1040,23 +1084,30 @@ class DataAnalyzer:
             for row in invalid_genres:
                 if self.provider.fix_invalid_genres(row.get('id')):
                     fixes['genres'] += 1
+                    affected_types.add(row.get('type'))
                 
             # 2. 修复空的card_subtitle
+            subtitle_types = self.provider.find_null_card_subtitle_types()
             subtitle_count = self.provider.fix_null_card_subtitles()
             fixes['card_subtitle'] = subtitle_count
+            if subtitle_count > 0:
+                affected_types.update(subtitle_types)
             
             # 3. 修复无效的create_time格式
             invalid_dates = self.provider.find_invalid_dates()
             for row in invalid_dates:
                 if self.provider.fix_invalid_date(row.get('id')):
                     fixes['create_time'] += 1
+                    affected_types.add(row.get('type'))
             
             # 计算总修复数
             fixes['total'] = fixes['genres'] + fixes['card_subtitle'] + fixes['create_time']
+            affected_types.discard(None)
+            fixes['affected_types'] = sorted(affected_types)
             
-            # 如果有修复，清除缓存
+            # 如果有修复，只清除受影响类型的缓存
             if fixes['total'] > 0:
-                self.clear_cache()
+                self.clear_cache(types=affected_types)
                 logger.info(f"已修复 {fixes['total']} 条无效数据记录")
                 
             return fixes
@@ -4,6 +4,7 @@ import time
 import threading
 from typing import Dict, List, Any, Optional
 from utils.logger import get_logger
+from utils.serialization_utils import serialize_rows
 
 # 配置日志
 logger = get_logger("data_provider")
@@ -68,11 +69,7 @@ class StatisticsDataProvider:
     def _return_connection(self, conn: sqlite3.Connection) -> None:
         """将连接返回连接池"""
         if self.db:
-            # 使用外部数据库实例归还连接
-            if hasattr(self.db, "_return_to_pool"):
-                self.db._return_to_pool(conn)
-            else:
-                conn.close()
+            # 外部数据库实例的只读连接按线程持有，无需归还
             return
             
         # 使用自己的连接池
@@ -120,12 +117,7 @@ class StatisticsDataProvider:
             rows = cursor.fetchall()
             
             # 将 sqlite3.Row 对象转换为普通字典
-            results = []
-            for row in rows:
-                item = {}
-                for key in row.keys():
-                    item[key] = row[key]
-                results.append(item)
+            results = serialize_rows(rows)
                 
             # 记录查询时间
             query_time = time.time() - start_time
@@ -676,10 +668,35 @@ class StatisticsDataProvider:
     # 数据修复查询
     # ------------------------------------------------------------
     
+    def _execute_update(self, query: str, params: tuple = ()) -> int:
+        """执行写操作
+        
+        使用外部数据库实例时交给其写连接执行，否则使用自己的连接
+        
+        参数:
+            query: SQL语句
+            params: 参数
+            
+        返回:
+            受影响的行数
+        """
+        if self.db:
+            result = self.db.execute_query(query, params)
+            return result[0]["rowcount"] if result else 0
+            
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            self._return_connection(conn)
+            
     def find_invalid_genres(self) -> List[Dict[str, Any]]:
         """查找无效的genres JSON数据"""
         query = """
-        SELECT id, genres FROM interests 
+        SELECT id, type, genres FROM interests 
         WHERE genres IS NOT NULL AND genres != '' AND NOT json_valid(genres)
         """
         return self._execute_query(query)
@@ -687,26 +704,21 @@ class StatisticsDataProvider:
     def fix_invalid_genres(self, item_id: str) -> bool:
         """修复无效的genres JSON数据"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE interests SET genres = '[]' WHERE id = ?", (item_id,))
-            conn.commit()
-            self._return_connection(conn)
+            self._execute_update("UPDATE interests SET genres = '[]' WHERE id = ?", (item_id,))
             return True
         except sqlite3.Error as e:
             logger.error(f"修复无效的genres JSON数据失败: {e}")
             return False
             
+    def find_null_card_subtitle_types(self) -> List[str]:
+        """查找存在空card_subtitle字段的内容类型"""
+        query = "SELECT DISTINCT type FROM interests WHERE card_subtitle IS NULL"
+        return [row['type'] for row in self._execute_query(query)]
+        
     def fix_null_card_subtitles(self) -> int:
         """修复空的card_subtitle字段"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE interests SET card_subtitle = '' WHERE card_subtitle IS NULL")
-            rowcount = cursor.rowcount
-            conn.commit()
-            self._return_connection(conn)
-            return rowcount
+            return self._execute_update("UPDATE interests SET card_subtitle = '' WHERE card_subtitle IS NULL")
         except sqlite3.Error as e:
             logger.error(f"修复空的card_subtitle字段失败: {e}")
             return 0
@@ -714,7 +726,7 @@ class StatisticsDataProvider:
     def find_invalid_dates(self) -> List[Dict[str, Any]]:
         """查找无效的create_time日期格式"""
         query = """
-        SELECT id, create_time FROM interests
+        SELECT id, type, create_time FROM interests
         WHERE create_time IS NOT NULL AND 
             create_time != '' AND
             strftime('%Y-%m-%d', create_time) IS NULL
@@ -724,11 +736,7 @@ class StatisticsDataProvider:
     def fix_invalid_date(self, item_id: str) -> bool:
         """修复指定条目的无效日期"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE interests SET create_time = CURRENT_TIMESTAMP WHERE id = ?", (item_id,))
-            conn.commit()
-            self._return_connection(conn)
+            self._execute_update("UPDATE interests SET create_time = CURRENT_TIMESTAMP WHERE id = ?", (item_id,))
             return True
         except sqlite3.Error as e:
             logger.error(f"修复无效日期失败: {e}")
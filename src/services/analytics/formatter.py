@@ -1,12 +1,56 @@
 import json
 import time
+import heapq
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
 from utils.logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
 # 配置日志
 logger = get_logger("formatter")
 
+# 无数据时共享的空图表数据，只读使用，不可修改
+_EMPTY_CHART = {'labels': (), 'values': (), 'raw_data': {}}
+
+@lru_cache(maxsize=4096)
+def _truncate_label_cached(label: str, max_len: int = 12) -> str:
+    """截断过长的标签文本，按(标签, 最大长度)缓存结果"""
+    if not label or len(label) <= max_len:
+        return label
+        
+    # 特别处理带有方括号的标签（如作者名）
+    if label.startswith('['):
+        bracket_end = label.find(']')
+        if 0 < bracket_end < max_len:
+            # 保留方括号内容，截断后面的部分
+            return label[:bracket_end+1] + label[bracket_end+1:max_len-2].strip() + '...'
+    
+    # 普通截断
+    return label[:max_len-3].strip() + '...'
+
+@lru_cache(maxsize=256)
+def _format_trend_label(label: str) -> str:
+    """格式化趋势标签，月份格式 "2023-01" 变为 "1月"，年份格式保持不变"""
+    # 常见的 "YYYY-MM" 格式直接按位置取月份，无需分割字符串
+    if len(label) == 7 and label[4] == '-':
+        month = label[5:7]
+        if month.isdigit():
+            return f"{int(month)}月"
+        return label
+        
+    if '-' in label:  # 其他月份格式
+        month = label.split('-', 1)[1]
+        return f"{int(month)}月" if month.isdigit() else label
+        
+    return label  # 年份格式
+
 class StatisticsFormatter:
     """统计数据格式化器，负责将分析数据转换为前端可用的格式
     
@@ -23,6 +67,9 @@ class StatisticsFormatter:
         }
     }
     
+    # 评分图表固定为10个柱，预先生成循环使用的配色
+    _PRIMARY_10 = tuple((CHART_COLORS['primary'] * 2)[:10])
+    
     # 类型显示名称映射
     TYPE_DISPLAY_NAMES = {
         'movie': '电影',
@@ -40,6 +87,19 @@ class StatisticsFormatter:
         'wish': '想看'
     }
     
+    # 预绑定的映射查找函数，避免逐项的方法调用开销
+    _TYPE_GET = TYPE_DISPLAY_NAMES.get
+    _STATUS_GET = STATUS_DISPLAY_NAMES.get
+    
+    # 类型特有的额外数据字段: 类型 -> [(源字段, 结果字段, 是否截断标签)]
+    _EXTRA_FIELDS = {
+        'movie': [('regions', 'regions', False)],          # 地区数据
+        'tv': [('regions', 'regions', False)],
+        'book': [('publishers', 'publishers', True),       # 出版社数据
+                 ('authors', 'authors', True)],            # 作者数据
+        'game': [('developers', 'developers', True)]       # 开发商数据
+    }
+    
     def __init__(self, analyzer=None):
         """初始化格式化器
         
@@ -51,43 +111,69 @@ class StatisticsFormatter:
     
     def _localize_type_name(self, type_name: str) -> str:
         """将类型名称本地化为中文显示名称"""
-        return self.TYPE_DISPLAY_NAMES.get(type_name, type_name)
+        return self._TYPE_GET(type_name, type_name)
     
     def _localize_status_name(self, status_name: str) -> str:
         """将状态名称本地化为中文显示名称"""
-        return self.STATUS_DISPLAY_NAMES.get(status_name, status_name)
+        return self._STATUS_GET(status_name, status_name)
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _status_colors(statuses: Tuple[str, ...]) -> Tuple[str, ...]:
+        """获取状态序列对应的图表颜色，按状态元组缓存结果"""
+        status_colors = StatisticsFormatter.CHART_COLORS['status']
+        return tuple(status_colors.get(s, '#999') for s in statuses)
     
+    @staticmethod
+    def _unzip_items(items) -> Tuple[List, List]:
+        """将键值对序列一次性拆分为标签列表和数值列表"""
+        pairs = list(items)
+        if not pairs:
+            return [], []
+        labels, values = zip(*pairs)
+        return list(labels), list(values)
+        
     def _sort_dict_by_key(self, data: Dict) -> Dict:
         """按键名排序字典"""
-        return {k: data[k] for k in sorted(data.keys())}
+        return dict(sorted(data.items()))
         
     def _sort_dict_by_value(self, data: Dict, reverse: bool = True) -> Dict:
         """按值排序字典"""
-        return {k: v for k, v in sorted(data.items(), key=lambda item: item[1], reverse=reverse)}
+        return dict(sorted(data.items(), key=itemgetter(1), reverse=reverse))
         
-    def _find_top_n_rest(self, data: Dict[str, int], n: int = 10) -> Tuple[Dict[str, int], int]:
-        """提取字典中前N个键值对，其余归入'其他'类别
+    def _topn_chart(self, data: Dict[str, int], n: int = 10, truncate: bool = False) -> Dict[str, Any]:
+        """提取字典中前N个键值对生成图表数据，其余归入'其他'类别
         
         参数:
             data: 原始数据字典
             n: 提取的前N项数量
+            truncate: 是否截断过长的标签
             
         返回:
-            (前N项字典, 其余项总和)
+            包含labels、values和raw_data的图表数据
         """
         if len(data) <= n:
-            return data, 0
+            labels = list(data)
+            values = list(data.values())
+        else:
+            # 只选出前N项，无需对整个字典排序；直接按键选取，避免为每项构造元组
+            labels = heapq.nlargest(n, data, key=data.__getitem__)
+            values = [data[k] for k in labels]
             
-        # 按值排序
-        sorted_items = sorted(data.items(), key=lambda x: x[1], reverse=True)
-        
-        # 提取前N项
-        top_n = dict(sorted_items[:n])
-        
-        # 计算其余项总和
-        rest_sum = sum(v for _, v in sorted_items[n:])
-        
-        return top_n, rest_sum
+            # 其余项总和归入"其他"类别
+            rest = sum(data.values()) - sum(values)
+            if rest > 0:
+                labels.append('其他')
+                values.append(rest)
+                
+        if truncate:
+            labels = [self._truncate_label(l) for l in labels]
+            
+        return {
+            'labels': labels,
+            'values': values,
+            'raw_data': data
+        }
         
     def _truncate_label(self, label: str, max_len: int = 12) -> str:
         """截断过长的标签文本
@@ -99,18 +185,7 @@ class StatisticsFormatter:
         返回:
             截断后的标签
         """
-        if not label or len(label) <= max_len:
-            return label
-            
-        # 特别处理带有方括号的标签（如作者名）
-        if label.startswith('['):
-            bracket_end = label.find(']')
-            if 0 < bracket_end < max_len:
-                # 保留方括号内容，截断后面的部分
-                return label[:bracket_end+1] + label[bracket_end+1:max_len-2].strip() + '...'
-        
-        # 普通截断
-        return label[:max_len-3].strip() + '...'
+        return _truncate_label_cached(label, max_len)
         
     def format_basic_statistics(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """格式化基本统计信息
@@ -124,28 +199,27 @@ class StatisticsFormatter:
         if not data:
             return {}
             
-        result = {
-            'total': data.get('total_count', 0),
-        }
-        
-        # 处理类型计数
         type_counts = data.get('type_counts', {})
-        result['type_stats'] = {
-            'labels': [self._localize_type_name(t) for t in type_counts.keys()],
-            'values': list(type_counts.values()),
-            'raw_data': type_counts
-        }
-        
-        # 处理状态计数
         status_counts = data.get('status_counts', {})
-        result['status_stats'] = {
-            'labels': [self._localize_status_name(s) for s in status_counts.keys()],
-            'values': list(status_counts.values()),
-            'raw_data': status_counts,
-            'colors': [self.CHART_COLORS['status'].get(s, '#999') for s in status_counts.keys()]
-        }
+        type_get = self._TYPE_GET
+        status_get = self._STATUS_GET
         
-        return result
+        return {
+            'total': data.get('total_count', 0),
+            # 处理类型计数
+            'type_stats': {
+                'labels': [type_get(t, t) for t in type_counts],
+                'values': list(type_counts.values()),
+                'raw_data': type_counts
+            },
+            # 处理状态计数
+            'status_stats': {
+                'labels': [status_get(s, s) for s in status_counts],
+                'values': list(status_counts.values()),
+                'raw_data': status_counts,
+                'colors': list(self._status_colors(tuple(status_counts)))
+            }
+        }
         
     def format_content_type_statistics(self, type_: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """格式化特定内容类型的统计信息
@@ -160,148 +234,65 @@ class StatisticsFormatter:
         if not data:
             return {}
             
-        result = {
-            'type': type_,
-            'display_name': self._localize_type_name(type_),
-            'total': data.get('total', 0)
-        }
-        
         # 处理状态统计
         status_data = data.get('status', {})
-        result['status'] = {
-            'labels': [self._localize_status_name(s) for s in status_data.keys()],
+        status_get = self._STATUS_GET
+        status_chart = {
+            'labels': [status_get(s, s) for s in status_data],
             'values': list(status_data.values()),
-            'colors': [self.CHART_COLORS['status'].get(s, '#999') for s in status_data.keys()]
+            'colors': list(self._status_colors(tuple(status_data)))
         }
         
         # 处理标签/分类统计
         genres_data = data.get('genres', {})
         if genres_data:
             # 找出前10个标签，其余归为"其他"
-            top_genres, rest = self._find_top_n_rest(genres_data, 10)
-            
-            # 添加"其他"类别（如果有）
-            if rest > 0:
-                chart_genres = dict(top_genres)
-                chart_genres['其他'] = rest
-            else:
-                chart_genres = top_genres
-                
-            result['genres'] = {
-                'labels': list(chart_genres.keys()),
-                'values': list(chart_genres.values()),
-                'raw_data': genres_data
-            }
+            genres_chart = self._topn_chart(genres_data, 10)
         else:
-            result['genres'] = {'labels': [], 'values': [], 'raw_data': {}}
+            genres_chart = _EMPTY_CHART
             
         # 处理评分分布
         ratings_data = data.get('ratings', {})
         if ratings_data:
             # 确保评分组按逻辑顺序排列
             rating_order = ['未评分', '1-2星', '3-5星', '6-7星', '8-10星']
-            sorted_ratings = {k: ratings_data.get(k, 0) for k in rating_order if k in ratings_data}
-            
-            result['ratings'] = {
-                'labels': list(sorted_ratings.keys()),
-                'values': list(sorted_ratings.values()),
+            rating_labels = [k for k in rating_order if k in ratings_data]
+            ratings_chart = {
+                'labels': rating_labels,
+                'values': [ratings_data[k] for k in rating_labels],
                 'raw_data': ratings_data
             }
         else:
-            result['ratings'] = {'labels': [], 'values': [], 'raw_data': {}}
+            ratings_chart = _EMPTY_CHART
         
         # 处理年份统计
         years_data = data.get('years', {})
         if years_data:
             # 年份需要排序
-            sorted_years = self._sort_dict_by_key(years_data)
-            result['years'] = {
-                'labels': list(sorted_years.keys()),
-                'values': list(sorted_years.values()),
+            year_labels, year_values = self._unzip_items(sorted(years_data.items()))
+            years_chart = {
+                'labels': year_labels,
+                'values': year_values,
                 'raw_data': years_data
             }
         else:
-            result['years'] = {'labels': [], 'values': [], 'raw_data': {}}
-            
-        # 处理类型特有的额外数据
-        if type_ == 'movie' or type_ == 'tv':
-            # 地区数据
-            regions_data = data.get('regions', {})
-            if regions_data:
-                # 找出前10个地区，其余归为"其他"
-                top_regions, rest = self._find_top_n_rest(regions_data, 10)
-                
-                # 添加"其他"类别（如果有）
-                if rest > 0:
-                    chart_regions = dict(top_regions)
-                    chart_regions['其他'] = rest
-                else:
-                    chart_regions = top_regions
-                    
-                result['regions'] = {
-                    'labels': list(chart_regions.keys()),
-                    'values': list(chart_regions.values()),
-                    'raw_data': regions_data
-                }
-                
-        elif type_ == 'book':
-            # 出版社数据
-            publishers_data = data.get('publishers', {})
-            if publishers_data:
-                # 找出前10个出版社，其余归为"其他"
-                top_publishers, rest = self._find_top_n_rest(publishers_data, 10)
-                
-                # 添加"其他"类别（如果有）
-                if rest > 0:
-                    chart_publishers = dict(top_publishers)
-                    chart_publishers['其他'] = rest
-                else:
-                    chart_publishers = top_publishers
-                    
-                result['publishers'] = {
-                    'labels': [self._truncate_label(l) for l in chart_publishers.keys()],
-                    'values': list(chart_publishers.values()),
-                    'raw_data': publishers_data
-                }
-                
-            # 作者数据
-            authors_data = data.get('authors', {})
-            if authors_data:
-                # 找出前10个作者，其余归为"其他"
-                top_authors, rest = self._find_top_n_rest(authors_data, 10)
-                
-                # 添加"其他"类别（如果有）
-                if rest > 0:
-                    chart_authors = dict(top_authors)
-                    chart_authors['其他'] = rest
-                else:
-                    chart_authors = top_authors
-                    
-                result['authors'] = {
-                    'labels': [self._truncate_label(l) for l in chart_authors.keys()],
-                    'values': list(chart_authors.values()),
-                    'raw_data': authors_data
-                }
-                
-        elif type_ == 'game':
-            # 开发商数据
-            developers_data = data.get('developers', {})
-            if developers_data:
-                # 找出前10个开发商，其余归为"其他"
-                top_developers, rest = self._find_top_n_rest(developers_data, 10)
-                
-                # 添加"其他"类别（如果有）
-                if rest > 0:
-                    chart_developers = dict(top_developers)
-                    chart_developers['其他'] = rest
-                else:
-                    chart_developers = top_developers
-                    
-                result['developers'] = {
-                    'labels': [self._truncate_label(l) for l in chart_developers.keys()],
-                    'values': list(chart_developers.values()),
-                    'raw_data': developers_data
-                }
+            years_chart = _EMPTY_CHART
+            
+        result = {
+            'type': type_,
+            'display_name': self._localize_type_name(type_),
+            'total': data.get('total', 0),
+            'status': status_chart,
+            'genres': genres_chart,
+            'ratings': ratings_chart,
+            'years': years_chart
+        }
+        
+        # 处理类型特有的额外数据，找出前10项，其余归为"其他"
+        for source_key, dest_key, truncate in self._EXTRA_FIELDS.get(type_, ()):
+            field_data = data.get(source_key, {})
+            if field_data:
+                result[dest_key] = self._topn_chart(field_data, 10, truncate=truncate)
                 
         return result
         
@@ -334,7 +325,7 @@ class StatisticsFormatter:
             'chart': {
                 'labels': labels,
                 'values': distribution,
-                'colors': self.CHART_COLORS['primary'] * 2  # 循环使用颜色
+                'colors': self._PRIMARY_10  # 循环使用颜色
             }
         }
         
@@ -356,10 +347,13 @@ class StatisticsFormatter:
         values = data.get('all', [])
         
         # 对数据进行降采样，避免图表上显示太多点
-        if len(labels) > 20:
-            step = max(1, len(labels) // 20)  # 保持最多20个点
-            labels = labels[::step]
-            values = values[::step]
+        n = len(labels)
+        if n > 20 and len(values) == n:
+            # 按区间聚合为最多20个点，区间内计数求和以保持总数不变
+            bins = 20
+            bounds = [i * n // bins for i in range(bins + 1)]
+            labels = [labels[bounds[i]] for i in range(bins)]
+            values = [sum(values[bounds[i]:bounds[i + 1]]) for i in range(bins)]
         
         result = {
             'chart': {
@@ -422,33 +416,16 @@ class StatisticsFormatter:
         if not data:
             return {'labels': [], 'values': []}
             
-        labels = data.get('labels', [])
-        values = data.get('values', [])
-        
         # 反转数据顺序（最新的在右侧）
-        labels = list(reversed(labels))
-        values = list(reversed(values))
+        original_labels = data.get('labels', [])[::-1]
         
         # 格式化月份标签，从 "2023-01" 变为 "1月"
-        formatted_labels = []
-        for label in labels:
-            if '-' in label:  # 月份格式
-                try:
-                    year_month = label.split('-')
-                    if len(year_month) == 2:
-                        month = int(year_month[1])
-                        formatted_labels.append(f"{month}月")
-                    else:
-                        formatted_labels.append(label)
-                except:
-                    formatted_labels.append(label)
-            else:  # 年份格式
-                formatted_labels.append(label)
+        formatted_labels = [_format_trend_label(label) for label in original_labels]
         
         result = {
             'labels': formatted_labels,
-            'original_labels': labels,
-            'values': values,
+            'original_labels': original_labels,
+            'values': data.get('values', [])[::-1],
             'colors': [self.CHART_COLORS['primary'][0]]  # 使用主色
         }
         
@@ -488,11 +465,11 @@ class StatisticsFormatter:
         decades_data = data.get('decades', {})
         if decades_data:
             # 按年代排序
-            sorted_decades = self._sort_dict_by_key(decades_data)
+            decade_labels, decade_values = self._unzip_items(sorted(decades_data.items()))
             result['decades'] = {
-                'labels': list(sorted_decades.keys()),
-                'values': list(sorted_decades.values()),
-                'colors': self.CHART_COLORS['primary'][:len(sorted_decades)]
+                'labels': decade_labels,
+                'values': decade_values,
+                'colors': self.CHART_COLORS['primary'][:len(decade_labels)]
             }
             
         # 评分最高的标签
@@ -506,27 +483,17 @@ class StatisticsFormatter:
             }
             
         # 统计看过的国家/地区
-        regions = {}
-        for container in [movie_data, tv_data]:
-            container_regions = container.get('regions', {})
-            for region, count in container_regions.items():
-                regions[region] = regions.get(region, 0) + count
+        regions = Counter()
+        regions.update(movie_data.get('regions', {}))
+        regions.update(tv_data.get('regions', {}))
         
         if regions:
             # 找出前10个地区，其余归为"其他"
-            top_regions, rest = self._find_top_n_rest(regions, 10)
-            
-            # 添加"其他"类别（如果有）
-            if rest > 0:
-                chart_regions = dict(top_regions)
-                chart_regions['其他'] = rest
-            else:
-                chart_regions = top_regions
-                
+            chart_regions = self._topn_chart(regions, 10)
             result['regions'] = {
-                'labels': list(chart_regions.keys()),
-                'values': list(chart_regions.values()),
-                'colors': self.CHART_COLORS['primary'][:len(chart_regions)]
+                'labels': chart_regions['labels'],
+                'values': chart_regions['values'],
+                'colors': self.CHART_COLORS['primary'][:len(chart_regions['labels'])]
             }
             
         return result
@@ -621,8 +588,24 @@ class StatisticsFormatter:
             
         return result
         
+    def _safe_fetch(self, fetch_func, *args, **kwargs) -> Any:
+        """调用分析器获取数据，出错时记录日志并返回空字典
+        
+        参数:
+            fetch_func: 分析器的数据获取方法
+            args, kwargs: 传递给fetch_func的参数
+            
+        返回:
+            获取的数据，出错时返回空字典
+        """
+        try:
+            return fetch_func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"获取 {fetch_func.__name__} 数据失败: {e}")
+            return {}
+            
     def format_dashboard_statistics(self, type_: Optional[str] = None) -> Dict[str, Any]:
-        """格式化仪表板统计信息
+        """格式化仪表板统计信息（结果由 StatisticsService 的仪表板缓存负责缓存）
         
         参数:
             type_: 可选的内容类型过滤
@@ -634,77 +617,87 @@ class StatisticsFormatter:
             logger.error("未设置分析器，无法获取数据")
             return {}
             
-        try:
-            start_time = time.time()
-            
-            # 获取基础数据
-            if type_:
-                # 单一类型仪表板
-                basic_data = self.analyzer.get_basic_statistics(type_)
-                content_data = self.analyzer.get_content_type_statistics(type_)
-                
-                # 格式化数据
-                result = {
-                    'type': type_,
-                    'display_name': self._localize_type_name(type_),
-                    'basic': self.format_content_type_statistics(type_, content_data),
-                    'ratings': self.format_rating_statistics(self.analyzer.get_rating_statistics(type_)),
-                    'years': self.format_year_statistics(self.analyzer.get_year_statistics(type_)),
-                    'genres': self.format_genre_statistics(self.analyzer.get_genre_statistics(type_, 20)),
-                    'trends': self.format_collection_trend(self.analyzer.get_collection_trend(period='month', months=12, type_=type_))
-                }
+        start_time = time.monotonic()
+            
+        # 获取基础数据
+        analyzer = self.analyzer
+        safe_fetch = self._safe_fetch
+        if type_:
+            # 单一类型仪表板，各项分析查询相互独立，并行获取
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                basic_future = executor.submit(safe_fetch, analyzer.get_basic_statistics, type_)
+                content_future = executor.submit(safe_fetch, analyzer.get_content_type_statistics, type_)
+                ratings_future = executor.submit(safe_fetch, analyzer.get_rating_statistics, type_)
+                years_future = executor.submit(safe_fetch, analyzer.get_year_statistics, type_)
+                genres_future = executor.submit(safe_fetch, analyzer.get_genre_statistics, type_, 20)
+                trends_future = executor.submit(safe_fetch, analyzer.get_collection_trend, period='month', months=12, type_=type_)
                 
                 # 类型特定数据
+                specific_future = None
                 if type_ == 'movie' or type_ == 'tv':
-                    movie_stats = self.analyzer.get_movie_statistics()
-                    result['specific'] = self.format_movie_statistics(movie_stats)
+                    specific_future = (executor.submit(safe_fetch, analyzer.get_movie_statistics), self.format_movie_statistics)
                 elif type_ == 'book':
-                    book_stats = self.analyzer.get_book_statistics()
-                    result['specific'] = self.format_book_statistics(book_stats)
+                    specific_future = (executor.submit(safe_fetch, analyzer.get_book_statistics), self.format_book_statistics)
                 elif type_ == 'game':
-                    game_stats = self.analyzer.get_game_statistics()
-                    result['specific'] = self.format_game_statistics(game_stats)
-                    
-            else:
-                # 全局仪表板
-                complete_stats = self.analyzer.get_complete_statistics()
+                    specific_future = (executor.submit(safe_fetch, analyzer.get_game_statistics), self.format_game_statistics)
+                
+                basic_future.result()
                 
                 # 格式化数据
                 result = {
-                    'basic': self.format_basic_statistics(complete_stats.get('basic', {})),
-                    'ratings': self.format_rating_statistics(complete_stats.get('ratings', {})),
-                    'years': self.format_year_statistics(complete_stats.get('years', {})),
-                    'genres': self.format_genre_statistics(complete_stats.get('tags', [])),
-                    'trends': self.format_collection_trend(complete_stats.get('trends', {}))
+                    'type': type_,
+                    'display_name': self._localize_type_name(type_),
+                    'basic': self.format_content_type_statistics(type_, content_future.result()),
+                    'ratings': self.format_rating_statistics(ratings_future.result()),
+                    'years': self.format_year_statistics(years_future.result()),
+                    'genres': self.format_genre_statistics(genres_future.result()),
+                    'trends': self.format_collection_trend(trends_future.result())
                 }
                 
-                # 添加一些针对全局仪表板的额外数据
-                result['type_specific'] = {}
-                for content_type in ['movie', 'book', 'game', 'tv', 'music']:
-                    # 仅获取基本计数数据，避免生成太多查询
-                    type_data = self.analyzer.get_content_type_statistics(content_type)
-                    result['type_specific'][content_type] = {
-                        'total': type_data.get('total', 0),
-                        'display_name': self._localize_type_name(content_type),
-                        'status': type_data.get('status', {})
-                    }
-            
-            # 添加格式化时间信息
-            execution_time = time.time() - start_time
-            result['_metadata'] = {
-                'execution_time_ms': round(execution_time * 1000),
-                'timestamp': int(time.time()),
-                'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                if specific_future:
+                    future, format_func = specific_future
+                    result['specific'] = format_func(future.result())
+                
+        else:
+            # 全局仪表板
+            complete_stats = safe_fetch(analyzer.get_complete_statistics)
+            
+            # 格式化数据
+            result = {
+                'basic': self.format_basic_statistics(complete_stats.get('basic', {})),
+                'ratings': self.format_rating_statistics(complete_stats.get('ratings', {})),
+                'years': self.format_year_statistics(complete_stats.get('years', {})),
+                'genres': self.format_genre_statistics(complete_stats.get('tags', [])),
+                'trends': self.format_collection_trend(complete_stats.get('trends', {}))
             }
             
-            return result
-            
-        except Exception as e:
-            logger.error(f"格式化仪表板数据失败: {e}")
-            return {
-                'error': '生成统计数据时出错',
-                'timestamp': int(time.time())
-            }
+            # 添加一些针对全局仪表板的额外数据
+            result['type_specific'] = {}
+            content_types = ['movie', 'book', 'game', 'tv', 'music']
+            with ThreadPoolExecutor(max_workers=len(content_types)) as executor:
+                # 仅获取基本计数数据，避免生成太多查询；各类型并行获取
+                futures = {
+                    content_type: executor.submit(safe_fetch, analyzer.get_content_type_statistics, content_type)
+                    for content_type in content_types
+                }
+            for content_type, future in futures.items():
+                type_data = future.result()
+                result['type_specific'][content_type] = {
+                    'total': type_data.get('total', 0),
+                    'display_name': self._localize_type_name(content_type),
+                    'status': type_data.get('status', {})
+                }
+        
+        # 添加格式化时间信息（复用同一时间戳）
+        now_wall = time.time()
+        lt = time.localtime(now_wall)
+        result['_metadata'] = {
+            'execution_time_ms': round((time.monotonic() - start_time) * 1000),
+            'timestamp': int(now_wall),
+            'generated': f"{lt.tm_year}-{lt.tm_mon:02d}-{lt.tm_mday:02d} {lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+        }
+        
+        return result
     
     def format_analytics_response(self, data: Dict[str, Any]) -> str:
         """将分析数据格式化为JSON响应
@@ -716,6 +709,9 @@ class StatisticsFormatter:
             JSON字符串
         """
         try:
+            if orjson is not None:
+                # orjson 默认输出 UTF-8 且不转义非 ASCII 字符，等价于 ensure_ascii=False
+                return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
             return json.dumps(data, ensure_ascii=False)
         except Exception as e:
             logger.error(f"序列化JSON响应失败: {e}")
@@ -1,8 +1,14 @@
 import time
+import random
 import threading
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from utils.logger import get_logger
+from utils.serialization_utils import safe_serialize, safe_json_bytes
 from services.analytics.data_provider import StatisticsDataProvider
 from services.analytics.analyzer import DataAnalyzer
 from services.analytics.formatter import StatisticsFormatter
@@ -10,6 +16,29 @@ from services.analytics.formatter import StatisticsFormatter
 # 配置日志
 logger = get_logger("statistics_service")
 
+# 错误响应的只读模板，出错时只需补充 message 和 timestamp
+_ERR_DASHBOARD = MappingProxyType({'error': '获取统计数据失败'})
+_ERR_BASIC_STATS = MappingProxyType({'error': '获取基础统计数据失败'})
+_ERR_RATING = MappingProxyType({'error': '获取评分分布失败'})
+_ERR_YEAR = MappingProxyType({'error': '获取年份分布失败'})
+_ERR_TAG = MappingProxyType({'error': '获取标签分布失败'})
+_ERR_TREND = MappingProxyType({'error': '获取收藏趋势失败'})
+_ERR_FIX_DATA = MappingProxyType({'success': False, 'error': '修复数据失败'})
+_ERR_CLEAR_CACHES = MappingProxyType({'success': False, 'error': '清除缓存失败'})
+
+@lru_cache(maxsize=64)
+def _metadata_base(type_: Optional[str], **extra) -> MappingProxyType:
+    """获取分布类接口元数据中固定部分的只读模板
+    
+    参数:
+        type_: 内容类型过滤
+        extra: 其他固定的元数据字段
+        
+    返回:
+        不含时间戳的元数据模板
+    """
+    return MappingProxyType({'type': type_ or 'all', **extra})
+
 class StatisticsService:
     """豆瓣统计服务，作为统计功能的统一接口
     
@@ -18,6 +47,10 @@ class StatisticsService:
     
     # 缓存配置
     DASHBOARD_CACHE_TTL = 600  # 仪表板缓存有效期（秒）
+    DASHBOARD_CACHE_TTL_JITTER = 0.15  # 缓存有效期随机浮动比例，避免同时过期
+    DASHBOARD_CACHE_SIZE = 20  # 仪表板缓存最大条目数
+    CACHE_STRIPES = 8  # 缓存分段数量（必须为2的幂）
+    INFLIGHT_WAIT_TIMEOUT = 60  # 等待其他请求生成仪表板的最长时间（秒）
     
     def __init__(self, db_instance=None):
         """初始化统计服务
@@ -30,17 +63,65 @@ class StatisticsService:
         self.analyzer = DataAnalyzer(self.data_provider)
         self.formatter = StatisticsFormatter(self.analyzer)
         
-        # 仪表板缓存
-        self._dashboard_cache = {}
-        self._cache_times = {}
-        self._cache_lock = threading.Lock()
+        # 仪表板缓存按键分段，每段独立加锁以减少并发请求间的锁竞争
+        # 每段为 OrderedDict: 缓存键 -> (过期时间(monotonic), 数据, JSON字节)，按最近使用顺序排列
+        # 容量按所有分段的条目总数限制（见 _enforce_capacity），不受键在分段间分布不均的影响
+        self._cache_stripes = [(threading.Lock(), OrderedDict()) for _ in range(self.CACHE_STRIPES)]
+        
+        # 正在生成中的仪表板: 缓存键 -> Future，用于合并并发的缓存未命中
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
         
-        # 性能计数器
-        self.request_count = 0
-        self.error_count = 0
-        self.total_processing_time = 0
+        # 性能计数器，递增和读取都在计数器锁内进行
+        self._request_count = 0
+        self._error_count = 0
+        self._counter_lock = threading.Lock()
+        self.total_processing_time = 0.0
+        self._timing_lock = threading.Lock()
+        
+        # 最近一次格式化的时间: (秒级时间戳, 格式化字符串)
+        self._last_now_str = (0, '')
         
         logger.info("统计服务初始化完成")
+    
+    @property
+    def request_count(self) -> int:
+        """已处理的请求数"""
+        with self._counter_lock:
+            return self._request_count
+    
+    @property
+    def error_count(self) -> int:
+        """处理失败的请求数"""
+        with self._counter_lock:
+            return self._error_count
+    
+    def _now_str(self, now_wall: float) -> str:
+        """格式化生成时间，同一秒内复用上次的格式化结果
+        
+        参数:
+            now_wall: 当前时间戳
+            
+        返回:
+            'YYYY-MM-DD HH:MM:SS' 格式的时间字符串
+        """
+        sec = int(now_wall)
+        # 元组整体替换，并发读写时不会读到不一致的数据
+        last_sec, last_str = self._last_now_str
+        if sec != last_sec:
+            last_str = datetime.fromtimestamp(sec).strftime('%Y-%m-%d %H:%M:%S')
+            self._last_now_str = (sec, last_str)
+        return last_str
+    
+    def _count_request(self) -> None:
+        """请求计数加一"""
+        with self._counter_lock:
+            self._request_count += 1
+            
+    def _count_error(self) -> None:
+        """错误计数加一"""
+        with self._counter_lock:
+            self._error_count += 1
         
     def get_dashboard(self, type_: Optional[str] = None, skip_cache: bool = False) -> Dict[str, Any]:
         """获取统计仪表板数据
@@ -52,41 +133,85 @@ class StatisticsService:
         返回:
             仪表板数据
         """
-        self.request_count += 1
-        start_time = time.time()
+        return self.get_dashboard_with_json(type_, skip_cache)[0]
+        
+    def get_dashboard_with_json(self, type_: Optional[str] = None,
+                                skip_cache: bool = False) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """获取统计仪表板数据及缓存中对应的预先序列化JSON
+        
+        参数:
+            type_: 内容类型过滤 (movie, tv, book 等)，不提供则返回总览
+            skip_cache: 是否跳过缓存，强制刷新数据
+            
+        返回:
+            (仪表板数据, UTF-8编码的JSON字节)，出错或序列化失败时JSON字节为None
+        """
+        self._count_request()
+        start_time = time.monotonic()
         
         try:
-            cache_key = f"dashboard_{type_ or 'all'}"
+            cache_key = self._dashboard_cache_key(type_)
             
             # 检查缓存
             if not skip_cache:
-                cached_data = self._get_from_cache(cache_key)
-                if cached_data:
+                entry = self._get_cache_entry(cache_key)
+                if entry:
                     logger.debug(f"从缓存获取仪表板数据: {cache_key}")
                     self._update_timing(start_time)
-                    return cached_data
+                    return entry[1], entry[2]
             
-            # 获取格式化的仪表板数据
-            dashboard_data = self.formatter.format_dashboard_statistics(type_)
-            
-            # 更新缓存
-            self._save_to_cache(cache_key, dashboard_data)
+            # 获取格式化的仪表板数据（并发请求同一键时只生成一次）
+            result = self._build_dashboard_once(cache_key, type_)
             
             self._update_timing(start_time)
-            return dashboard_data
+            return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"获取仪表板数据失败: {e}")
             
             # 返回错误信息
-            error_response = {
-                'error': '获取统计数据失败',
-                'message': str(e),
-                'timestamp': int(time.time())
-            }
+            error_response = {**_ERR_DASHBOARD, 'message': str(e), 'timestamp': int(time.time())}
             self._update_timing(start_time)
-            return error_response
+            return error_response, None
+    
+    def _build_dashboard_once(self, cache_key: str, type_: Optional[str]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """生成仪表板数据并更新缓存，同一缓存键的并发请求共享同一次生成结果
+        
+        参数:
+            cache_key: 缓存键
+            type_: 内容类型过滤
+            
+        返回:
+            (仪表板数据, 写入缓存的JSON字节)
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[cache_key] = future
+                
+        # 已有其他请求在生成，等待其结果
+        if not is_owner:
+            logger.debug(f"等待进行中的仪表板生成: {cache_key}")
+            return future.result(timeout=self.INFLIGHT_WAIT_TIMEOUT)
+            
+        try:
+            dashboard_data = self.formatter.format_dashboard_statistics(type_)
+            
+            # 更新缓存，直接使用刚写入的JSON字节，无需再次查询缓存
+            json_bytes = self._save_to_cache(cache_key, dashboard_data)
+            
+            result = (dashboard_data, json_bytes)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
     
     def get_basic_stats(self) -> Dict[str, Any]:
         """获取基础统计信息（快速返回）
@@ -94,8 +219,8 @@ class StatisticsService:
         返回:
             基础统计数据
         """
-        self.request_count += 1
-        start_time = time.time()
+        self._count_request()
+        start_time = time.monotonic()
         
         try:
             # 从缓存获取总体仪表板
@@ -112,11 +237,12 @@ class StatisticsService:
             
             # 如果没有缓存，只获取基础数据
             basic_data = self.analyzer.get_basic_statistics()
+            now_wall = time.time()
             result = {
                 'basic': self.formatter.format_basic_statistics(basic_data),
                 '_metadata': {
-                    'timestamp': int(time.time()),
-                    'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'timestamp': int(now_wall),
+                    'generated': self._now_str(now_wall)
                 }
             }
             
@@ -124,15 +250,11 @@ class StatisticsService:
             return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"获取基础统计数据失败: {e}")
             
             # 返回错误信息
-            error_response = {
-                'error': '获取基础统计数据失败',
-                'message': str(e),
-                'timestamp': int(time.time())
-            }
+            error_response = {**_ERR_BASIC_STATS, 'message': str(e), 'timestamp': int(time.time())}
             self._update_timing(start_time)
             return error_response
     
@@ -148,8 +270,8 @@ class StatisticsService:
         if not type_:
             return {'error': '未提供内容类型'}
             
-        self.request_count += 1
-        start_time = time.time()
+        self._count_request()
+        start_time = time.monotonic()
         
         try:
             # 检查类型是否有效
@@ -174,18 +296,19 @@ class StatisticsService:
                 result = self.formatter.format_content_type_statistics(type_, content_data)
             
             # 添加元数据
+            now_wall = time.time()
             result['_metadata'] = {
                 'type': type_,
                 'display_name': self.formatter._localize_type_name(type_),
-                'timestamp': int(time.time()),
-                'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': int(now_wall),
+                'generated': self._now_str(now_wall)
             }
             
             self._update_timing(start_time)
             return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"获取类型 {type_} 的统计数据失败: {e}")
             
             # 返回错误信息
@@ -206,32 +329,25 @@ class StatisticsService:
         返回:
             评分分布数据
         """
-        self.request_count += 1
-        start_time = time.time()
+        self._count_request()
+        start_time = time.monotonic()
         
         try:
             raw_data = self.analyzer.get_rating_statistics(type_)
             result = self.formatter.format_rating_statistics(raw_data)
             
             # 添加元数据
-            result['_metadata'] = {
-                'type': type_ or 'all',
-                'timestamp': int(time.time())
-            }
+            result['_metadata'] = {**_metadata_base(type_), 'timestamp': int(time.time())}
             
             self._update_timing(start_time)
             return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"获取评分分布失败: {e}")
             
             # 返回错误信息
-            error_response = {
-                'error': '获取评分分布失败',
-                'message': str(e),
-                'timestamp': int(time.time())
-            }
+            error_response = {**_ERR_RATING, 'message': str(e), 'timestamp': int(time.time())}
             self._update_timing(start_time)
             return error_response
     
@@ -244,32 +360,25 @@ class StatisticsService:
         返回:
             年份分布数据
         """
-        self.request_count += 1
-        start_time = time.time()
+        self._count_request()
+        start_time = time.monotonic()
         
         try:
             raw_data = self.analyzer.get_year_statistics(type_)
             result = self.formatter.format_year_statistics(raw_data)
             
             # 添加元数据
-            result['_metadata'] = {
-                'type': type_ or 'all',
-                'timestamp': int(time.time())
-            }
+            result['_metadata'] = {**_metadata_base(type_), 'timestamp': int(time.time())}
             
             self._update_timing(start_time)
             return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"获取年份分布失败: {e}")
             
             # 返回错误信息
-            error_response = {
-                'error': '获取年份分布失败',
-                'message': str(e),
-                'timestamp': int(time.time())
-            }
+            error_response = {**_ERR_YEAR, 'message': str(e), 'timestamp': int(time.time())}
             self._update_timing(start_time)
             return error_response
     
@@ -283,8 +392,8 @@ class StatisticsService:
         返回:
             标签分布数据
         """
-        self.request_count += 1
-        start_time = time.time()
+        self._count_request()
+        start_time = time.monotonic()
         
         try:
             # 安全处理limit参数
@@ -297,25 +406,17 @@ class StatisticsService:
             result = self.formatter.format_genre_statistics(raw_data)
             
             # 添加元数据
-            result['_metadata'] = {
-                'type': type_ or 'all',
-                'limit': limit,
-                'timestamp': int(time.time())
-            }
+            result['_metadata'] = {**_metadata_base(type_, limit=limit), 'timestamp': int(time.time())}
             
             self._update_timing(start_time)
             return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"获取标签分布失败: {e}")
             
             # 返回错误信息
-            error_response = {
-                'error': '获取标签分布失败',
-                'message': str(e),
-                'timestamp': int(time.time())
-            }
+            error_response = {**_ERR_TAG, 'message': str(e), 'timestamp': int(time.time())}
             self._update_timing(start_time)
             return error_response
     
@@ -332,8 +433,8 @@ class StatisticsService:
         返回:
             收藏趋势数据
         """
-        self.request_count += 1
-        start_time = time.time()
+        self._count_request()
+        start_time = time.monotonic()
         
         try:
             # 参数验证
@@ -350,9 +451,7 @@ class StatisticsService:
             
             # 添加元数据
             result['_metadata'] = {
-                'type': type_ or 'all',
-                'period': period,
-                'months': months,
+                **_metadata_base(type_, period=period, months=months),
                 'timestamp': int(time.time())
             }
             
@@ -360,15 +459,11 @@ class StatisticsService:
             return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"获取收藏趋势失败: {e}")
             
             # 返回错误信息
-            error_response = {
-                'error': '获取收藏趋势失败',
-                'message': str(e),
-                'timestamp': int(time.time())
-            }
+            error_response = {**_ERR_TREND, 'message': str(e), 'timestamp': int(time.time())}
             self._update_timing(start_time)
             return error_response
     
@@ -380,14 +475,17 @@ class StatisticsService:
         返回:
             修复结果
         """
-        self.request_count += 1
-        start_time = time.time()
+        self._count_request()
+        start_time = time.monotonic()
         
         try:
             fixes = self.analyzer.fix_invalid_data()
             
-            # 修复后清除所有缓存
-            self.clear_caches()
+            # 修复后只清除受影响类型及总览的缓存（分析器缓存已由其自身清除）
+            if fixes.get('total', 0) > 0:
+                affected_types = self.analyzer.related_cache_types(fixes.get('affected_types', []))
+                for type_ in affected_types | {None}:
+                    self._evict(self._dashboard_cache_key(type_))
             
             result = {
                 'success': True,
@@ -399,16 +497,11 @@ class StatisticsService:
             return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"修复数据失败: {e}")
             
             # 返回错误信息
-            error_response = {
-                'success': False,
-                'error': '修复数据失败',
-                'message': str(e),
-                'timestamp': int(time.time())
-            }
+            error_response = {**_ERR_FIX_DATA, 'message': str(e), 'timestamp': int(time.time())}
             self._update_timing(start_time)
             return error_response
     
@@ -418,16 +511,16 @@ class StatisticsService:
         返回:
             操作结果
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # 清除数据分析器的缓存
             self.analyzer.clear_cache()
             
             # 清除仪表板缓存
-            with self._cache_lock:
-                self._dashboard_cache.clear()
-                self._cache_times.clear()
+            for lock, stripe in self._cache_stripes:
+                with lock:
+                    stripe.clear()
                 
             result = {
                 'success': True,
@@ -439,16 +532,11 @@ class StatisticsService:
             return result
             
         except Exception as e:
-            self.error_count += 1
+            self._count_error()
             logger.error(f"清除缓存失败: {e}")
             
             # 返回错误信息
-            error_response = {
-                'success': False,
-                'error': '清除缓存失败',
-                'message': str(e),
-                'timestamp': int(time.time())
-            }
+            error_response = {**_ERR_CLEAR_CACHES, 'message': str(e), 'timestamp': int(time.time())}
             self._update_timing(start_time)
             return error_response
     
@@ -458,37 +546,43 @@ class StatisticsService:
         返回:
             服务状态信息
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # 获取组件状态
             analyzer_status = self.analyzer.get_analytics_status()
             formatter_status = self.formatter.get_status_summary()
             
+            # 读取一次计数器快照
+            request_count = self.request_count
+            error_count = self.error_count
+            
             # 计算平均处理时间
             avg_time = 0
-            if self.request_count > 0:
-                avg_time = self.total_processing_time / self.request_count
+            if request_count > 0:
+                avg_time = self.total_processing_time / request_count
                 
             # 仪表板缓存状态
+            # 无锁读取，统计值为近似值
             dashboard_cache_status = {
-                'size': len(self._dashboard_cache),
-                'keys': list(self._dashboard_cache.keys())
+                'size': sum(len(stripe) for _, stripe in self._cache_stripes),
+                'keys': [key for _, stripe in self._cache_stripes for key in list(stripe)]
             }
             
+            now_wall = time.time()
             status = {
                 'service': {
-                    'request_count': self.request_count,
-                    'error_count': self.error_count,
-                    'error_rate': f"{(self.error_count / max(1, self.request_count)) * 100:.2f}%",
+                    'request_count': request_count,
+                    'error_count': error_count,
+                    'error_rate': f"{(error_count / max(1, request_count)) * 100:.2f}%",
                     'total_processing_time': round(self.total_processing_time, 2),
                     'avg_processing_time': round(avg_time, 4)
                 },
                 'dashboard_cache': dashboard_cache_status,
                 'analyzer': analyzer_status,
                 'formatter': formatter_status.get('formatter', {}),
-                'timestamp': int(time.time()),
-                'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': int(now_wall),
+                'generated': self._now_str(now_wall)
             }
             
             return status
@@ -519,6 +613,31 @@ class StatisticsService:
         """
         return self.formatter.format_analytics_response(data)
     
+    def _dashboard_cache_key(self, type_: Optional[str]) -> str:
+        """生成仪表板缓存键"""
+        return f"dashboard_{type_ or 'all'}"
+        
+    def _cache_stripe(self, key: str):
+        """获取缓存键所在的分段
+        
+        参数:
+            key: 缓存键
+            
+        返回:
+            (分段锁, 分段缓存字典)
+        """
+        return self._cache_stripes[hash(key) & (self.CACHE_STRIPES - 1)]
+        
+    def _evict(self, key: str) -> None:
+        """从缓存中移除单个键
+        
+        参数:
+            key: 缓存键
+        """
+        lock, stripe = self._cache_stripe(key)
+        with lock:
+            stripe.pop(key, None)
+            
     def _get_from_cache(self, key: str) -> Optional[Dict[str, Any]]:
         """从缓存获取数据
         
@@ -528,36 +647,106 @@ class StatisticsService:
         返回:
             缓存的数据，如果不存在或过期则返回None
         """
-        with self._cache_lock:
-            now = time.time()
+        entry = self._get_cache_entry(key)
+        return entry[1] if entry else None
+        
+    def _get_cache_entry(self, key: str) -> Optional[tuple]:
+        """从缓存获取完整的缓存条目
+        
+        参数:
+            key: 缓存键
             
-            if (key in self._dashboard_cache and 
-                key in self._cache_times and 
-                now - self._cache_times[key] < self.DASHBOARD_CACHE_TTL):
-                return self._dashboard_cache[key]
+        返回:
+            (过期时间, 数据, JSON字节)，如果不存在或过期则返回None
+        """
+        lock, stripe = self._cache_stripe(key)
+        with lock:
+            entry = stripe.get(key)
+            if entry is None:
+                return None
+                
+            if entry[0] > time.monotonic():
+                # 命中，标记为最近使用
+                stripe.move_to_end(key)
+                return entry
                 
+            # 已过期，移除
+            del stripe[key]
             return None
     
-    def _save_to_cache(self, key: str, data: Dict[str, Any]) -> None:
+    def _save_to_cache(self, key: str, data: Dict[str, Any]) -> Optional[bytes]:
         """保存数据到缓存
         
         参数:
             key: 缓存键
             data: 要缓存的数据
+            
+        返回:
+            写入缓存的JSON字节，序列化失败时不写入缓存并返回None
         """
-        with self._cache_lock:
-            # 限制缓存大小
-            if len(self._dashboard_cache) > 20:
-                # 删除最老的缓存
-                oldest_key = min(self._cache_times.keys(), key=lambda k: self._cache_times.get(k, 0))
-                if oldest_key in self._dashboard_cache:
-                    del self._dashboard_cache[oldest_key]
-                if oldest_key in self._cache_times:
-                    del self._cache_times[oldest_key]
-                    
+        # 预先序列化，缓存命中时可直接返回JSON
+        json_bytes = self._serialize_dashboard(data)
+        if json_bytes is None:
+            return None
+        
+        lock, stripe = self._cache_stripe(key)
+        with lock:
             # 保存新数据
-            self._dashboard_cache[key] = data
-            self._cache_times[key] = time.time()
+            jitter = random.uniform(1 - self.DASHBOARD_CACHE_TTL_JITTER, 1 + self.DASHBOARD_CACHE_TTL_JITTER)
+            stripe[key] = (time.monotonic() + self.DASHBOARD_CACHE_TTL * jitter, data, json_bytes)
+            stripe.move_to_end(key)
+        
+        # 释放分段锁后再限制缓存总大小，避免同时持有多个分段锁
+        self._enforce_capacity()
+        return json_bytes
+    
+    def _enforce_capacity(self) -> None:
+        """将所有分段的缓存条目总数限制在 DASHBOARD_CACHE_SIZE 以内
+        
+        超出时在各分段最久未使用的条目中淘汰最早过期的一个，直到总数不超过容量。
+        每次写入缓存后都会执行，因此并发写入全部完成后总数一定不超过容量；
+        写入进行中总数最多暂时超出同时写入的线程数
+        """
+        # 各分段长度无锁读取，只用于判断是否需要淘汰
+        while sum(len(stripe) for _, stripe in self._cache_stripes) > self.DASHBOARD_CACHE_SIZE:
+            victim = None
+            for lock, stripe in self._cache_stripes:
+                with lock:
+                    if not stripe:
+                        continue
+                    key, entry = next(iter(stripe.items()))
+                if victim is None or entry[0] < victim[3][0]:
+                    victim = (lock, stripe, key, entry)
+            if victim is None:
+                return
+                
+            # 选出后该键可能已被并发写入替换为新条目，只淘汰选中的那个条目，否则重新扫描
+            lock, stripe, key, entry = victim
+            with lock:
+                if stripe.get(key) is entry:
+                    del stripe[key]
+    
+    def _serialize_dashboard(self, data: Dict[str, Any]) -> Optional[bytes]:
+        """按API响应的格式预先序列化仪表板数据（安全序列化并补充 _metadata）
+        
+        参数:
+            data: 仪表板数据
+            
+        返回:
+            UTF-8编码的JSON字节，序列化失败时返回None
+        """
+        try:
+            payload = safe_serialize(data)
+            if isinstance(payload, dict) and '_metadata' not in payload:
+                now = datetime.now()
+                payload['_metadata'] = {
+                    'timestamp': now.timestamp(),
+                    'generated': now.strftime('%Y-%m-%d %H:%M:%S')
+                }
+            return safe_json_bytes(payload)
+        except Exception as e:
+            logger.error(f"预先序列化仪表板数据失败: {e}")
+            return None
             
     def _update_timing(self, start_time: float, count_as_request: bool = True) -> None:
         """更新时间统计
@@ -566,8 +755,9 @@ class StatisticsService:
             start_time: 开始时间
             count_as_request: 是否计入请求计数
         """
-        elapsed = time.time() - start_time
-        self.total_processing_time += elapsed
+        elapsed = time.monotonic() - start_time
+        with self._timing_lock:
+            self.total_processing_time += elapsed
         
         if elapsed > 1.0:  # 如果处理时间超过1秒，记录慢请求
             logger.warning(f"慢请求处理: {elapsed:.2f}秒")
\ No newline at end of file
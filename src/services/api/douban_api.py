@@ -1,19 +1,87 @@
 import os
 import time
-import random
 import requests
 import json
-from typing import Dict, List, Any, Optional
-from retrying import retry
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, ContextManager, Iterator, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from utils.logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
 # 配置日志
 logger = get_logger("douban_api")
 
 # 加载环境变量
 load_dotenv()
 
+class TokenBucket:
+    """线程安全的令牌桶限流器
+    
+    按固定速率补充令牌，允许短时间内的突发请求；令牌不足时才等待。
+    被限流时速率减半，冷却期结束后恢复（AIMD）。
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        """初始化令牌桶
+        
+        参数:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量，即允许的突发请求数
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._penalty_until = 0.0
+        self._lock = threading.Lock()
+        
+    def _refill(self, now: float) -> None:
+        """按经过的时间补充令牌（调用方需持有锁）"""
+        if self._penalty_until and now >= self._penalty_until:
+            # 冷却期结束，恢复原速率
+            self.rate = self.base_rate
+            self._penalty_until = 0.0
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        
+    def consume(self, tokens: float = 1.0) -> None:
+        """取出令牌，令牌不足时等待
+        
+        参数:
+            tokens: 需要的令牌数
+        """
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            
+    def penalize(self, duration: float) -> None:
+        """被限流时将速率减半并清空令牌，持续指定时间
+        
+        参数:
+            duration: 降速持续时间（秒）
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.base_rate / 16, self.rate / 2)
+            self._tokens = 0.0
+            self._penalty_until = now + duration
+
 class DoubanAPI:
     """豆瓣API客户端，处理与豆瓣API的所有交互"""
     
@@ -24,6 +92,27 @@ class DoubanAPI:
     # 请求超时
     REQUEST_TIMEOUT = 10
     
+    # 连接池与重试设置
+    POOL_CONNECTIONS = 16
+    POOL_MAXSIZE = 32
+    MAX_RETRIES = 3
+    
+    # 限流设置：平均每0.75秒一个请求，最多突发4个
+    RATE_LIMIT_RATE = 1.33
+    RATE_LIMIT_BURST = 4
+    RATE_LIMIT_COOLDOWN = 60  # 被限流后降速持续时间（秒）
+    MAX_RATE_LIMIT_RETRIES = 3  # 遇到429时的最大重试次数
+    
+    # 自动分页设置
+    INTERESTS_PAGE_SIZE = 50
+    PAGINATION_WORKERS = 4
+    
+    # 逐页获取（增量同步和预检）时的每页条数，页面边界以实际返回的条数为准
+    PAGE_SIZE = 20
+    
+    # 条目详情条件请求缓存容量
+    DETAIL_CACHE_SIZE = 512
+    
     # 支持的内容类型列表
     CONTENT_TYPES = ["movie", "tv", "book", "music", "game", "drama"]
     
@@ -47,192 +136,320 @@ class DoubanAPI:
         if self.auth_token:
             self.headers["Authorization"] = f"Bearer {self.auth_token}"
             
-        # 请求计数器（用于后续添加的功能）
+        # 复用连接的会话，连接错误和服务端错误由适配器自动重试
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=Retry(
+                total=self.MAX_RETRIES,
+                backoff_factor=2,
+                # 429 只由 _do_get 处理，确保限流重试经过令牌桶和冷却逻辑
+                status_forcelist=[500, 502, 503, 504],
+                respect_retry_after_header=True,
+                raise_on_status=False  # 重试耗尽后返回最后的响应，由调用方处理
+            )
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+            
+        # 请求计数器（用于后续添加的功能），分页线程池中并发递增，需加锁
         self.request_count = 0
+        self._request_count_lock = threading.Lock()
+        
+        # 预先构建的URL模板和公共请求参数
+        self._interests_url_tpl = f"https://{self.api_host}/api/v2/user/{{user_id}}/interests"
+        self._item_url_tpl = f"https://{self.api_host}/api/v2/{{type_}}/{{item_id}}"
+        self._search_url = f"https://{self.api_host}/api/v2/search"
+        self._base_params = {"apiKey": self.api_key}
+        
+        # 所有请求共享的令牌桶限流器
+        self._bucket = TokenBucket(self.RATE_LIMIT_RATE, self.RATE_LIMIT_BURST)
+        self._last_rate_limited: Optional[float] = None
+        
+        # 条目详情缓存: (type_, item_id) -> (ETag, Last-Modified, 详情数据)
+        self._detail_cache: OrderedDict = OrderedDict()
+        self._detail_cache_lock = threading.Lock()
             
         logger.info(f"DoubanAPI初始化完成，使用API主机: {self.api_host}")
 
-    def _add_random_delay(self, min_delay: float = 0.5, max_delay: float = 2.0):
-        """添加随机延迟，避免请求过于频繁"""
-        delay = random.uniform(min_delay, max_delay)
-        time.sleep(delay)
+    @staticmethod
+    def _parse_json(resp: requests.Response) -> Any:
+        """解析响应JSON，优先使用 orjson
+        
+        参数:
+            resp: 响应对象
+            
+        返回:
+            解析后的数据
+        """
+        if orjson is not None:
+            return orjson.loads(resp.content)
+        return json.loads(resp.content)
+    
+    def _wait_for_rate_limit(self):
+        """等待限流令牌，避免请求过于频繁"""
+        self._bucket.consume(1)
     
-    def _handle_rate_limit(self, resp: requests.Response) -> bool:
+    def _handle_rate_limit(self, resp: requests.Response, attempt: int = 0, wait: bool = True) -> bool:
         """处理可能的速率限制
         
+        参数:
+            resp: 响应对象
+            attempt: 当前是第几次遇到限流（从0开始），用于计算退避时间
+            wait: 是否退避等待，不再重试时无需等待
+            
         返回:
             bool: 如果被限制返回True，否则返回False
         """
         if resp.status_code == 429:
-            logger.warning("请求受到速率限制，等待60秒后重试")
-            time.sleep(60)
+            # 记录限流时间，并在冷却期内降低请求速率
+            self._last_rate_limited = time.monotonic()
+            self._bucket.penalize(self.RATE_LIMIT_COOLDOWN)
+            
+            if wait:
+                backoff = min(60, 5 * 2 ** attempt)
+                logger.warning(f"请求受到速率限制，等待{backoff}秒后重试")
+                time.sleep(backoff)
+            else:
+                logger.warning("请求受到速率限制，已达到最大重试次数")
             return True
         return False
     
-    @retry(stop_max_attempt_number=3, wait_fixed=2000, 
-           retry_on_exception=lambda e: isinstance(e, (requests.RequestException, ConnectionError)))
-    def get_interests_page(self, user_id: str, type_: str, status: str, page: int = 1) -> Dict[str, Any]:
-        """获取单页用户兴趣列表（不自动处理分页）
+    def _do_get(self, url: str, params: Dict[str, Any], 
+                headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """发送GET请求，处理限流等待、请求计数和429速率限制
         
         参数:
-            user_id: 豆瓣用户ID
-            type_: 内容类型 ('movie', 'tv', 'book', 'music', 'game', 'drama' 等)
-            status: 状态 ('mark', 'doing', 或 'done')
-            page: 页码，从1开始
+            url: 请求地址
+            params: 查询参数
+            headers: 额外的请求头
             
         返回:
-            包含当前页结果的字典，包含interests和total字段
+            响应对象，多次被限流后返回最后一次的429响应
         """
-        # 添加随机延迟
-        self._add_random_delay()
-        
-        # 请求计数增加
-        self.request_count += 1
-        
-        url = f"https://{self.api_host}/api/v2/user/{user_id}/interests"
-        
-        # 计算偏移量，页码从1开始
-        offset = (page - 1) * 20  # 每页20条
-        
-        params = {
-            "type": type_,
-            "status": status,
-            "start": offset,
-            "count": 20,
-            "apiKey": self.api_key
-        }
-        
-        logger.debug(f"请求第 {page} 页 {type_} 数据，偏移量: {offset}")
-        
-        try:
-            resp = requests.get(url, headers=self.headers, params=params, timeout=self.REQUEST_TIMEOUT)
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES):
+            # 等待限流令牌
+            self._wait_for_rate_limit()
             
-            # 处理速率限制
-            if self._handle_rate_limit(resp):
-                # 递归重试
-                return self.get_interests_page(user_id, type_, status, page)
-                
-            resp.raise_for_status()
+            # 请求计数增加
+            with self._request_count_lock:
+                self.request_count += 1
             
-            # 明确检查内容是否为空
-            if not resp.content:
-                logger.warning("获取到空响应")
-                return {"interests": [], "total": 0}
-                
-            return resp.json()
+            resp = self._session.get(url, params=params, headers=headers, timeout=self.REQUEST_TIMEOUT)
             
-        except requests.RequestException as e:
-            logger.error(f"请求第 {page} 页 {type_} 数据失败: {e}")
-            return {"interests": [], "total": 0}
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON解析失败: {e}")
-            # 输出响应内容前100字符帮助调试
-            if resp and hasattr(resp, 'text'):
-                logger.debug(f"响应内容片段: {resp.text[:100]}")
-            return {"interests": [], "total": 0}
+            # 处理速率限制，退避后重试
+            if not self._handle_rate_limit(resp, attempt, wait=attempt + 1 < self.MAX_RATE_LIMIT_RETRIES):
+                break
+                
+        return resp
     
-    def get_interests(self, user_id: str, type_: str, status: str) -> List[Dict[str, Any]]:
-        """获取用户兴趣列表（自动处理分页）
+    def _fetch_interests_chunk(self, user_id: str, type_: str, status: str, 
+                               offset: int, count: int, max_errors: int = 3,
+                               headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """获取从指定偏移量开始的一批兴趣数据
         
         参数:
             user_id: 豆瓣用户ID
-            type_: 内容类型 ('movie', 'tv', 'book', 'music', 'game', 'drama' 等)
+            type_: 内容类型
             status: 状态 ('mark', 'doing', 或 'done')
+            offset: 偏移量
+            count: 获取条数
+            max_errors: 最大连续失败次数
+            headers: 额外的请求头，如条件请求的校验头
             
         返回:
-            包含所有页结果的列表
+            包含interests、total以及响应校验头etag、last_modified的字典，
+            条件请求命中时 not_modified 为True，连续失败时返回None
         """
-        results = []
-        offset = 0
-        page = 1
-        max_errors = 3
-        error_count = 0
-        
-        logger.info(f"开始获取用户 {user_id} 的 {type_} 列表，状态: {status}")
+        url = self._interests_url_tpl.format(user_id=user_id)
+        params = {**self._base_params, "type": type_, "status": status, "start": offset, "count": count}
         
-        while True:
-            # 添加随机延迟
-            self._add_random_delay()
-            
-            url = f"https://{self.api_host}/api/v2/user/{user_id}/interests"
-            params = {
-                "type": type_,
-                "status": status,
-                "start": offset,
-                "count": 50,
-                "apiKey": self.api_key
-            }
-            
-            logger.debug(f"请求第 {page} 页 {type_} 数据，偏移量: {offset}")
+        error_count = 0
+        while error_count < max_errors:
+            logger.debug(f"请求 {type_} 数据，偏移量: {offset}")
             
+            resp = None
             try:
-                # 请求计数增加
-                self.request_count += 1
+                resp = self._do_get(url, params, headers)
                 
-                resp = requests.get(url, headers=self.headers, params=params, timeout=self.REQUEST_TIMEOUT)
-                
-                # 处理速率限制
-                if self._handle_rate_limit(resp):
-                    continue
+                # 条件请求命中，内容自上次以来没有变化
+                if resp.status_code == 304:
+                    return {"interests": [], "total": 0, "not_modified": True}
                     
                 resp.raise_for_status()
                 
                 # 检查内容是否为空
                 if not resp.content:
                     logger.warning("获取到空响应")
-                    break
-                    
-                data = resp.json()
-                
-                # 检查是否有结果
-                interests = data.get("interests", [])
-                if not interests:
-                    logger.info(f"没有更多结果，共获取 {len(results)} 条 {type_} 记录")
-                    break
-                    
-                results.extend(interests)
-                logger.info(f"获取到 {len(interests)} 条 {type_} 记录，总计: {len(results)}")
-                
-                # 重置错误计数
-                error_count = 0
-                
-                # 更新偏移量和页码
-                offset += len(interests)
-                page += 1
-                
-            except requests.RequestException as e:
-                error_count += 1
-                logger.error(f"请求 {type_} 数据失败: {e}")
-                
-                if error_count >= max_errors:
-                    logger.error(f"连续失败 {error_count} 次，中止获取")
-                    break
+                    return {"interests": [], "total": 0}
                     
-                # 增加延迟后重试
-                time.sleep(5)
-                continue
+                # 只保留分页需要的字段，其余顶层数据随响应一起释放
+                data = self._parse_json(resp)
+                return {
+                    "interests": data.get("interests") or [],
+                    "total": data.get("total", 0),
+                    "etag": resp.headers.get("ETag", ""),
+                    "last_modified": resp.headers.get("Last-Modified", "")
+                }
                 
-            except json.JSONDecodeError as e:
+            except (requests.RequestException, json.JSONDecodeError) as e:
                 error_count += 1
-                logger.error(f"解析JSON失败: {e}")
-                
+                logger.error(f"请求 {type_} 数据失败（偏移量 {offset}）: {e}")
                 # 输出响应内容前100字符帮助调试
-                if resp and hasattr(resp, 'text'):
+                if isinstance(e, json.JSONDecodeError) and resp is not None:
                     logger.debug(f"响应内容片段: {resp.text[:100]}")
                 
-                if error_count >= max_errors:
-                    logger.error(f"连续解析失败 {error_count} 次，中止获取")
+                # 增加延迟后重试
+                if error_count < max_errors:
+                    time.sleep(5)
+                    
+        logger.error(f"偏移量 {offset} 的 {type_} 数据连续失败 {error_count} 次，跳过这一批数据")
+        return None
+    
+    def _iter_interests(self, user_id: str, type_: str, status: str, 
+                        page_size: int, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """按顺序逐页获取用户兴趣列表
+        
+        参数:
+            user_id: 豆瓣用户ID
+            type_: 内容类型
+            status: 状态 ('mark', 'doing', 或 'done')
+            page_size: 每页条数
+            start: 起始偏移量
+            
+        返回:
+            逐页产生包含interests和total字段的字典，遇到空页或失败时结束
+        """
+        offset = start
+        while True:
+            data = self._fetch_interests_chunk(user_id, type_, status, offset, page_size)
+            interests = data.get("interests") if data else None
+            if not interests:
+                return
+                
+            yield data
+            
+            offset += len(interests)
+            if offset >= data.get("total", 0) > 0:
+                return
+    
+    def iter_interests_pages(self, user_id: str, type_: str, status: str, 
+                             page_size: Optional[int] = None) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """按需逐页获取用户兴趣列表，调用方停止迭代后不再请求后续页面
+        
+        参数:
+            user_id: 豆瓣用户ID
+            type_: 内容类型 ('movie', 'tv', 'book', 'music', 'game', 'drama' 等)
+            status: 状态 ('mark', 'doing', 或 'done')
+            page_size: 每页条数，默认为 PAGE_SIZE
+            
+        返回:
+            逐页产生 (页码, 当前页记录列表)，页码从1开始，每页内容即API实际返回的一页
+        """
+        pages = self._iter_interests(user_id, type_, status, page_size or self.PAGE_SIZE)
+        for page_number, data in enumerate(pages, 1):
+            yield page_number, data["interests"]
+    
+    def get_interests_page(self, user_id: str, type_: str, status: str, page: int = 1,
+                           etag: str = "", last_modified: str = "") -> Optional[Dict[str, Any]]:
+        """获取单页用户兴趣列表（不自动处理分页）
+        
+        参数:
+            user_id: 豆瓣用户ID
+            type_: 内容类型 ('movie', 'tv', 'book', 'music', 'game', 'drama' 等)
+            status: 状态 ('mark', 'doing', 或 'done')
+            page: 页码，从1开始
+            etag: 上次响应的ETag，非空时发送条件请求
+            last_modified: 上次响应的Last-Modified，非空时发送条件请求
+            
+        返回:
+            包含当前页结果的字典，包含interests、total及响应校验头etag、last_modified字段；
+            条件请求时页面没有变化返回None
+        """
+        # 计算偏移量，页码从1开始
+        offset = (page - 1) * self.PAGE_SIZE
+        logger.debug(f"请求第 {page} 页 {type_} 数据，偏移量: {offset}")
+        
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        data = self._fetch_interests_chunk(user_id, type_, status, offset, self.PAGE_SIZE, headers=headers or None)
+        if data and data.get("not_modified"):
+            return None
+        if not data or not data["interests"]:
+            return {"interests": [], "total": 0}
+        return data
+    
+    def get_interests(self, user_id: str, type_: str, status: str,
+                      request_slot: Optional[ContextManager] = None) -> List[Dict[str, Any]]:
+        """获取用户兴趣列表（自动处理分页）
+        
+        先获取第一页得到总数，其余页面通过有限大小的线程池并发获取；
+        如果响应中没有总数，则按顺序继续翻页
+        
+        参数:
+            user_id: 豆瓣用户ID
+            type_: 内容类型 ('movie', 'tv', 'book', 'music', 'game', 'drama' 等)
+            status: 状态 ('mark', 'doing', 或 'done')
+            request_slot: 可选，每次请求页面时进入的上下文（如调用方的并发信号量），
+                并发获取的每一页各自占用一个名额
+            
+        返回:
+            包含所有页结果的列表
+        """
+        logger.info(f"开始获取用户 {user_id} 的 {type_} 列表，状态: {status}")
+        
+        slot = request_slot if request_slot is not None else nullcontext()
+        pages = self._iter_interests(user_id, type_, status, self.INTERESTS_PAGE_SIZE)
+        with slot:
+            first_page = next(pages, None)
+        if first_page is None:
+            logger.info(f"没有更多结果，共获取 0 条 {type_} 记录")
+            return []
+            
+        results = list(first_page["interests"])
+        total = first_page.get("total", 0)
+        
+        if not total:
+            # 无法得知总数，顺序获取剩余页面
+            while True:
+                with slot:
+                    page = next(pages, None)
+                if page is None:
                     break
+                results.extend(page["interests"])
+            logger.info(f"共获取 {len(results)} 条 {type_} 记录")
+            return results
+            
+        # 以第一页实际返回的条数作为分页步长
+        stride = len(results)
+        offsets = list(range(stride, total, stride))
+        logger.info(f"获取到 {stride} 条 {type_} 记录，共 {total} 条，剩余 {len(offsets)} 页并发获取")
+        
+        if offsets:
+            def fetch_chunk(offset: int) -> Optional[Dict[str, Any]]:
+                with slot:
+                    return self._fetch_interests_chunk(user_id, type_, status, offset, stride)
                     
-                # 增加延迟后重试下一页
-                time.sleep(5)
-                offset += 50  # 尝试跳过可能有问题的这一批数据
-                page += 1
-                continue
+            with ThreadPoolExecutor(max_workers=self.PAGINATION_WORKERS) as executor:
+                futures = {executor.submit(fetch_chunk, offset): offset for offset in offsets}
+                chunks = {}
+                for future in as_completed(futures):
+                    data = future.result()
+                    chunks[futures[future]] = data.get("interests", []) if data else []
+                    
+            # 按偏移量顺序合并结果，合并后立即释放对应批次
+            for offset in offsets:
+                results.extend(chunks.pop(offset))
                 
+        logger.info(f"共获取 {len(results)} 条 {type_} 记录")
         return results
         
-    @retry(stop_max_attempt_number=3, wait_fixed=2000)
     def get_item_detail(self, item_id: str, type_: str) -> Dict[str, Any]:
         """获取单个条目的详细信息
         
@@ -243,22 +460,30 @@ class DoubanAPI:
         返回:
             包含详情的字典
         """
-        # 添加随机延迟
-        self._add_random_delay()
-        
-        # 请求计数增加
-        self.request_count += 1
+        url = self._item_url_tpl.format(type_=type_, item_id=item_id)
+        params = self._base_params
         
-        url = f"https://{self.api_host}/api/v2/{type_}/{item_id}"
-        params = {"apiKey": self.api_key}
+        # 已缓存的条目发送条件请求，未变化时服务端返回304
+        cache_key = (type_, item_id)
+        with self._detail_cache_lock:
+            cached = self._detail_cache.get(cache_key)
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
         
         try:
-            resp = requests.get(url, headers=self.headers, params=params, timeout=self.REQUEST_TIMEOUT)
+            resp = self._do_get(url, params, headers)
             
-            # 处理速率限制
-            if self._handle_rate_limit(resp):
-                # 递归调用直到成功
-                return self.get_item_detail(item_id, type_)
+            if resp.status_code == 304 and cached:
+                logger.debug(f"{type_} 条目 {item_id} 未变化，使用缓存详情")
+                with self._detail_cache_lock:
+                    if cache_key in self._detail_cache:
+                        self._detail_cache.move_to_end(cache_key)
+                return cached[2]
                 
             resp.raise_for_status()
             
@@ -267,7 +492,9 @@ class DoubanAPI:
                 logger.warning(f"获取 {type_} 条目 {item_id} 详情返回空响应")
                 return {}
                 
-            return resp.json()
+            data = self._parse_json(resp)
+            self._store_detail(cache_key, resp, data)
+            return data
             
         except requests.RequestException as e:
             logger.error(f"获取 {type_} 条目 {item_id} 详情失败: {e}")
@@ -279,6 +506,28 @@ class DoubanAPI:
                 logger.debug(f"响应内容片段: {resp.text[:100]}")
             return {}
             
+    def _store_detail(self, cache_key: tuple, resp: requests.Response, data: Dict[str, Any]):
+        """缓存条目详情及其校验头，供后续条件请求使用
+        
+        参数:
+            cache_key: (类型, 条目ID)
+            resp: 响应对象
+            data: 解析后的详情数据
+        """
+        etag = resp.headers.get("ETag", "")
+        last_modified = resp.headers.get("Last-Modified", "")
+        
+        with self._detail_cache_lock:
+            # 没有校验头时无法发起条件请求，不缓存
+            if not etag and not last_modified:
+                self._detail_cache.pop(cache_key, None)
+                return
+                
+            self._detail_cache[cache_key] = (etag, last_modified, data)
+            self._detail_cache.move_to_end(cache_key)
+            while len(self._detail_cache) > self.DETAIL_CACHE_SIZE:
+                self._detail_cache.popitem(last=False)
+            
     def search_items(self, query: str, type_: Optional[str] = None, page: int = 1, count: int = 20) -> Dict[str, Any]:
         """搜索条目
         
@@ -295,31 +544,14 @@ class DoubanAPI:
             logger.error("搜索关键词不能为空")
             return {"items": [], "total": 0}
             
-        # 添加随机延迟
-        self._add_random_delay()
-        
-        # 请求计数增加
-        self.request_count += 1
-        
-        url = f"https://{self.api_host}/api/v2/search"
-        params = {
-            "q": query,
-            "start": (page - 1) * count,
-            "count": count,
-            "apiKey": self.api_key
-        }
+        url = self._search_url
+        params = {**self._base_params, "q": query, "start": (page - 1) * count, "count": count}
         
         if type_ and type_ in self.CONTENT_TYPES:
             params["type"] = type_
             
         try:
-            resp = requests.get(url, headers=self.headers, params=params, timeout=self.REQUEST_TIMEOUT)
-            
-            # 处理速率限制
-            if self._handle_rate_limit(resp):
-                # 递归调用直到成功
-                return self.search_items(query, type_, page, count)
-                
+            resp = self._do_get(url, params)
             resp.raise_for_status()
             
             # 检查内容是否为空
@@ -327,7 +559,7 @@ class DoubanAPI:
                 logger.warning(f"搜索 '{query}' 返回空响应")
                 return {"items": [], "total": 0}
                 
-            return resp.json()
+            return self._parse_json(resp)
             
         except requests.RequestException as e:
             logger.error(f"搜索 '{query}' 失败: {e}")
@@ -1,22 +1,289 @@
 import os
+import re
 import json
+import queue
 import sqlite3
-import time
 import threading
-from retrying import retry
-from typing import Dict, List, Any, Optional
+import weakref
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from utils.logger import get_logger
 
 # 配置日志
 logger = get_logger("database")
 
+# 项目根目录及SQL初始化脚本路径
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+_INIT_SQL_PATH = _PROJECT_ROOT / "src" / "scripts" / "init_db.sql"
+
+
+@lru_cache(maxsize=1)
+def _load_init_script() -> Optional[str]:
+    """读取SQL初始化脚本，同一进程内只读取一次，不存在时返回None"""
+    if not _INIT_SQL_PATH.exists():
+        return None
+    return _INIT_SQL_PATH.read_text(encoding='utf-8')
+
+# 年份提取用的预编译正则
+_YEAR_RE = re.compile(r'\b(19\d{2}|20\d{2})\b')  # 文本中嵌入的四位年份
+_LEADING_YEAR_RE = re.compile(r'^(\d{4})(?:-|$)')  # 纯年份或以年份开头的日期，如 2019、2019-05-01
+
+
+def _ensure_string(value) -> str:
+    """将各种类型安全转换为字符串"""
+    # API返回的字段绝大多数已是字符串，优先走快速路径
+    if type(value) is str:
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        if not value:
+            return ""
+        return str(value[0])
+    return str(value)
+
+
+def _parse_datetime(value: str):
+    """
+    解析 'YYYY-MM-DD HH:MM:SS' 格式的时间字符串
+    
+    按固定位置切片构造datetime，比strptime快得多；格式不匹配时返回原始字符串
+    """
+    if len(value) != 19 or value[4] != '-' or value[7] != '-' or value[10] != ' ':
+        return value
+    try:
+        return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                        int(value[11:13]), int(value[14:16]), int(value[17:19]))
+    except ValueError:
+        return value
+
+
+# get_interests 允许的排序字段
+_VALID_SORT_FIELDS = ("create_time", "year", "douban_score", "my_rating", "title")
+
+
+@lru_cache(maxsize=32)
+def _build_interests_filter(has_type: bool, has_status: bool, has_year: bool,
+                            has_genre: bool, has_search: bool) -> str:
+    """
+    按筛选条件组合构建兴趣查询的WHERE子句，列表查询和计数查询共用
+    
+    参数:
+        has_type/has_status/has_year/has_genre/has_search: 是否包含对应筛选条件
+        
+    返回:
+        带占位符的WHERE子句，参数顺序见 _interests_filter_params
+    """
+    where = " WHERE 1=1"
+    if has_type:
+        where += " AND type = ?"
+    if has_status:
+        where += " AND status = ?"
+    if has_year:
+        where += " AND year = ?"
+    if has_genre:
+        # 通过标签关联表精确匹配，避免对JSON字段做全表模糊扫描
+        where += " AND id IN (SELECT interest_id FROM interest_genres WHERE genre = ?)"
+    if has_search:
+        where += " AND (card_subtitle LIKE ? OR title LIKE ?)"
+    return where
+
+
+def _interests_filter_params(type_: Optional[str], status: Optional[str], year: Optional[int],
+                             genre: Optional[str], search_query: Optional[str]) -> List[Any]:
+    """
+    按 _build_interests_filter 的占位符顺序生成查询参数
+    
+    参数:
+        type_/status/year/genre/search_query: 筛选条件，为空时不参与筛选
+        
+    返回:
+        查询参数列表
+    """
+    params = []
+    if type_:
+        params.append(type_)
+    if status:
+        params.append(status)
+    if year:
+        params.append(year)
+    if genre:
+        params.append(genre)
+    if search_query:
+        params.append(f"%{search_query}%")
+        params.append(f"%{search_query}%")
+    return params
+
+
+@lru_cache(maxsize=256)
+def _build_interests_query(has_type: bool, has_status: bool, has_year: bool,
+                           has_genre: bool, has_search: bool,
+                           sort_by: str, sort_order: str) -> str:
+    """
+    按筛选条件组合构建 get_interests 的SQL，同一组合始终返回同一字符串
+    
+    参数:
+        has_type/has_status/has_year/has_genre/has_search: 是否包含对应筛选条件
+        sort_by: 排序字段（已校验）
+        sort_order: 排序方向（已校验）
+        
+    返回:
+        带占位符的SQL语句，参数顺序与筛选条件顺序一致，最后为 LIMIT 和 OFFSET
+    """
+    where = _build_interests_filter(has_type, has_status, has_year, has_genre, has_search)
+    return f"SELECT * FROM interests{where} ORDER BY {sort_by} {sort_order} LIMIT ? OFFSET ?"
+
+
+def _year_none(card_subtitle: str) -> int:
+    """未知类型不从副标题提取年份"""
+    return 0
+
+
+def _year_from_head(card_subtitle: str) -> int:
+    """movie/tv通常以年份开头，如 "2025 / 中国大陆 / 悬疑 犯罪" """
+    head = card_subtitle.split(" / ", 1)[0].strip()
+    if head.isdigit() and len(head) == 4:
+        return int(head)
+    return 0
+
+
+def _year_from_parts_range(min_year: int, max_year: int, allow_prefix: bool = False):
+    """
+    生成按 " / " 分段查找四位年份的提取函数
+    
+    参数:
+        min_year: 合理年份下限
+        max_year: 合理年份上限
+        allow_prefix: 是否允许从分段开头提取年份，如 "2005 其他文本"
+        
+    返回:
+        提取函数
+    """
+    def extract(card_subtitle: str) -> int:
+        for part in card_subtitle.split(" / "):
+            part = part.strip()
+            if part.isdigit() and len(part) == 4:
+                if min_year <= int(part) <= max_year:
+                    return int(part)
+            # 处理可能包含年份的复合部分
+            elif allow_prefix and len(part) >= 4 and part[:4].isdigit():
+                if min_year <= int(part[:4]) <= max_year:
+                    return int(part[:4])
+        return 0
+    return extract
+
+
+def _year_from_game(card_subtitle: str) -> int:
+    """游戏格式非常多样，按单斜杠分割后查找日期格式 YYYY-MM-DD 或纯年份"""
+    game_parts = [part.strip() for part in card_subtitle.split("/")]
+    
+    # 日期通常在最后，优先检查最后一部分（完整日期或纯年份），再依次检查所有部分
+    last_part = game_parts[-1]
+    candidates = game_parts
+    if "-" not in last_part or len(last_part) >= 10:
+        candidates = [last_part] + game_parts
+        
+    for part in candidates:
+        match = _LEADING_YEAR_RE.match(part)
+        if match and 1980 <= int(match.group(1)) <= 2100:  # 合理的游戏年份范围
+            return int(match.group(1))
+    
+    # 最后尝试查找嵌入在文本中的年份
+    for match in _YEAR_RE.findall(card_subtitle):
+        if 1980 <= int(match) <= 2100:
+            return int(match)
+    return 0
+
+
+# 按内容类型分派的副标题年份提取函数
+_YEAR_EXTRACTORS = {
+    "movie": _year_from_head,
+    "tv": _year_from_head,
+    "book": _year_from_parts_range(1500, 2100),  # 合理的出版年份范围
+    "music": _year_from_parts_range(1900, 2100, allow_prefix=True),  # 合理的发行年份范围
+    "game": _year_from_game,
+}
+
+
+def _extract_year(subject_type: str, subject: Dict[str, Any], card_subtitle: str) -> int:
+    """
+    提取条目年份，优先使用subject.year字段，否则按类型从card_subtitle中提取
+    
+    参数:
+        subject_type: 内容类型
+        subject: 条目数据
+        card_subtitle: 副标题
+        
+    返回:
+        年份，无法提取时为0
+    """
+    try:
+        # 首先尝试从subject.year字段获取（主要适用于movie和tv）
+        year_raw = subject.get("year", "")
+        if year_raw and isinstance(year_raw, str) and year_raw.isdigit():
+            return int(year_raw)
+        elif year_raw and isinstance(year_raw, int):
+            return year_raw
+        
+        if not card_subtitle:
+            return 0
+        return _YEAR_EXTRACTORS.get(subject_type, _year_none)(card_subtitle)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"提取年份时出错: {e}, subtitle: {card_subtitle}")
+        return 0
+
+
 class Database:
     """处理与SQLite数据库的所有交互"""
     
     # 连接池大小
     MAX_POOL_SIZE = 5
     
+    # 数据库锁定时的最长等待时间（毫秒）
+    BUSY_TIMEOUT_MS = 5000
+    
+    # 内存映射读取的最大字节数，读取直接由操作系统页缓存提供
+    MMAP_SIZE = 256 * 1024 * 1024
+    
+    # 写线程合并到同一事务中提交的最大写操作数
+    WRITE_BATCH_SIZE = 64
+    
+    # 可与其他写操作合并到同一事务中执行的语句
+    BATCHABLE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLAC")
+    
+    # 每个连接缓存的预编译语句数量（get_interests 的筛选组合较多）
+    CACHED_STATEMENTS = 256
+    
+    # 新建数据库的页大小，较大的页可降低宽行表的B树高度
+    PAGE_SIZE = 8192
+    
+    # 插入或更新兴趣记录（原始数据未变化时跳过更新，避免重写整行和WAL）
+    UPSERT_INTEREST_SQL = """
+    INSERT INTO interests (
+        id, type, status, title, url, cover_url, 
+        douban_score, my_rating, comment,
+        year, genres, card_subtitle, create_time, raw_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        type = excluded.type, status = excluded.status, title = excluded.title,
+        url = excluded.url, cover_url = excluded.cover_url,
+        douban_score = excluded.douban_score, my_rating = excluded.my_rating, comment = excluded.comment,
+        year = excluded.year, genres = excluded.genres, card_subtitle = excluded.card_subtitle,
+        create_time = excluded.create_time, update_time = CURRENT_TIMESTAMP, raw_json = excluded.raw_json
+    WHERE interests.raw_json IS NOT excluded.raw_json
+    """
+    
+    # 初始版本之后新增的数据库对象，已存在的数据库缺少时在启动时补建
+    MIGRATED_OBJECTS = (
+        "idx_interests_type_status_ctime",
+        "idx_interests_missing_image",
+        "interest_genres",
+        "sync_watermarks",
+    )
+    
     def __init__(self, db_path: str = None):
         """初始化数据库连接
         
@@ -32,14 +299,32 @@ class Database:
         self.db_path = db_path
         logger.info(f"初始化数据库连接: {self.db_path}")
         
-        # 连接池
-        self._connection_pool = []
-        self._pool_lock = threading.Lock()
+        # 唯一的读写连接，只由写线程使用，所有写操作经队列交给写线程串行执行
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_queue = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+        self._writer_thread.start()
+        
+        # 每个线程持有自己的只读连接，线程结束后连接归还连接池供新线程复用
+        self._local = threading.local()
+        self._generation = 0  # 关闭所有连接时递增，各线程发现自己的连接已失效后自行关闭并重新获取
+        
+        # 空闲只读连接池（后进先出，优先复用最近使用的连接）
+        self._pool = queue.LifoQueue(maxsize=self.MAX_POOL_SIZE)
         
+        # 条目类型列表缓存，保存了新类型的条目时失效
+        self._distinct_types_cache: Optional[tuple] = None
+        
+        # 先创建写连接，确保数据库文件存在且已启用WAL，只读连接才能打开
+        try:
+            self._submit_write(lambda conn: None)
+        except sqlite3.Error as e:
+            logger.warning(f"创建写连接失败: {e}")
+            
         # 初始化连接池
-        for _ in range(2):  # 预创建两个连接
+        for _ in range(2):  # 预创建两个只读连接
             try:
-                conn = self._create_connection()
+                conn = self._create_connection(read_only=True)
                 self._return_to_pool(conn)
             except sqlite3.Error as e:
                 logger.warning(f"预创建连接失败: {e}")
@@ -47,22 +332,41 @@ class Database:
         # 检查并初始化数据库
         self._init_database()
         
-    def _create_connection(self) -> sqlite3.Connection:
-        """创建一个新的数据库连接"""
-        conn = sqlite3.connect(self.db_path, timeout=30)
+    def _create_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """创建一个新的数据库连接
+        
+        参数:
+            read_only: 是否以只读模式打开
+        """
+        uri = f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode={'ro' if read_only else 'rwc'}"
+        # 连接在线程间传递，但同一时刻只会被一个线程使用
+        conn = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False,
+                               cached_statements=self.CACHED_STATEMENTS)
         conn.row_factory = sqlite3.Row
         # 启用外键约束
         conn.execute("PRAGMA foreign_keys = ON")
-        # 优化写入性能
-        conn.execute("PRAGMA journal_mode = WAL")
+        if not read_only:
+            # 页大小只能在数据库创建前设置，对已存在的数据库无效，必须在启用WAL之前执行
+            conn.execute(f"PRAGMA page_size = {self.PAGE_SIZE}")
+            # 优化写入性能（日志模式保存在数据库文件中，只需由写连接设置）
+            conn.execute("PRAGMA journal_mode = WAL")
+        # 数据库被锁定时在SQLite内部等待，而不是立即报错
+        conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+        # WAL模式下NORMAL同步级别已能保证数据库一致性，减少提交时的fsync次数
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -20000")  # 约20MB页缓存
+        conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+        # 减少自动检查点的频率，避免频繁出现缓慢的提交
+        conn.execute("PRAGMA wal_autocheckpoint = 5000")
         return conn
     
     def _get_connection_from_pool(self) -> Optional[sqlite3.Connection]:
         """从连接池获取连接"""
-        with self._pool_lock:
-            if self._connection_pool:
-                return self._connection_pool.pop()
-        return None
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return None
     
     def _return_to_pool(self, conn: sqlite3.Connection) -> None:
         """将连接归还到连接池"""
@@ -70,54 +374,187 @@ class Database:
             return
             
         try:
-            # 检查连接是否有效
-            conn.execute("SELECT 1")
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            # 池已满，关闭连接
+            self._discard_connection(conn)
             
-            with self._pool_lock:
-                if len(self._connection_pool) < self.MAX_POOL_SIZE:
-                    self._connection_pool.append(conn)
-                    return
-        except sqlite3.Error:
-            # 连接已失效，不归还池
-            pass
-            
-        # 如果池已满或连接无效，关闭连接
+    def _discard_connection(self, conn: sqlite3.Connection) -> None:
+        """关闭不再使用的连接"""
         try:
             conn.close()
         except:
             pass
         
-    @retry(stop_max_attempt_number=5, 
-           wait_exponential_multiplier=1000, 
-           wait_exponential_max=10000,
-           retry_on_exception=lambda e: isinstance(e, sqlite3.OperationalError) and "database is locked" in str(e))
     def _get_connection(self) -> sqlite3.Connection:
-        """获取数据库连接，优先从连接池获取，如果失败则创建新连接"""
-        conn = self._get_connection_from_pool()
+        """获取当前线程的只读连接，首次使用时从连接池获取或新建"""
+        conn = getattr(self._local, "conn", None)
         if conn is not None:
-            try:
-                # 验证连接有效性
-                conn.execute("SELECT 1")
+            if self._local.generation == self._generation:
                 return conn
-            except sqlite3.Error:
-                # 连接无效，关闭并创建新连接
-                try:
-                    conn.close()
-                except:
-                    pass
-        
-        # 创建新连接
-        for attempt in range(5):  # 尝试5次
+            # 连接已在 close_all_connections 后失效，由持有它的线程自己关闭
+            self._discard_thread_connection()
+            
+        conn = self._get_connection_from_pool()
+        if conn is None:
+            # 创建新连接（锁等待由 busy_timeout 处理）
+            conn = self._create_connection(read_only=True)
+            
+        generation = self._generation
+        self._local.conn = conn
+        self._local.generation = generation
+            
+        # 线程结束时归还连接
+        weakref.finalize(threading.current_thread(), self._release_thread_connection, conn, generation)
+        return conn
+        
+    def _release_thread_connection(self, conn: sqlite3.Connection, generation: int) -> None:
+        """线程结束时将其只读连接归还连接池，已关闭或已失效的连接直接丢弃"""
+        try:
+            conn.in_transaction  # 已关闭的连接会抛出 ProgrammingError
+        except sqlite3.Error:
+            return
+            
+        if generation == self._generation:
+            self._return_to_pool(conn)
+        else:
+            self._discard_connection(conn)
+            
+    def _discard_thread_connection(self) -> None:
+        """丢弃当前线程已不可用的只读连接"""
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            self._discard_connection(conn)
+        
+    def _get_writer_connection(self) -> sqlite3.Connection:
+        """获取唯一的读写连接（只在写线程中调用）"""
+        if self._writer is None:
+            self._writer = self._create_connection()
+        return self._writer
+        
+    def _reset_writer_connection(self) -> None:
+        """关闭已不可用的写连接，下次使用时重新创建（只在写线程中调用）"""
+        if self._writer is not None:
+            self._discard_connection(self._writer)
+            self._writer = None
+    
+    def _submit_write(self, work, batchable: bool = False):
+        """将写操作交给写线程执行并等待结果
+        
+        参数:
+            work: 接收写连接并执行写操作的函数，为None时关闭写连接
+            batchable: 是否可与其他写操作合并到同一事务中提交
+            
+        返回:
+            work 的返回值，执行失败时抛出对应异常
+        """
+        if threading.current_thread() is self._writer_thread:
+            # 写线程内部的嵌套写操作直接执行，避免等待自身
+            if work is None:
+                return self._reset_writer_connection()
+            return work(self._get_writer_connection())
+            
+        future = Future()
+        self._write_queue.put((work, batchable, future))
+        return future.result()
+        
+    def _writer_loop(self) -> None:
+        """写线程主循环，将连续到达的可合并写操作放在同一事务中提交"""
+        pending = None
+        while True:
+            task = pending or self._write_queue.get()
+            pending = None
+            
+            batch = [task]
+            if task[1]:
+                # 取出队列中已在等待的可合并写操作，遇到不可合并的操作时留到下一轮
+                while len(batch) < self.WRITE_BATCH_SIZE:
+                    try:
+                        task = self._write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if not task[1]:
+                        pending = task
+                        break
+                    batch.append(task)
+                    
             try:
-                return self._create_connection()
-            except sqlite3.OperationalError as e:
-                if "database is locked" in str(e) and attempt < 4:
-                    time.sleep(2 ** attempt)  # 指数退避
-                    continue
-                raise
+                self._run_write_batch(batch)
+            except Exception as e:
+                # 保证写线程不会因意外错误退出
+                logger.error(f"写线程执行失败: {e}")
+                # 回滚未结束的事务，避免一个失败的操作影响之后的写操作
+                conn = self._writer
+                if conn is not None:
+                    try:
+                        if conn.in_transaction:
+                            conn.rollback()
+                    except sqlite3.Error:
+                        self._reset_writer_connection()
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                        
+    def _run_write_batch(self, batch: list) -> None:
+        """在写连接上执行一批写操作并设置各自的结果
         
-        # 如果达到这里，所有尝试都失败
-        raise sqlite3.OperationalError(f"无法创建数据库连接: {self.db_path}")
+        可合并的操作在同一个 IMMEDIATE 事务中执行，每个操作使用单独的保存点，
+        单个操作失败只回滚该操作，不影响同批的其他操作。
+        """
+        work, batchable, future = batch[0]
+        if work is None:
+            self._reset_writer_connection()
+            future.set_result(None)
+            return
+            
+        # 默认连接可用，只在遇到已关闭的连接时换用新连接重试一次
+        for attempt in range(2):
+            conn = None
+            try:
+                conn = self._get_writer_connection()
+                if not batchable:
+                    results = [(True, work(conn))]
+                else:
+                    conn.execute("BEGIN IMMEDIATE")
+                    results = []
+                    for work, _, _ in batch:
+                        conn.execute("SAVEPOINT write_task")
+                        try:
+                            results.append((True, work(conn)))
+                            conn.execute("RELEASE write_task")
+                        except Exception as e:
+                            # 非数据库异常同样只回滚该操作，避免事务一直处于打开状态
+                            if isinstance(e, sqlite3.ProgrammingError) and "closed" in str(e):
+                                raise
+                            conn.execute("ROLLBACK TO write_task")
+                            conn.execute("RELEASE write_task")
+                            results.append((False, e))
+                conn.commit()
+                break
+                
+            except sqlite3.Error as e:
+                # 已关闭的连接上语句不会被执行，可以安全重试
+                closed = isinstance(e, sqlite3.ProgrammingError) and "closed" in str(e)
+                if conn and not closed:
+                    try:
+                        conn.rollback()
+                    except:
+                        closed = True
+                if closed:
+                    # 连接已不可用，丢弃而不再复用
+                    self._reset_writer_connection()
+                    if attempt == 0 and isinstance(e, sqlite3.ProgrammingError):
+                        logger.warning("数据库写连接已关闭，使用新连接重试")
+                        continue
+                results = [(False, e)] * len(batch)
+                break
+                
+        for (ok, value), (_, _, future) in zip(results, batch):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
     
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """通用查询执行方法
@@ -129,36 +566,46 @@ class Database:
         返回:
             查询结果的字典列表
         """
-        conn = None
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            
-            if query.strip().upper().startswith(("SELECT", "PRAGMA")):
-                rows = cursor.fetchall()
-                results = []
-                for row in rows:
-                    item = {}
-                    for key in row.keys():
-                        item[key] = row[key]
-                    results.append(item)
-                return results
-            else:
-                conn.commit()
+        statement = query.lstrip()[:6].upper()
+        
+        # 其余语句交给写线程串行执行
+        if statement != "SELECT":
+            def work(conn):
+                cursor = conn.execute(query, params)
+                if statement == "PRAGMA":
+                    return [dict(row) for row in cursor.fetchall()]
                 return [{"rowcount": cursor.rowcount, "lastrowid": cursor.lastrowid}]
                 
-        except sqlite3.Error as e:
-            if conn:
-                try:
-                    conn.rollback()
-                except:
-                    pass
-            logger.error(f"执行查询失败: {e}, 查询: {query}")
-            raise
-        finally:
-            if conn:
-                self._return_to_pool(conn)
+            try:
+                return self._submit_write(work, batchable=statement in self.BATCHABLE_STATEMENTS)
+            except sqlite3.Error as e:
+                logger.error(f"执行查询失败: {e}, 查询: {query}")
+                raise
+        
+        # SELECT 使用当前线程的只读连接，默认连接可用，只在遇到已关闭的连接时换用新连接重试一次
+        for attempt in range(2):
+            conn = None
+            try:
+                conn = self._get_connection()
+                cursor = conn.execute(query, params)
+                return [dict(row) for row in cursor.fetchall()]
+                
+            except sqlite3.Error as e:
+                # 已关闭的连接上语句不会被执行，可以安全重试
+                closed = isinstance(e, sqlite3.ProgrammingError) and "closed" in str(e)
+                if conn and not closed:
+                    try:
+                        conn.rollback()
+                    except:
+                        closed = True
+                if closed:
+                    # 连接已不可用，丢弃而不再复用
+                    self._discard_thread_connection()
+                    if attempt == 0 and isinstance(e, sqlite3.ProgrammingError):
+                        logger.warning(f"数据库连接已关闭，使用新连接重试: {query}")
+                        continue
+                logger.error(f"执行查询失败: {e}, 查询: {query}")
+                raise
     
     def execute_script(self, script: str) -> bool:
         """执行SQL脚本
@@ -169,23 +616,19 @@ class Database:
         返回:
             执行是否成功
         """
-        conn = None
         try:
-            conn = self._get_connection()
-            conn.executescript(script)
-            conn.commit()
+            self._submit_write(lambda conn: conn.executescript(script))
             return True
         except sqlite3.Error as e:
-            if conn:
-                try:
-                    conn.rollback()
-                except:
-                    pass
             logger.error(f"执行脚本失败: {e}")
             return False
-        finally:
-            if conn:
-                self._return_to_pool(conn)
+    
+    def _read_init_script(self) -> Optional[str]:
+        """读取SQL初始化脚本，不存在时返回None"""
+        sql_script = _load_init_script()
+        if sql_script is None:
+            logger.error(f"SQL初始化脚本不存在: {_INIT_SQL_PATH}")
+        return sql_script
     
     def _init_database(self):
         """确保数据库结构已创建"""
@@ -198,38 +641,49 @@ class Database:
             if not result:
                 logger.info("数据库结构不存在，开始初始化")
                 
-                # 读取SQL初始化脚本
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))  # 到达项目根目录
-                script_path = os.path.join(project_root, "src", "scripts", "init_db.sql")
-                
-                if os.path.exists(script_path):
-                    with open(script_path, 'r', encoding='utf-8') as f:
-                        sql_script = f.read()
-                        
-                    # 执行SQL脚本（其中已包含版本插入语句，不要再次插入）
+                sql_script = self._read_init_script()
+                # 执行SQL脚本（其中已包含版本插入语句，不要再次插入）
+                if sql_script is not None:
                     if self.execute_script(sql_script):
                         logger.info("数据库结构初始化完成")
                     else:
                         logger.error("执行SQL初始化脚本失败")
-                else:
-                    logger.error(f"SQL初始化脚本不存在: {script_path}")
             else:
                 logger.info("数据库结构已存在")
+                self._migrate_schema()
                     
         except Exception as e:
             logger.error(f"初始化数据库失败: {e}")
             raise
     
-    def _ensure_string(self, value):
-        """将各种类型安全转换为字符串"""
-        if value is None:
-            return ""
-        if isinstance(value, list):
-            if not value:
-                return ""
-            return str(value[0])
-        return str(value)
-
+    def _migrate_schema(self):
+        """为已存在的数据库补建新增的表和索引，并更新查询规划器的统计信息"""
+        existing = {
+            row["name"] for row in self.execute_query("SELECT name FROM sqlite_master")
+        }
+        missing = [name for name in self.MIGRATED_OBJECTS if name not in existing]
+        if not missing:
+            return
+            
+        logger.info(f"补建数据库对象: {', '.join(missing)}")
+        
+        # 初始化脚本中的语句均可重复执行，直接重新执行以补建缺失对象
+        sql_script = self._read_init_script()
+        if sql_script is None or not self.execute_script(sql_script):
+            logger.error("补建数据库对象失败")
+            return
+            
+        if "interest_genres" in missing:
+            # 新建的标签关联表需要从已有记录回填
+            self.execute_query("""
+            INSERT INTO interest_genres (interest_id, genre)
+            SELECT interests.id, TRIM(json_each.value)
+            FROM interests, json_each(interests.genres)
+            WHERE json_valid(interests.genres) AND TRIM(json_each.value) != ''
+            """)
+            
+        self.execute_script("ANALYZE;")
+    
     def _validate_interest_data(self, data):
         """验证兴趣数据的有效性"""
         required_fields = ["id", "status", "create_time"]
@@ -275,236 +729,127 @@ class Database:
             logger.error(f"获取条目数量失败: {e}")
             return 0
 
-    @retry(stop_max_attempt_number=5, wait_exponential_multiplier=1000, wait_exponential_max=10000)
+    def _prepare_interest_row(self, interest_data: Dict[str, Any]) -> Optional[tuple]:
+        """验证兴趣数据并转换为数据库行
+        
+        参数:
+            interest_data: API返回的兴趣数据
+            
+        返回:
+            按 UPSERT_INTEREST_SQL 列顺序排列的元组，数据无效时返回None
+        """
+        # 验证数据
+        is_valid, error_msg = self._validate_interest_data(interest_data)
+        if not is_valid:
+            logger.error(f"无效的兴趣数据: {error_msg}")
+            return None
+            
+        # 提取interest数据中的关键字段
+        interest_id = interest_data.get("id")
+        if not interest_id:
+            logger.error("兴趣数据缺少ID字段")
+            return None
+            
+        # 安全获取subject字段
+        subject = interest_data.get("subject", {})
+        if not subject:
+            logger.error(f"兴趣数据 {interest_id} 缺少subject字段")
+            return None
+        
+        # 直接使用API返回的原始类型
+        subject_type = subject.get("type", "")
+  
+        # 提取基本信息
+        title = _ensure_string(subject.get("title"))
+        
+        url = _ensure_string(subject.get("url"))
+
+        # 直接使用cover_url字段，降级到嵌套的pic字段
+        cover_url = subject.get("cover_url", "")
+        if not cover_url:
+            cover_obj = subject.get("pic", {})
+            if isinstance(cover_obj, dict):
+                cover_url = cover_obj.get("large", cover_obj.get("normal", ""))
+        
+        # 安全处理评分
+        douban_score = 0
+        if "rating" in subject and subject["rating"]:
+            douban_score = subject["rating"].get("value", 0)
+            
+        genres = json.dumps(subject.get("genres", []),ensure_ascii=False)
+        comment = _ensure_string(interest_data.get("comment"))
+        status = _ensure_string(interest_data.get("status"))
+        create_time = _ensure_string(interest_data.get("create_time"))
+        card_subtitle = _ensure_string(subject.get("card_subtitle"))
+
+        my_rating = 0
+        if "rating" in interest_data and interest_data["rating"]:
+            my_rating = interest_data["rating"].get("value", 0)
+
+        year = _extract_year(subject_type, subject, card_subtitle)
+        
+        # 将整个数据转换为JSON字符串
+        raw_json = json.dumps(interest_data, ensure_ascii=False)
+
+        return (
+            interest_id, subject_type, status, title, url, cover_url,
+            douban_score, my_rating, comment,
+            year, genres, card_subtitle, create_time, raw_json
+        )
+
     def save_interest(self, interest_data: Dict[str, Any]) -> str:
         """保存或更新一条兴趣数据"""
-        conn = None
         try:
-            # 验证数据
-            is_valid, error_msg = self._validate_interest_data(interest_data)
-            if not is_valid:
-                logger.error(f"无效的兴趣数据: {error_msg}")
-                return None
-                
-            # 提取interest数据中的关键字段
-            interest_id = interest_data.get("id")
-            if not interest_id:
-                logger.error("兴趣数据缺少ID字段")
-                return None
-                
-            # 安全获取subject字段
-            subject = interest_data.get("subject", {})
-            if not subject:
-                logger.error(f"兴趣数据 {interest_id} 缺少subject字段")
+            row = self._prepare_interest_row(interest_data)
+            if row is None:
                 return None
+            interest_id, title, subject_type = row[0], row[3], row[1]
             
-            # 直接使用API返回的原始类型
-            subject_type = subject.get("type", "")
-  
-            # 提取基本信息
-            title = self._ensure_string(subject.get("title", ""))
-            
-            url = self._ensure_string(subject.get("url", ""))
-
-            # 直接使用cover_url字段，降级到嵌套的pic字段
-            cover_url = subject.get("cover_url", "")
-            if not cover_url:
-                cover_obj = subject.get("pic", {})
-                if isinstance(cover_obj, dict):
-                    cover_url = cover_obj.get("large", cover_obj.get("normal", ""))
-            
-            # 安全处理评分
-            douban_score = 0
-            if "rating" in subject and subject["rating"]:
-                douban_score = subject["rating"].get("value", 0)
-                
-            genres = json.dumps(subject.get("genres", []),ensure_ascii=False)
-            comment = self._ensure_string(interest_data.get("comment", ""))
-            status = self._ensure_string(interest_data.get("status", ""))
-            create_time = self._ensure_string(interest_data.get("create_time", ""))
-            card_subtitle = self._ensure_string(subject.get("card_subtitle", ""))
-
-            my_rating = 0
-            if "rating" in interest_data and interest_data["rating"]:
-                my_rating = interest_data["rating"].get("value", 0)
-
-            year = 0
-            try:
-                # 首先尝试从subject.year字段获取（主要适用于movie和tv）
-                year_raw = subject.get("year", "")
-                if year_raw and isinstance(year_raw, str) and year_raw.isdigit():
-                    year = int(year_raw)
-                elif year_raw and isinstance(year_raw, int):
-                    year = year_raw
-                
-                # 如果没有获取到年份且有card_subtitle，尝试从中提取
-                if year == 0 and card_subtitle:
-                    parts = card_subtitle.split(" / ")
-                    
-                    # 根据不同内容类型采用不同提取策略
-                    if subject_type == "movie" or subject_type == "tv":
-                        # movie/tv通常以年份开头: "2025 / 中国大陆 / 悬疑 犯罪"
-                        if parts and parts[0].strip().isdigit() and len(parts[0].strip()) == 4:
-                            year = int(parts[0].strip())
-                            
-                    elif subject_type == "book":
-                        # 书籍通常年份在第二部分: "[美] 作者 / 2025 / 出版社"
-                        for part in parts:
-                            part = part.strip()
-                            if part.isdigit() and len(part) == 4:
-                                potential_year = int(part)
-                                if 1500 <= potential_year <= 2100:  # 合理的出版年份范围
-                                    year = potential_year
-                                    break
-                                    
-                    elif subject_type == "music":
-                        # 音乐通常格式为: "张震岳 / 2005" 或中间可能有其他内容
-                        for part in parts:
-                            part = part.strip()
-                            if part.isdigit() and len(part) == 4:
-                                potential_year = int(part)
-                                if 1900 <= potential_year <= 2100:  # 合理的发行年份范围
-                                    year = potential_year
-                                    break
-                            # 处理可能包含年份的复合部分，如 "2005 其他文本"
-                            elif part and len(part) >= 4:
-                                year_str = part[:4]
-                                if year_str.isdigit():
-                                    potential_year = int(year_str)
-                                    if 1900 <= potential_year <= 2100:
-                                        year = potential_year
-                                        break
-                                    
-                    # 在save_interest方法的年份提取部分，替换游戏类型的处理逻辑为：
-
-                    elif subject_type == "game":
-                        # 游戏格式非常多样，需要多种策略
-                        
-                        # 1. 尝试多级分隔 - 优先按空格斜杠空格分割，如果分割结果少于2部分，再按单斜杠分割
-                        game_parts = parts
-                        game_parts = card_subtitle.split("/")
-                        
-                        # 2. 查找日期格式 YYYY-MM-DD 或纯年份
-                        year_found = False
-                        
-                        # 2.1 先检查最后一部分，因为日期通常在最后
-                        if game_parts:
-                            last_part = game_parts[-1].strip()
-                            # 处理 YYYY-MM-DD 格式
-                            if "-" in last_part and len(last_part) >= 10:
-                                date_parts = last_part.split("-")
-                                if len(date_parts) >= 2 and date_parts[0].isdigit() and len(date_parts[0]) == 4:
-                                    potential_year = int(date_parts[0])
-                                    if 1980 <= potential_year <= 2100:  # 合理的游戏年份范围
-                                        year = potential_year
-                                        year_found = True
-                                        logger.debug(f"从游戏格式1中提取年份: {potential_year}, 源: {last_part}")
-                            # 处理纯年份格式
-                            elif last_part.isdigit() and len(last_part) == 4:
-                                potential_year = int(last_part)
-                                if 1980 <= potential_year <= 2100:
-                                    year = potential_year
-                                    year_found = True
-                                    logger.debug(f"从游戏格式2中提取年份: {potential_year}, 源: {last_part}")
-                        
-                        # 2.2 如果最后一部分没找到，检查所有部分
-                        if not year_found:
-                            for part in game_parts:
-                                part = part.strip()
-                                
-                                # 处理 YYYY-MM-DD 格式
-                                if "-" in part:
-                                    date_segment = part.split("-")[0]
-                                    if date_segment.isdigit() and len(date_segment) == 4:
-                                        potential_year = int(date_segment)
-                                        if 1980 <= potential_year <= 2100:
-                                            year = potential_year
-                                            year_found = True
-                                            logger.debug(f"从游戏格式3中提取年份: {potential_year}, 源: {part}")
-                                            break
-                                            
-                                # 处理纯年份格式
-                                elif part.isdigit() and len(part) == 4:
-                                    potential_year = int(part)
-                                    if 1980 <= potential_year <= 2100:
-                                        year = potential_year
-                                        year_found = True
-                                        logger.debug(f"从游戏格式4中提取年份: {potential_year}, 源: {part}")
-                                        break
-                        
-                        # 3. 最后尝试查找嵌入在文本中的年份
-                        if not year_found:
-                            # 使用正则表达式查找四位数字年份模式
-                            import re
-                            year_matches = re.findall(r'\b(19\d{2}|20\d{2})\b', card_subtitle)
-                            if year_matches:
-                                for match in year_matches:
-                                    potential_year = int(match)
-                                    if 1980 <= potential_year <= 2100:
-                                        year = potential_year
-                                        year_found = True
-                                        logger.debug(f"从游戏格式5中提取年份: {potential_year}, 源: {match}")
-                                        break
-                                        
-                        if year_found:
-                            logger.info(f"游戏 '{title}' 成功提取年份: {year}")
-                        else:
-                            logger.info(f"游戏 '{title}' 无法提取年份，card_subtitle: {card_subtitle}")
-                            
-            except (ValueError, TypeError) as e:
-                logger.warning(f"提取年份时出错: {e}, subtitle: {card_subtitle}")
-                year = 0
-            
-            
-            
-            # 将整个数据转换为JSON字符串
-            raw_json = json.dumps(interest_data, ensure_ascii=False)
-            
-            conn = self._get_connection()
-            
-            # 检查记录是否存在
-            result = self.execute_query("SELECT id FROM interests WHERE id = ?", (interest_id,))
-            exists = len(result) > 0
-            
-            if exists:
-                # 更新现有记录
-                self.execute_query("""
-                UPDATE interests
-                SET type = ?, status = ?, title = ?, url = ?, cover_url = ?, 
-                    douban_score = ?, my_rating = ?, comment = ?,
-                    year = ?, genres = ?, card_subtitle = ?, create_time = ?, 
-                    update_time = CURRENT_TIMESTAMP, raw_json = ?
-                WHERE id = ?
-                """, (
-                    subject_type, status, title, url, cover_url, 
-                    douban_score, my_rating, comment,
-                    year, genres, card_subtitle, create_time, raw_json,
-                    interest_id
-                ))
-                logger.debug(f"更新记录: {interest_id}, 标题: {title}")
-            else:
-                # 插入新记录
-                self.execute_query("""
-                INSERT INTO interests (
-                    id, type, status, title, url, cover_url, 
-                    douban_score, my_rating, comment,
-                    year, genres, card_subtitle, create_time, raw_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    interest_id, subject_type, status, title, url, cover_url, 
-                    douban_score, my_rating, comment,
-                    year, genres, card_subtitle, create_time, raw_json
-                ))
-                logger.info(f"新增记录: {interest_id}, 标题: {title}, 类型: {subject_type}")
+            # 插入新记录，已存在时直接在冲突处更新
+            self.execute_query(self.UPSERT_INTEREST_SQL, row)
+            self._invalidate_distinct_types((subject_type,))
+            logger.debug(f"保存记录: {interest_id}, 标题: {title}, 类型: {subject_type}")
             
             return interest_id
             
         except Exception as e:
             logger.error(f"保存兴趣数据失败: {e}")
             return None
-        finally:
-            if conn:
-                self._return_to_pool(conn)
+            
+    def save_interests_bulk(self, items: List[Dict[str, Any]]) -> List[str]:
+        """在单个事务中批量保存或更新兴趣数据
+        
+        参数:
+            items: API返回的兴趣数据列表
+            
+        返回:
+            成功保存的条目ID列表，无效数据会被跳过
+        """
+        rows = []
+        for interest_data in items:
+            try:
+                row = self._prepare_interest_row(interest_data)
+            except Exception as e:
+                logger.error(f"处理兴趣数据失败: {e}")
+                continue
+            if row is not None:
+                rows.append(row)
+                
+        if not rows:
+            return []
+            
+        try:
+            # 写线程在同一个事务中执行整批 UPSERT
+            self._submit_write(
+                lambda conn: conn.executemany(self.UPSERT_INTEREST_SQL, rows), batchable=True
+            )
+        except sqlite3.Error as e:
+            logger.error(f"批量保存兴趣数据失败: {e}")
+            return []
+                
+        self._invalidate_distinct_types({row[1] for row in rows})
+        logger.info(f"批量保存 {len(rows)} 条兴趣数据")
+        return [row[0] for row in rows]
        
     def get_interests(self, 
                       type_: Optional[str] = None, 
@@ -533,46 +878,23 @@ class Database:
             匹配条件的兴趣记录列表
         """
         try:
-            # 构建查询
-            query = "SELECT * FROM interests WHERE 1=1"
-            params = []
-            
-            if type_:
-                query += " AND type = ?"
-                params.append(type_)
-                
-            if status:
-                query += " AND status = ?"
-                params.append(status)
-                
-            if year:
-                query += " AND year = ?"
-                params.append(year)
-                
-            if genre:
-                query += " AND genres LIKE ?"
-                params.append(f"%{genre}%")
-
-            if search_query:
-                query += " AND (card_subtitle LIKE ? OR title LIKE ?)"
-                params.append(f"%{search_query}%")
-                params.append(f"%{search_query}%")
+            # 构建查询参数，SQL文本按筛选条件组合复用同一字符串，命中连接的语句缓存
+            params = _interests_filter_params(type_, status, year, genre, search_query)
             
             # 添加排序
-            valid_sort_fields = [
-                "create_time", "year", "douban_score", "my_rating", "title"
-            ]
-            
-            if sort_by not in valid_sort_fields:
+            if sort_by not in _VALID_SORT_FIELDS:
                 sort_by = "create_time"
                 
-            if sort_order.lower() not in ["asc", "desc"]:
+            sort_order = sort_order.lower()
+            if sort_order not in ("asc", "desc"):
                 sort_order = "desc"
                 
-            query += f" ORDER BY {sort_by} {sort_order}"
+            query = _build_interests_query(
+                bool(type_), bool(status), bool(year), bool(genre), bool(search_query),
+                sort_by, sort_order
+            )
             
             # 添加分页
-            query += " LIMIT ? OFFSET ?"
             params.extend([limit, offset])
             
             # 执行查询
@@ -580,13 +902,9 @@ class Database:
 
             # 处理日期字段
             for item in results:
-                if 'create_time' in item and item['create_time'] and isinstance(item['create_time'], str):
-                    try:
-                        # 假设日期格式为 'YYYY-MM-DD HH:MM:SS'
-                        item['create_time'] = datetime.strptime(item['create_time'], '%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        # 如果格式不匹配，保留原始字符串
-                        pass
+                create_time = item.get('create_time')
+                if create_time and isinstance(create_time, str):
+                    item['create_time'] = _parse_datetime(create_time)
 
             return results
             
@@ -594,6 +912,36 @@ class Database:
             logger.error(f"查询兴趣列表失败: {e}")
             return []
     
+    def count_interests(self,
+                        type_: Optional[str] = None,
+                        status: Optional[str] = None,
+                        year: Optional[int] = None,
+                        genre: Optional[str] = None,
+                        search_query: Optional[str] = None) -> int:
+        """统计符合筛选条件的兴趣数量，筛选条件与 get_interests 完全一致
+        
+        参数:
+            type_: 类型过滤 (movie, tv, book 等)
+            status: 状态过滤 (mark, doing, done)
+            year: 年份过滤
+            genre: 按标签/类型筛选
+            search_query: 在标题和副标题中模糊匹配
+            
+        返回:
+            匹配的记录数，查询失败时返回0
+        """
+        try:
+            where = _build_interests_filter(
+                bool(type_), bool(status), bool(year), bool(genre), bool(search_query)
+            )
+            params = _interests_filter_params(type_, status, year, genre, search_query)
+            result = self.execute_query(f"SELECT COUNT(*) AS count FROM interests{where}", params)
+            return result[0]['count'] if result else 0
+            
+        except Exception as e:
+            logger.error(f"统计兴趣数量失败: {e}")
+            return 0
+    
     def get_interest_by_id(self, id: str) -> Optional[Dict[str, Any]]:
         """通过ID获取单个兴趣记录
         
@@ -610,6 +958,23 @@ class Database:
         except Exception as e:
             logger.error(f"获取兴趣记录失败: {e}")
             return None
+            
+    def get_all_ids(self, type_: str) -> set:
+        """获取指定类型的全部记录ID
+        
+        参数:
+            type_: 内容类型 (movie, tv, book 等)
+            
+        返回:
+            记录ID集合
+        """
+        try:
+            results = self.execute_query("SELECT id FROM interests WHERE type = ?", (type_,))
+            return {row["id"] for row in results}
+            
+        except Exception as e:
+            logger.error(f"获取记录ID失败: {e}")
+            return set()
     
     def get_latest_timestamps(self, type_: str) -> Dict[str, str]:
         """获取每种状态的最新时间戳
@@ -621,18 +986,18 @@ class Database:
             包含每种状态最新时间戳的字典
         """
         try:
-            results = {}
-            for status in ["mark", "doing", "done"]:
-                query_result = self.execute_query("""
-                SELECT MAX(create_time) as latest
-                FROM interests
-                WHERE type = ? AND status = ?
-                """, (type_, status))
-                
-                if query_result and "latest" in query_result[0]:
-                    results[status] = query_result[0]["latest"] or ""
-                else:
-                    results[status] = ""
+            results = {"mark": "", "doing": "", "done": ""}
+            # 一次分组查询取得所有状态的最新时间，可直接使用(type, status, create_time)索引
+            query_result = self.execute_query("""
+            SELECT status, MAX(create_time) as latest
+            FROM interests
+            WHERE type = ?
+            GROUP BY status
+            """, (type_,))
+            
+            for row in query_result:
+                if row["status"] in results:
+                    results[row["status"]] = row["latest"] or ""
                 
             return results
             
@@ -640,6 +1005,66 @@ class Database:
             logger.error(f"获取最新时间戳失败: {e}")
             return {"mark": "", "doing": "", "done": ""}
     
+    def get_sync_stats(self) -> Dict[Tuple[str, str], Tuple[int, str]]:
+        """一次分组查询取得每种类型和状态的条目数与最新时间戳
+        
+        返回:
+            以 (类型, 状态) 为键、(条目数, 最新时间戳) 为值的字典
+        """
+        try:
+            query_result = self.execute_query("""
+            SELECT type, status, COUNT(*) AS count, MAX(create_time) AS latest
+            FROM interests
+            GROUP BY type, status
+            """)
+            return {
+                (row["type"], row["status"]): (row["count"], row["latest"] or "")
+                for row in query_result
+            }
+            
+        except Exception as e:
+            logger.error(f"获取同步统计信息失败: {e}")
+            return {}
+    
+    def get_watermark(self, name: str) -> Optional[str]:
+        """读取同步水位
+        
+        参数:
+            name: 水位名称，如 last_sync
+            
+        返回:
+            保存的时间字符串，不存在时返回None
+        """
+        try:
+            results = self.execute_query("SELECT ts FROM sync_watermarks WHERE name = ?", (name,))
+            return results[0]["ts"] if results else None
+            
+        except Exception as e:
+            logger.error(f"读取同步水位失败: {e}")
+            return None
+    
+    def set_watermark(self, name: str, ts: str) -> bool:
+        """保存同步水位
+        
+        参数:
+            name: 水位名称，如 last_sync
+            ts: 时间字符串
+            
+        返回:
+            是否保存成功
+        """
+        try:
+            self.execute_query(
+                "INSERT INTO sync_watermarks (name, ts) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET ts = excluded.ts",
+                (name, ts)
+            )
+            return True
+            
+        except Exception as e:
+            logger.error(f"保存同步水位失败: {e}")
+            return False
+    
     def get_items_without_local_image(self) -> List[Dict[str, Any]]:
         """获取所有没有图片缓存的条目
         
@@ -690,22 +1115,67 @@ class Database:
             logger.error(f"更新条目图片路径失败: {e}")
             return False
 
+    def update_local_paths_bulk(self, pairs: List[tuple]) -> int:
+        """在单个事务中批量更新本地图片路径
+        
+        参数:
+            pairs: (local_path, item_id) 元组列表
+            
+        返回:
+            更新的记录数，失败时为0
+        """
+        if not pairs:
+            return 0
+            
+        try:
+            # 写线程在同一个事务中执行整批更新
+            rowcount = self._submit_write(
+                lambda conn: conn.executemany(
+                    "UPDATE interests SET local_path = ? WHERE id = ?", pairs
+                ).rowcount,
+                batchable=True
+            )
+            logger.debug(f"批量更新 {rowcount} 条本地图片路径")
+            return rowcount
+        except sqlite3.Error as e:
+            logger.error(f"批量更新本地图片路径失败: {e}")
+            return 0
+
     def get_distinct_types(self):
         """获取数据库中所有不同的条目类型"""
+        cached = self._distinct_types_cache
+        if cached is not None:
+            return list(cached)
+            
         try:
             types_result = self.execute_query("SELECT DISTINCT type FROM interests ORDER BY type")
-            return [row['type'] for row in types_result] if types_result else []
+            types = tuple(row['type'] for row in types_result)
+            self._distinct_types_cache = types
+            return list(types)
         except Exception as e:
             logger.error(f"获取类型列表失败: {e}")
             return []
             
+    def _invalidate_distinct_types(self, types) -> None:
+        """保存的条目中出现缓存中没有的类型时，使类型列表缓存失效"""
+        cached = self._distinct_types_cache
+        if cached is not None and not set(types).issubset(cached):
+            self._distinct_types_cache = None
+            
     def close_all_connections(self):
-        """关闭所有连接池中的连接"""
-        with self._pool_lock:
-            for conn in self._connection_pool:
-                try:
-                    conn.close()
-                except:
-                    pass
-            self._connection_pool = []
+        """关闭写连接和所有连接池中的连接，并使各线程的只读连接失效
+        
+        连接可能正被其他线程使用，因此不在这里关闭；各线程下次获取连接时
+        发现代数已变化会自行关闭旧连接，线程结束时失效的连接也会被直接丢弃
+        """
+        self._submit_write(None)
+            
+        # 使各线程缓存的连接失效
+        self._generation += 1
+            
+        while True:
+            conn = self._get_connection_from_pool()
+            if conn is None:
+                break
+            self._discard_connection(conn)
         logger.info("关闭所有数据库连接")
\ No newline at end of file
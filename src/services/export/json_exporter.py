@@ -9,10 +9,12 @@
 import os
 import sys
 import json
-import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
+from statistics import fmean
 
 # 添加路径处理，确保可以导入项目模块
 script_dir = Path(__file__).parent
@@ -21,15 +23,55 @@ project_root = script_dir.parent.parent.parent  # 调整路径以适应新的目
 # 导入项目模块
 from services.data.database import Database
 from utils.logger import get_logger
-from utils.serialization_utils import safe_serialize, safe_json_dumps
+from utils.serialization_utils import safe_serialize, safe_json_bytes
 from utils.validation_utils import validate_string, validate_int, validate_bool
 
 # 配置日志
 logger = get_logger("json_export")
 
+# 个人评分分段，_RATING_BUCKET 按评分(0-10)索引得到分段下标
+_RATING_LABELS = ("未评分", "1-2星", "3-5星", "6-7星", "8-10星")
+_RATING_BUCKET = (0, 1, 1, 2, 2, 2, 3, 3, 4, 4, 4)
+
+# 可直接写入JSON、无需转换的基本类型
+_JSON_PRIMS = (str, int, float, bool, type(None))
+
+
+def _export_record(item: Dict, include_raw: bool) -> Dict:
+    """生成单条记录的导出形式，只转换非基本类型的字段
+    
+    参数:
+        item: 数据库记录
+        include_raw: 是否包含raw_json字段
+        
+    返回:
+        可序列化的记录，无需改动时直接返回原字典
+    """
+    export_item = item
+    for key, value in item.items():
+        if not isinstance(value, _JSON_PRIMS):
+            # 首次需要改动时才浅拷贝，避免修改调用方的数据
+            if export_item is item:
+                export_item = dict(item)
+            export_item[key] = safe_serialize(value)
+    
+    # 处理raw_json字段
+    if not include_raw and 'raw_json' in export_item:
+        if export_item is item:
+            export_item = dict(item)
+        del export_item['raw_json']
+    return export_item
+
+
 class JsonExporter:
     """豆瓣数据导出器，将数据库内容导出为JSON格式"""
     
+    # 并发导出的最大线程数
+    MAX_EXPORT_WORKERS = 8
+    
+    # 导出文件的写缓冲区大小
+    WRITE_BUFFER_SIZE = 1 << 20
+    
     def __init__(self, db_instance=None):
         """初始化导出器
         
@@ -91,6 +133,30 @@ class JsonExporter:
             
         logger.info(f"获取到 {len(items)} 条记录")
         
+        return self._export_items(items, type_, status, year, output_path, include_raw, pretty_print)
+        
+    def _export_items(self,
+                      items: List[Dict],
+                      type_: Optional[str],
+                      status: Optional[str],
+                      year: Optional[int],
+                      output_path: Optional[str],
+                      include_raw: bool,
+                      pretty_print: bool) -> Optional[str]:
+        """将已查询出的记录导出为JSON文件
+        
+        参数:
+            items: 要导出的记录列表
+            type_: 类型筛选（写入元数据和文件名）
+            status: 状态筛选
+            year: 年份筛选
+            output_path: 输出文件路径，如果为None则自动生成
+            include_raw: 是否包含raw_json字段
+            pretty_print: 是否美化JSON输出
+            
+        返回:
+            输出文件路径，写入失败时返回None
+        """
         # 准备输出数据
         export_data = {
             "metadata": {
@@ -105,20 +171,9 @@ class JsonExporter:
                 }
             },
             "statistics": self._generate_statistics(items),
-            "interests": []
+            "interests": []  # 写入文件时逐条流式输出
         }
         
-        # 处理每条记录，确保可序列化
-        for item in items:
-            export_item = safe_serialize(item)
-            
-            # 处理raw_json字段
-            if not include_raw and 'raw_json' in export_item:
-                del export_item['raw_json']
-                
-            # 添加到输出列表
-            export_data["interests"].append(export_item)
-            
         # 确定输出路径
         if not output_path:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -140,12 +195,10 @@ class JsonExporter:
             
             output_path = os.path.join(exports_dir, filename)
             
-        # 导出为JSON，使用安全序列化
-        indent = 2 if pretty_print else None
+        # 导出为JSON，逐条序列化记录并写入带缓冲的文件，不在内存中构造完整的JSON
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json_str = safe_json_dumps(export_data, indent=indent)
-                f.write(json_str)
+            with open(output_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+                self._write_export(f, export_data, items, include_raw, pretty_print)
                 
             logger.info(f"数据已导出到: {output_path}")
             return output_path
@@ -153,6 +206,37 @@ class JsonExporter:
             logger.error(f"写入JSON文件失败: {e}")
             return None
     
+    def _write_export(self, f, export_data: Dict, items: List[Dict],
+                      include_raw: bool, pretty_print: bool) -> None:
+        """将导出数据写入文件，interests 列表逐条序列化写入
+        
+        参数:
+            f: 以二进制模式打开的文件
+            export_data: 导出数据，interests 为空列表占位
+            items: 要导出的记录列表
+            include_raw: 是否包含raw_json字段
+            pretty_print: 是否美化JSON输出
+        """
+        # interests 是最后一个字段，以其空列表为界拆分出头部和尾部
+        document = safe_json_bytes(export_data, indent=2 if pretty_print else None)
+        split_at = document.rindex(b"[]")
+        f.write(document[:split_at + 1])
+        
+        # 美化输出时每条记录位于第二层缩进
+        indent = b"\n    " if pretty_print else b""
+        for i, item in enumerate(items):
+            # 处理每条记录，确保可序列化
+            export_item = _export_record(item, include_raw)
+            
+            if i:
+                f.write(b",")
+            encoded = safe_json_bytes(export_item, indent=2 if pretty_print else None)
+            f.write(indent + encoded.replace(b"\n", indent) if pretty_print else encoded)
+            
+        if pretty_print and items:
+            f.write(b"\n  ")
+        f.write(document[split_at + 1:])
+        
     def _generate_statistics(self, items: List[Dict]) -> Dict:
         """生成导出数据的统计信息
         
@@ -166,13 +250,7 @@ class JsonExporter:
             "by_type": {},
             "by_status": {},
             "by_year": {},
-            "by_rating": {
-                "未评分": 0,
-                "1-2星": 0,
-                "3-5星": 0,
-                "6-7星": 0,
-                "8-10星": 0
-            },
+            "by_rating": {},
             "by_score": {
                 "douban": {
                     "总计": 0,
@@ -185,76 +263,37 @@ class JsonExporter:
             }
         }
         
-        # 收集唯一类型
-        types = set()
-        status_values = set()
+        # 先一次性取出评分列，再对整列做分段计数和求和，避免在循环中逐条分支判断
+        ratings = [item.get("my_rating") or 0 for item in items]
+        # 先按评分值计数（相当于 bincount），再把 0-10 的 11 个计数归并到各分段
+        rating_counts = Counter(ratings)
+        rating_hist = [0] * len(_RATING_LABELS)
+        for rating, bucket in enumerate(_RATING_BUCKET):
+            rating_hist[bucket] += rating_counts[rating]
+        stats["by_rating"] = dict(zip(_RATING_LABELS, rating_hist))
         
-        # 评分累计
-        douban_score_sum = 0.0
-        douban_score_count = 0
-        my_rating_sum = 0
-        my_rating_count = 0
+        my_ratings = [rating for rating in ratings if rating > 0]
+        douban_scores = [score for score in (item.get("douban_score") or 0 for item in items) if score > 0]
         
-        # 生成统计信息
-        for item in items:
-            # 按类型统计
-            item_type = item.get("type", "unknown")
-            types.add(item_type)
-            if item_type not in stats["by_type"]:
-                stats["by_type"][item_type] = 0
-            stats["by_type"][item_type] += 1
-            
-            # 按状态统计
-            item_status = item.get("status", "unknown")
-            status_values.add(item_status)
-            if item_status not in stats["by_status"]:
-                stats["by_status"][item_status] = 0
-            stats["by_status"][item_status] += 1
-            
-            # 按年份统计
-            item_year = item.get("year")
-            if item_year and item_year > 0:
-                year_str = str(item_year)
-                if year_str not in stats["by_year"]:
-                    stats["by_year"][year_str] = 0
-                stats["by_year"][year_str] += 1
-            
-            # 按个人评分统计
-            rating = item.get("my_rating", 0)
-            if rating == 0:
-                stats["by_rating"]["未评分"] += 1
-            elif 1 <= rating <= 2:
-                stats["by_rating"]["1-2星"] += 1
-            elif 3 <= rating <= 5:
-                stats["by_rating"]["3-5星"] += 1
-            elif 6 <= rating <= 7:
-                stats["by_rating"]["6-7星"] += 1
-            elif 8 <= rating <= 10:
-                stats["by_rating"]["8-10星"] += 1
-                
-            # 累计评分
-            if rating > 0:
-                my_rating_sum += rating
-                my_rating_count += 1
-                
-            douban_score = item.get("douban_score", 0)
-            if douban_score > 0:
-                douban_score_sum += douban_score
-                douban_score_count += 1
+        # 按类型、状态和年份统计，计数在 Counter 的C实现中完成
+        stats["by_type"] = dict(Counter(item.get("type", "unknown") for item in items))
+        stats["by_status"] = dict(Counter(item.get("status", "unknown") for item in items))
+        years = Counter(item.get("year") for item in items)
+        stats["by_year"] = {str(year): count for year, count in years.items() if year and year > 0}
         
-        # 计算平均分
-        if douban_score_count > 0:
-            stats["by_score"]["douban"]["总计"] = douban_score_count
-            stats["by_score"]["douban"]["平均分"] = round(douban_score_sum / douban_score_count, 1)
+        # 计算平均分，fmean 内部使用精确求和，大量浮点评分累加时不会产生误差
+        if douban_scores:
+            stats["by_score"]["douban"]["总计"] = len(douban_scores)
+            stats["by_score"]["douban"]["平均分"] = round(fmean(douban_scores), 1)
             
-        if my_rating_count > 0:
-            stats["by_score"]["personal"]["总计"] = my_rating_count
-            stats["by_score"]["personal"]["平均分"] = round(my_rating_sum / my_rating_count, 1)
+        if my_ratings:
+            stats["by_score"]["personal"]["总计"] = len(my_ratings)
+            stats["by_score"]["personal"]["平均分"] = round(fmean(my_ratings), 1)
             
         # 添加总计
         stats["total_count"] = len(items)
-        stats["unique_types"] = list(types)
-        stats["unique_statuses"] = list(status_values)
+        stats["unique_types"] = list(stats["by_type"])
+        stats["unique_statuses"] = list(stats["by_status"])
         
         # 年份统计排序
         stats["by_year"] = dict(sorted(stats["by_year"].items()))
@@ -278,47 +317,49 @@ class JsonExporter:
         os.makedirs(output_dir, exist_ok=True)
         logger.info(f"开始导出所有类型数据到目录: {output_dir}")
         
-        export_tasks = []
-        for type_ in self.supported_types:
-            for status in ["wish", "doing", "done"]:  # 标准化状态值
-                task = threading.Thread(
-                    target=self._export_single_type_status,
-                    args=(type_, status, output_dir, include_raw)
-                )
-                export_tasks.append(task)
-                task.start()
-                
-        # 等待所有导出任务完成
-        for task in export_tasks:
-            task.join()
+        # 一次查询所有记录，再在内存中按类型和状态分组（LIMIT -1 表示不限制数量）
+        groups = defaultdict(list)
+        for item in self.db.get_interests(limit=-1):
+            groups[(item.get("type"), item.get("status"))].append(item)
+        
+        # 使用有界线程池并发导出，工作线程只负责序列化和写文件
+        exported_files = []
+        with ThreadPoolExecutor(max_workers=min(self.MAX_EXPORT_WORKERS, os.cpu_count() or 4)) as pool:
+            futures = [
+                pool.submit(self._export_single_type_status, type_, status, output_dir, include_raw,
+                            groups[(type_, status)])
+                for type_ in self.supported_types
+                for status in ["wish", "doing", "done"]  # 标准化状态值
+                if groups.get((type_, status))
+            ]
+            for future in as_completed(futures):
+                output_path = future.result()
+                if output_path:
+                    exported_files.append(os.path.basename(output_path))
             
-        logger.info(f"所有数据导出完成，共 {len(export_tasks)} 个文件")
+        logger.info(f"所有数据导出完成，共 {len(exported_files)} 个文件")
         
         # 创建索引文件
         index_path = os.path.join(output_dir, "index.json")
-        with open(index_path, 'w', encoding='utf-8') as f:
+        with open(index_path, 'wb') as f:
             index_data = {
                 "exported_at": datetime.now().isoformat(),
-                "files": [os.path.basename(f) for f in os.listdir(output_dir) if f.endswith('.json') and f != 'index.json'],
+                "files": sorted(exported_files),
                 "types": self.supported_types,
                 "statuses": ["wish", "doing", "done"]  # 标准化状态值
             }
-            json_str = safe_json_dumps(index_data, indent=2)
-            f.write(json_str)
+            f.write(safe_json_bytes(index_data, indent=2))
             
         return output_dir
         
-    def _export_single_type_status(self, type_: str, status: str, output_dir: str, include_raw: bool):
-        """导出单个类型和状态的数据（用于多线程导出）"""
+    def _export_single_type_status(self, type_: str, status: str, output_dir: str, include_raw: bool,
+                                   items: List[Dict]) -> Optional[str]:
+        """导出单个类型和状态的预先查询出的数据（用于多线程导出），返回输出文件路径，失败时返回None"""
         filename = f"{type_}_{status}.json"
         output_path = os.path.join(output_dir, filename)
         
         try:
-            self.export_data(
-                type_=type_,
-                status=status,
-                output_path=output_path,
-                include_raw=include_raw
-            )
+            return self._export_items(items, type_, status, None, output_path, include_raw, True)
         except Exception as e:
-            logger.error(f"导出 {type_} {status} 失败: {e}")
\ No newline at end of file
+            logger.error(f"导出 {type_} {status} 失败: {e}")
+            return None
\ No newline at end of file
@@ -2,18 +2,36 @@ import os
 import requests
 import time
 import random
-import mimetypes
 import hashlib
+import shutil
 import threading
+from functools import lru_cache
 from flask import url_for
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Tuple, List, Any
 from urllib.parse import urlparse
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.logger import get_logger
 
 # 配置日志
 logger = get_logger("image_service")
 
+# 已知的图片扩展名
+_VALID_IMAGE_EXTS = frozenset(('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'))
+
+# 图片内容类型对应的扩展名
+_CONTENT_TYPE_EXTS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/bmp': '.bmp',
+    'image/avif': '.avif',
+}
+
 class ImageService:
     """封面图片下载和管理服务
     
@@ -22,8 +40,17 @@ class ImageService:
     
     # 缓存超时时间（秒）
     MEMORY_CACHE_TTL = 3600  # 1小时
+    MEMORY_CACHE_SIZE = 1000  # 最多缓存1000项
     REQUEST_TIMEOUT = 15  # 请求超时时间
     RETRY_ATTEMPTS = 3  # 重试次数
+    POOL_CONNECTIONS = 16  # 连接池缓存的主机数
+    POOL_MAXSIZE = 32  # 每个主机保持的最大连接数
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 流式下载的分块大小，一张封面通常一两次读写即可完成
+    LOCAL_PATH_FLUSH_SIZE = 100  # 本地路径批量写入数据库的条数
+    HEADER_ROTATE_MASK = 15  # 下载计数低4位为0时轮换请求头，即每16次一次
+    URL_CACHE_TTL = 300  # 图片URL解析结果缓存5分钟
+    URL_CACHE_SIZE = 4096  # 最多缓存4096个条目的URL解析结果
+    NO_COVER_URL = "/static/images/no-cover.png"  # 没有可用封面时的占位图
     
     def __init__(self):
         """初始化图片服务"""
@@ -34,6 +61,10 @@ class ImageService:
         # 域名设置
         self.server_domain = os.getenv("SERVER_DOMAIN", "").rstrip("/")
         self.display_strategy = os.getenv("COVER_DISPLAY_STRATEGY", "mixed").lower()
+        # 是否通过代理加载原始封面
+        self.proxy_enabled = os.getenv("COVER_PROXY", "false").lower() == "true"
+        # 并发下载线程数
+        self.download_workers = max(1, int(os.getenv("COVER_DOWNLOAD_WORKERS", "8")))
         # 存储类型设置
         self.storage_type = "local"
         logger.info(f"图片服务配置: 下载={self.download_covers}, 策略={self.display_strategy}, 路径={self.local_path}")
@@ -59,17 +90,36 @@ class ImageService:
         # 更新请求头
         self._update_headers()
         
-        # 创建会话对象复用连接
+        # 创建会话对象复用连接，连接错误和服务端错误由适配器自动重试
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=max(self.POOL_MAXSIZE, self.download_workers),
+            max_retries=Retry(
+                total=self.RETRY_ATTEMPTS,
+                backoff_factor=1,
+                status_forcelist=[500, 502, 503, 504]
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
-        # 初始化内存缓存
-        self._cache = {}
+        # 初始化内存缓存（按最近使用顺序排列的LRU缓存）
+        self._cache = OrderedDict()
         self._cache_lock = threading.Lock()
         
-        # 初始化计数器
+        # 图片URL解析缓存：条目ID -> 本地相对路径（只缓存路径，URL 由 url_for 在请求上下文中生成）
+        self._url_cache = OrderedDict()
+        
+        # 初始化计数器（并发下载时由锁保护）
         self.download_count = 0
         self.error_count = 0
+        self._counter_lock = threading.Lock()
+        
+        # 本地存储统计（首次查询状态时扫描一次目录，之后随下载增量更新）
+        self._stored_files = None
+        self._stored_bytes = None
         
         # 初始化存储目录
         if self.download_covers and self.storage_type == "local":
@@ -133,50 +183,32 @@ class ImageService:
         返回:
             文件扩展名（包括点，例如 '.jpg'）
         """
-        # 尝试从URL路径中获取扩展名
-        path = urlparse(url).path
-        ext = os.path.splitext(path)[1].lower()
-        
-        # 检查扩展名是否是已知的图片扩展名
-        valid_image_exts = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']
-        if ext in valid_image_exts:
+        # 优先使用URL路径中的已知图片扩展名
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        if ext in _VALID_IMAGE_EXTS:
             return ext
             
-        # 如果URL中没有有效扩展名，使用内容类型判断
-        if content_type:
-            if content_type == 'image/jpeg':
-                return '.jpg'
-            elif content_type == 'image/png':
-                return '.png'
-            elif content_type == 'image/gif':
-                return '.gif'
-            elif content_type == 'image/webp':
-                return '.webp'
-            elif content_type == 'image/bmp':
-                return '.bmp'
-            # 尝试通过mimetypes库猜测
-            ext = mimetypes.guess_extension(content_type)
-            if ext:
-                return ext
-            
-        # 如果仍无法确定，使用默认扩展名
-        return '.jpg'
+        # 否则按内容类型判断（忽略 charset 等参数），仍无法确定时使用默认扩展名
+        return _CONTENT_TYPE_EXTS.get((content_type or '').split(';')[0].strip().lower(), '.jpg')
     
-    def _get_cache_key(self, url: str, item_id: str, item_type: str) -> str:
-        """生成缓存键"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_cache_key(url: str, item_id: str, item_type: str) -> str:
+        """生成缓存键，相同参数的结果会被缓存"""
         # 使用URL、ID和类型生成唯一键
         combined = f"{url}|{item_id}|{item_type}"
-        return hashlib.md5(combined.encode()).hexdigest()
+        return hashlib.blake2b(combined.encode(), digest_size=16).hexdigest()
         
     def _get_from_cache(self, url: str, item_id: str, item_type: str) -> Optional[Dict[str, Any]]:
         """从缓存获取结果"""
         cache_key = self._get_cache_key(url, item_id, item_type)
         
         with self._cache_lock:
-            if cache_key in self._cache:
-                cache_entry = self._cache[cache_key]
+            cache_entry = self._cache.get(cache_key)
+            if cache_entry is not None:
                 # 检查缓存是否过期
-                if datetime.now() < cache_entry['expires']:
+                if time.monotonic() < cache_entry['expires']:
+                    self._cache.move_to_end(cache_key)
                     return cache_entry['data']
                 else:
                     # 删除过期缓存
@@ -187,16 +219,13 @@ class ImageService:
     def _save_to_cache(self, url: str, item_id: str, item_type: str, data: Dict[str, Any]) -> None:
         """保存结果到缓存"""
         cache_key = self._get_cache_key(url, item_id, item_type)
-        expires = datetime.now() + timedelta(seconds=self.MEMORY_CACHE_TTL)
+        expires = time.monotonic() + self.MEMORY_CACHE_TTL
         
         with self._cache_lock:
-            # 删除旧缓存，保证内存不爆炸
-            if len(self._cache) > 1000:  # 最多缓存1000项
-                # 找出并删除最老的10%缓存
-                items = list(self._cache.items())
-                items.sort(key=lambda x: x[1]['expires'])
-                for k, _ in items[:len(items)//10]:
-                    del self._cache[k]
+            # 淘汰最久未使用的缓存，保证内存不爆炸
+            self._cache.pop(cache_key, None)
+            while len(self._cache) >= self.MEMORY_CACHE_SIZE:
+                self._cache.popitem(last=False)
             
             # 保存新结果
             self._cache[cache_key] = {
@@ -230,97 +259,112 @@ class ImageService:
         if cached_result and cached_result.get('local_path'):
             return cached_result['local_path']
         
-        # 每10次下载更新一次请求头，避免被反爬
-        if self.download_count % 10 == 0:
-            self._update_headers()
-            self.session.headers.update(self.headers)
-            
-        self.download_count += 1
+        # 每16次下载轮换一次请求头，避免被反爬，只替换会变化的两个字段
+        with self._counter_lock:
+            if (self.download_count & self.HEADER_ROTATE_MASK) == 0:
+                self.session.headers['User-Agent'] = random.choice(self.user_agents)
+                self.session.headers['Referer'] = random.choice(self.referers)
+                
+            self.download_count += 1
         
         # 添加随机延迟
         self._add_random_delay(self.error_count)
         
-        # 执行下载请求，支持重试
-        for attempt in range(self.RETRY_ATTEMPTS):
-            try:
-                # 防止URL没有协议前缀
-                if not image_url.startswith(('http://', 'https://')):
-                    image_url = f"https:{image_url}" if image_url.startswith('//') else f"https://{image_url}"
-                    
-                # 发送HTTP请求获取图片
-                response = self.session.get(
-                    image_url, 
-                    timeout=self.REQUEST_TIMEOUT,
-                    stream=True  # 使用流式请求，避免大图片占用太多内存
-                )
-                response.raise_for_status()
-                
-                # 获取文件扩展名
-                ext = self._get_file_extension(image_url, response.headers.get('Content-Type'))
-                
-                # 构建文件名和路径
-                filename = f"{item_id}{ext}"
-                type_dir = item_type.lower()
-                
-                # 确保类型目录存在
-                type_path = os.path.join(self.local_path, type_dir)
-                if not os.path.exists(type_path):
-                    os.makedirs(type_path, exist_ok=True)
-                
-                # 构建存储路径
-                rel_path = os.path.join(type_dir, filename)
-                abs_path = os.path.join(self.local_path, rel_path)
-                
-                # 写入文件 - 使用流式写入处理大文件
-                with open(abs_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+        # 执行下载请求，连接失败和5xx响应的重试由会话适配器处理
+        part_path = None
+        try:
+            # 防止URL没有协议前缀
+            if not image_url.startswith(('http://', 'https://')):
+                image_url = f"https:{image_url}" if image_url.startswith('//') else f"https://{image_url}"
                 
-                # 检查文件是否写入成功
-                if os.path.exists(abs_path) and os.path.getsize(abs_path) > 0:
-                    # 计算文件大小
-                    file_size = os.path.getsize(abs_path)
-                    
-                    # 记录成功
-                    logger.debug(f"图片保存成功: {type_dir}/{item_id}, 大小: {file_size/1024:.1f}KB")
-                    
-                    # 缓存结果
-                    result = {
-                        "original_url": image_url,
-                        "local_path": rel_path,
-                        "file_size": file_size
-                    }
-                    self._save_to_cache(image_url, item_id, item_type, result)
-                    
-                    # 重置错误计数
-                    self.error_count = max(0, self.error_count - 1)
-                    return rel_path
-                else:
-                    # 文件写入失败
-                    logger.warning(f"图片保存失败，文件为空: {type_dir}/{item_id}")
-                    # 删除空文件
-                    try:
-                        if os.path.exists(abs_path):
-                            os.remove(abs_path)
-                    except:
-                        pass
-                    continue
+            # 发送HTTP请求获取图片
+            response = self.session.get(
+                image_url, 
+                timeout=self.REQUEST_TIMEOUT,
+                stream=True  # 使用流式请求，避免大图片占用太多内存
+            )
+            response.raise_for_status()
+            
+            # 获取文件扩展名
+            ext = self._get_file_extension(image_url, response.headers.get('Content-Type'))
+            
+            # 构建文件名和路径
+            filename = f"{item_id}{ext}"
+            type_dir = item_type.lower()
+            
+            # 确保类型目录存在
+            type_path = os.path.join(self.local_path, type_dir)
+            if not os.path.exists(type_path):
+                os.makedirs(type_path, exist_ok=True)
+            
+            # 构建存储路径
+            rel_path = os.path.join(type_dir, filename)
+            abs_path = os.path.join(self.local_path, rel_path)
+            
+            # 先写入临时文件，下载完整后再替换正式文件，避免中断时留下不完整的封面
+            part_path = abs_path + '.part'
+            
+            # 写入文件 - 直接从底层响应流按块复制到磁盘，写完后由文件位置得到大小
+            response.raw.decode_content = True
+            with open(part_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=self.DOWNLOAD_CHUNK_SIZE)
+                file_size = f.tell()
+            
+            # 检查文件是否写入成功
+            if file_size == 0:
+                logger.warning(f"图片保存失败，文件为空: {type_dir}/{item_id}")
+                return None
                 
-            except requests.RequestException as e:
+            # 记录被覆盖文件的大小，用于修正存储统计
+            try:
+                previous_size = os.path.getsize(abs_path)
+            except OSError:
+                previous_size = None
+            os.replace(part_path, abs_path)
+            
+            # 记录成功
+            logger.debug(f"图片保存成功: {type_dir}/{item_id}, 大小: {file_size/1024:.1f}KB")
+            
+            # 缓存结果
+            result = {
+                "original_url": image_url,
+                "local_path": rel_path,
+                "file_size": file_size
+            }
+            self._save_to_cache(image_url, item_id, item_type, result)
+            
+            # 重置错误计数并更新存储统计
+            with self._counter_lock:
+                self.error_count = max(0, self.error_count - 1)
+                self._update_storage_stats(file_size, previous_size)
+            self._invalidate_image_urls([item_id])
+            return rel_path
+            
+        except requests.HTTPError as e:
+            # 4xx 等不在重试列表中的状态码不会重试
+            with self._counter_lock:
                 self.error_count += 1
-                retry_wait = min(2 ** attempt, 10)  # 指数退避策略
-                logger.warning(f"下载图片失败({attempt+1}/{self.RETRY_ATTEMPTS}): {type(e).__name__}, 等待{retry_wait}秒后重试")
-                time.sleep(retry_wait)
-                continue
-            except Exception as e:
+            status_code = e.response.status_code if e.response is not None else None
+            logger.error(f"下载图片失败，HTTP {status_code}: {item_type}/{item_id}")
+            return None
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            # 读取响应体时的 urllib3 异常（连接中断、读取超时）不会被 requests 包装
+            with self._counter_lock:
                 self.error_count += 1
-                logger.error(f"处理图片失败: {type(e).__name__}: {str(e)}")
-                return None
-                
-        # 所有重试都失败
-        logger.error(f"下载图片失败，已尝试{self.RETRY_ATTEMPTS}次: {item_type}/{item_id}")
-        return None
+            logger.error(f"下载图片失败: {item_type}/{item_id}, {type(e).__name__}")
+            return None
+        except Exception as e:
+            with self._counter_lock:
+                self.error_count += 1
+            logger.error(f"处理图片失败: {type(e).__name__}: {str(e)}")
+            return None
+        finally:
+            # 下载失败时删除残留的临时文件（成功时已被替换为正式文件）
+            if part_path is not None:
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
 
     def sync_all_images(self, db_instance, max_items: int = None, force_download: bool = False) -> Tuple[int, int]:
         """同步所有需要下载的图片
@@ -359,41 +403,81 @@ class ImageService:
 
 
 
+    def _resolve_local_path(self, db_instance, item_id: str, cover_url: str) -> Optional[str]:
+        """查找条目可用的本地图片路径，结果带过期时间缓存在内存中
+        
+        参数:
+            db_instance: 数据库实例
+            item_id: 条目ID
+            cover_url: 原始封面URL，变化时缓存失效
+            
+        返回:
+            以正斜杠分隔的相对路径，没有可用的本地图片时返回 None
+        """
+        with self._cache_lock:
+            cache_entry = self._url_cache.get(item_id)
+            if cache_entry is not None:
+                if time.monotonic() < cache_entry['expires'] and cache_entry['cover_url'] == cover_url:
+                    self._url_cache.move_to_end(item_id)
+                    return cache_entry['path']
+                del self._url_cache[item_id]
+        
+        normalized_path = None
+        try:
+            # 检查数据库中是否有本地路径记录
+            item = db_instance.get_interest_by_id(item_id)
+            if item and item.get('local_path'):
+                rel_path = item['local_path']
+                abs_path = os.path.join(self.local_path, rel_path)
+
+                # 确认本地文件存在
+                if os.path.exists(abs_path) and os.path.getsize(abs_path) > 0:
+                    # 使用正斜杠统一路径格式，确保URL正确生成
+                    normalized_path = rel_path.replace("\\", "/")
+                    # 移除可能存在的前导斜杠，避免路径重复
+                    if normalized_path.startswith('/'):
+                        normalized_path = normalized_path[1:]
+                else:
+                    logger.warning(f"本地图片文件丢失: {rel_path}")
+        except Exception as e:
+            # 查询出错时不缓存，下次重新尝试
+            logger.error(f"获取本地图片路径时出错: {e}")
+            return None
+        
+        with self._cache_lock:
+            self._url_cache.pop(item_id, None)
+            while len(self._url_cache) >= self.URL_CACHE_SIZE:
+                self._url_cache.popitem(last=False)
+            self._url_cache[item_id] = {
+                'cover_url': cover_url,
+                'path': normalized_path,
+                'expires': time.monotonic() + self.URL_CACHE_TTL
+            }
+        return normalized_path
+    
+    def _invalidate_image_urls(self, item_ids: List[str]) -> None:
+        """移除指定条目的图片URL缓存，本地图片变化后调用"""
+        with self._cache_lock:
+            for item_id in item_ids:
+                self._url_cache.pop(item_id, None)
+    
     def get_image_url(self, db_instance, item_id: str, cover_url: str) -> str:
         """获取图片URL，根据display_strategy决定返回策略"""
         if not item_id and not cover_url:
             logger.warning(f"获取图片URL参数不完整: ID={item_id}, URL={cover_url}")
-            return "/static/images/no-cover.png"
+            return self.NO_COVER_URL
 
-        # 获取环境变量配置
-        proxy_enabled = os.getenv("COVER_PROXY", "false").lower() == "true"
         # 优先处理 local 策略
         if self.display_strategy in ["local", "mixed"]:
-            try:
-                # 检查数据库中是否有本地路径记录
-                item = db_instance.get_interest_by_id(item_id)
-                if item and item.get('local_path'):
-                    rel_path = item['local_path']
-                    abs_path = os.path.join(self.local_path, rel_path)
-
-                    # 确认本地文件存在
-                    if os.path.exists(abs_path) and os.path.getsize(abs_path) > 0:
-                        # 使用正斜杠统一路径格式，确保URL正确生成
-                        normalized_path = rel_path.replace("\\", "/")
-                        # 移除可能存在的前导斜杠，避免路径重复
-                        if normalized_path.startswith('/'):
-                            normalized_path = normalized_path[1:]
-                        # 使用 url_for 动态生成 URL
-                        return url_for('frontend.serve_cover', filename=normalized_path)
-                    else:
-                        logger.warning(f"本地图片文件丢失: {rel_path}")
-            except Exception as e:
-                logger.error(f"获取本地图片路径时出错: {e}")
+            normalized_path = self._resolve_local_path(db_instance, item_id, cover_url)
+            if normalized_path:
+                # 使用 url_for 动态生成 URL
+                return url_for('frontend.serve_cover', filename=normalized_path)
 
         # original 策略或 mixed 策略的回退
         if self.display_strategy in ["original", "mixed"]:
             if cover_url:
-                if proxy_enabled:
+                if self.proxy_enabled:
                     # 使用代理解决防盗链问题
                     return f"/proxy/image?url={cover_url}"
                 else:
@@ -401,7 +485,7 @@ class ImageService:
                     return cover_url
 
         # 如果没有找到图片，返回占位图
-        return "/static/images/no-cover.png"
+        return self.NO_COVER_URL
            
     def _batch_process_items(self, db_instance, items: List[Dict[str, Any]], max_items: int = None, force_download: bool = False) -> Tuple[int, int]:
         """批量处理图片下载
@@ -425,47 +509,56 @@ class ImageService:
             
         success = 0
         failed = 0
+        pending = []  # 待写入数据库的 (local_path, item_id)
         start_time = time.time()
         
-        # 进度显示间隔
-        progress_interval = max(1, min(len(items) // 10, 50))
-        
-        for i, item in enumerate(items):
-            # 定期显示进度
-            if i > 0 and i % progress_interval == 0:
-                elapsed = time.time() - start_time
-                items_per_second = i / elapsed if elapsed > 0 else 0
-                estimated_remaining = (len(items) - i) / items_per_second if items_per_second > 0 else 0
-                logger.info(f"进度: {i}/{len(items)} ({i/len(items)*100:.1f}%), "
-                        f"速度: {items_per_second:.2f}项/秒, "
-                        f"预计剩余时间: {int(estimated_remaining/60)}分{int(estimated_remaining%60)}秒")
-            
-            item_id = item.get("id")
-            item_type = item.get("type")
-            cover_url = item.get("cover_url")
-            
-            # 验证必要字段
-            if not all([item_id, item_type, cover_url]):
+        # 验证必要字段
+        valid_items = []
+        for item in items:
+            if not all([item.get("id"), item.get("type"), item.get("cover_url")]):
                 logger.warning(f"跳过不完整的条目: {item}")
                 failed += 1
-                continue
-                
+            else:
+                valid_items.append(item)
+        
+        def download(item):
             try:
                 # 下载封面，传递force_download参数
-                local_path = self.download_cover(cover_url, item_type, item_id, force_download)
+                return self.download_cover(item["cover_url"], item["type"], item["id"], force_download)
+            except Exception as e:
+                logger.error(f"处理条目 {item['id']} ({item['type']}) 图片时出错: {e}")
+                return None
+        
+        # 进度显示间隔
+        progress_interval = max(1, min(len(valid_items) // 10, 50))
+        
+        # 多线程并发下载，数据库更新仍在当前线程中按顺序批量写入
+        with ThreadPoolExecutor(max_workers=self.download_workers) as pool:
+            for i, (item, local_path) in enumerate(zip(valid_items, pool.map(download, valid_items))):
+                # 定期显示进度
+                if i > 0 and i % progress_interval == 0:
+                    elapsed = time.time() - start_time
+                    items_per_second = i / elapsed if elapsed > 0 else 0
+                    estimated_remaining = (len(valid_items) - i) / items_per_second if items_per_second > 0 else 0
+                    logger.info(f"进度: {i}/{len(valid_items)} ({i/len(valid_items)*100:.1f}%), "
+                            f"速度: {items_per_second:.2f}项/秒, "
+                            f"预计剩余时间: {int(estimated_remaining/60)}分{int(estimated_remaining%60)}秒")
                 
                 if local_path:
-                    # 更新数据库中的本地路径
-                    if db_instance.update_interest_local_path(item_id, local_path):
-                        success += 1
-                    else:
-                        logger.warning(f"更新数据库路径失败: {item_id}")
-                        failed += 1
+                    # 累积后批量更新数据库中的本地路径
+                    pending.append((local_path, item["id"]))
+                    if len(pending) >= self.LOCAL_PATH_FLUSH_SIZE:
+                        updated = self._flush_local_paths(db_instance, pending)
+                        success += updated
+                        failed += len(pending) - updated
+                        pending = []
                 else:
                     failed += 1
-            except Exception as e:
-                logger.error(f"处理条目 {item_id} ({item_type}) 图片时出错: {e}")
-                failed += 1
+        
+        if pending:
+            updated = self._flush_local_paths(db_instance, pending)
+            success += updated
+            failed += len(pending) - updated
         
         # 显示最终结果
         elapsed = time.time() - start_time
@@ -473,14 +566,65 @@ class ImageService:
         
         return (success, failed)
         
+    def _flush_local_paths(self, db_instance, pending: List[Tuple[str, str]]) -> int:
+        """将累积的本地路径在一个事务中写入数据库，返回更新成功的条数"""
+        try:
+            updated = db_instance.update_local_paths_bulk(pending)
+        except Exception as e:
+            logger.error(f"批量更新数据库路径失败: {e}")
+            updated = 0
+        # 数据库中的路径已变化，丢弃之前的解析结果
+        self._invalidate_image_urls([item_id for _, item_id in pending])
+        if updated < len(pending):
+            logger.warning(f"更新数据库路径失败: {len(pending) - updated} 条")
+        return updated
+        
     def clear_cache(self):
         """清空内存缓存"""
         with self._cache_lock:
-            self._cache = {}
+            self._cache = OrderedDict()
+            self._url_cache = OrderedDict()
         logger.info("内存缓存已清空")
         
-    def get_service_status(self) -> Dict[str, Any]:
-        """获取服务状态信息"""
+    def _update_storage_stats(self, new_size: Optional[int], previous_size: Optional[int]) -> None:
+        """根据一次文件写入增量更新存储统计，调用方需持有 _counter_lock
+        
+        参数:
+            new_size: 写入后的文件大小，文件已删除时为 None
+            previous_size: 写入前的文件大小，文件原先不存在时为 None
+        """
+        # 尚未扫描过目录时无需维护，首次查询状态时会完整统计
+        if self._stored_files is None:
+            return
+        self._stored_files += (new_size is not None) - (previous_size is not None)
+        self._stored_bytes += (new_size or 0) - (previous_size or 0)
+    
+    def _scan_storage(self) -> Tuple[int, int]:
+        """遍历本地存储目录，统计文件数量和总大小
+        
+        返回:
+            (文件数量, 总字节数)
+        """
+        total_size = 0
+        file_count = 0
+        
+        for root, dirs, files in os.walk(self.local_path):
+            for file in files:
+                try:
+                    file_path = os.path.join(root, file)
+                    total_size += os.path.getsize(file_path)
+                    file_count += 1
+                except:
+                    pass
+        
+        return file_count, total_size
+    
+    def get_service_status(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """获取服务状态信息
+        
+        参数:
+            force_refresh: 是否重新扫描存储目录，而不是使用增量维护的统计
+        """
         status = {
             "enabled": self.download_covers,
             "storage_type": self.storage_type,
@@ -494,18 +638,15 @@ class ImageService:
         if self.storage_type == "local":
             # 尝试获取存储统计信息
             try:
-                total_size = 0
-                file_count = 0
+                with self._counter_lock:
+                    file_count, total_size = self._stored_files, self._stored_bytes
                 
-                for root, dirs, files in os.walk(self.local_path):
-                    for file in files:
-                        try:
-                            file_path = os.path.join(root, file)
-                            total_size += os.path.getsize(file_path)
-                            file_count += 1
-                        except:
-                            pass
-                            
+                if file_count is None or force_refresh:
+                    # 扫描期间仍有下载时，统计可能与磁盘略有偏差，可通过 force_refresh 校正
+                    file_count, total_size = self._scan_storage()
+                    with self._counter_lock:
+                        self._stored_files, self._stored_bytes = file_count, total_size
+                        
                 status["storage_stats"] = {
                     "file_count": file_count,
                     "total_size_mb": round(total_size / (1024 * 1024), 2),
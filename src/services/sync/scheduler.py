@@ -1,18 +1,77 @@
 import os
 import time
 import threading
-from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from datetime import datetime, timedelta
 
 # 更新导入路径
 from services.api.douban_api import DoubanAPI
 from services.data.database import Database
 from services.media.image_service import ImageService
+from services.sync.sync_manager import sync_images
 from utils.logger import get_logger
 
 # 配置日志
 logger = get_logger("scheduler")
 
+# 所有类型都使用这三种状态
+_STATUSES = ("mark", "doing", "done")
+
+# 同步时一并写入的本地类型，豆瓣movie接口同时返回电影和剧集
+_LOCAL_TYPES = {"movie": ("movie", "tv")}
+
+# 整页提取时间戳时在C层完成字典查找
+_get_create_time = itemgetter("create_time")
+
+
+@lru_cache(maxsize=8)
+def _parse_sync_types(value: str) -> tuple:
+    """解析逗号分隔的同步类型配置
+    
+    参数:
+        value: DOUBAN_SYNC_TYPES 环境变量的值
+        
+    返回:
+        去除空白后的类型元组
+    """
+    return tuple(t.strip() for t in value.split(",") if t.strip())
+
+
+def _combined_stats(sync_stats: Dict[Tuple[str, str], Tuple[int, str]],
+                    types: Tuple[str, ...], status: str) -> Tuple[int, str]:
+    """合并多个类型在同一状态下的本地统计
+    
+    参数:
+        sync_stats: Database.get_sync_stats 返回的本地条目数和最新时间戳
+        types: 需要合并的类型
+        status: 状态 ('mark', 'doing', 或 'done')
+        
+    返回:
+        (合计条目数, 其中最新的时间戳)
+    """
+    stats = [sync_stats.get((t, status), (0, "")) for t in types]
+    return sum(count for count, _ in stats), max((latest for _, latest in stats), default="")
+
+
+def _page_create_times(items: List[Dict[str, Any]]) -> List[str]:
+    """一次取出整页记录的 create_time
+    
+    参数:
+        items: 同一页中有效的兴趣数据
+        
+    返回:
+        与 items 一一对应的时间戳列表，缺失或为空时为空字符串
+    """
+    try:
+        return [ts or "" for ts in map(_get_create_time, items)]
+    except KeyError:
+        # 个别记录缺少 create_time 时逐条读取
+        return [item.get("create_time") or "" for item in items]
+
+
 class Scheduler:
     """豆瓣数据增量更新调度器
     
@@ -20,10 +79,11 @@ class Scheduler:
     """
     
     # 预检机制配置
-    PRE_CHECK_SAMPLE_SIZE = 5  # 用于预检的样本大小
     CONSECUTIVE_OLD_PAGES_THRESHOLD = 3  # 连续遇到旧页面的阈值，用于提前终止
     MIN_PAGES_TO_CHECK = 2  # 至少要检查的页面数，即使第一页就全是旧数据
     FULL_SYNC_DAYS = 30  # 每隔多少天执行一次全量同步
+    SYNC_BATCH_SIZE = 500  # 同步时批量写入数据库的条数
+    SYNC_WORKERS = 6  # 并发同步的内容类型数
     
     def __init__(self, user_id: str = None, db_instance: Database = None, 
                 api_instance: DoubanAPI = None, image_service: ImageService = None):
@@ -45,27 +105,39 @@ class Scheduler:
         self.image_service = image_service
         
         # 获取需要同步的数据类型 (默认为 movie 和 book)
-        sync_types_str = os.getenv("DOUBAN_SYNC_TYPES", "movie,book")
-        self.sync_types = [t.strip() for t in sync_types_str.split(",") if t.strip()]
+        self.sync_types = list(_parse_sync_types(os.getenv("DOUBAN_SYNC_TYPES", "movie,book")))
         logger.info(f"配置的同步类型: {', '.join(self.sync_types)}")
+        # 实际需要同步的类型，跳过tv类型的同步，因为它会在movie同步时被处理
+        self._sync_types_frozen = tuple(t for t in self.sync_types if t != "tv" or "movie" not in self.sync_types)
         
-        # 下载图片设置
-        self.download_covers = os.getenv("DOWNLOAD_COVERS", "false").lower() == "true"
+        # 下载图片设置，优先使用图片服务已读取的配置
+        if image_service:
+            self.download_covers = image_service.download_covers
+        else:
+            self.download_covers = os.getenv("DOWNLOAD_COVERS", "false").lower() == "true"
         logger.info(f"图片下载设置: {'启用' if self.download_covers else '禁用'}")
         
+        # 限制同时进行的豆瓣API请求数，避免并发同步触发限流
+        self._api_semaphore = threading.Semaphore(max(1, int(os.getenv("DOUBAN_MAX_CONCURRENCY", "4"))))
+        
         # 同步状态记录
         self._sync_lock = threading.Lock()
         self._is_syncing = False
-        self._last_sync = None
-        self._last_full_sync = None
+        # 上次同步时间保存在数据库中，进程重启后继续按原计划执行全量同步
+        self._last_sync = self._load_watermark("last_sync")
+        self._last_full_sync = self._load_watermark("last_full_sync")
+        self._full_sync_delta = timedelta(days=self.FULL_SYNC_DAYS)
+        # 关闭信号，定期任务在等待期间收到后立即退出
+        self._stop_event = threading.Event()
+        # 预检时取得、待该状态同步成功后才保存的第一页校验头 {(类型, 状态): (ETag, Last-Modified)}
+        self._pending_validators: Dict[Tuple[str, str], Tuple[str, str]] = {}
         
         logger.info(f"调度器初始化完成，用户ID: {self.user_id}")
     
     @property
     def is_syncing(self) -> bool:
-        """是否正在同步中"""
-        with self._sync_lock:
-            return self._is_syncing
+        """是否正在同步中（单个属性读取在CPython中是原子的，无需加锁）"""
+        return self._is_syncing
     
     @property
     def last_sync(self) -> Optional[datetime]:
@@ -77,14 +149,45 @@ class Scheduler:
         """上次全量同步时间"""
         return self._last_full_sync
     
-    def _set_sync_state(self, state: bool, is_full: bool = False):
+    def _load_watermark(self, name: str) -> Optional[datetime]:
+        """从数据库读取同步时间点
+        
+        参数:
+            name: 水位名称
+            
+        返回:
+            保存的时间，不存在或格式无效时返回None
+        """
+        value = self.db.get_watermark(name)
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            logger.warning(f"忽略无效的同步水位 {name}: {value}")
+            return None
+    
+    def _set_sync_state(self, state: bool):
         """设置同步状态"""
         with self._sync_lock:
             self._is_syncing = state
-            if state is False:
-                self._last_sync = datetime.now()
-                if is_full:
-                    self._last_full_sync = datetime.now()
+            
+    def _record_sync_completed(self, is_full: bool):
+        """记录并持久化一次成功完成的同步时间
+        
+        参数:
+            is_full: 完成的是否为全量同步
+        """
+        now = datetime.now()
+        with self._sync_lock:
+            self._last_sync = now
+            if is_full:
+                self._last_full_sync = now
+                
+        # 数据库写入放在锁外
+        self.db.set_watermark("last_sync", now.isoformat())
+        if is_full:
+            self.db.set_watermark("last_full_sync", now.isoformat())
     
     def sync_all_data(self, incremental: bool = True):
         """同步所有配置的内容类型数据
@@ -100,32 +203,36 @@ class Scheduler:
             return False
             
         try:
-            self._set_sync_state(True, not incremental)
+            self._set_sync_state(True)
             logger.info(f"开始同步所有数据，模式: {'增量' if incremental else '全量'}")
             
             # 检查是否需要强制全量同步
             if incremental and self._last_full_sync:
-                days_since_full_sync = (datetime.now() - self._last_full_sync).days
-                if days_since_full_sync >= self.FULL_SYNC_DAYS:
-                    logger.info(f"距离上次全量同步已有 {days_since_full_sync} 天，强制执行全量同步")
+                since_full_sync = datetime.now() - self._last_full_sync
+                if since_full_sync >= self._full_sync_delta:
+                    logger.info(f"距离上次全量同步已有 {since_full_sync.days} 天，强制执行全量同步")
                     incremental = False
-                    self._set_sync_state(True, True)  # 更新为全量同步状态
             
             # 遍历同步所有配置的内容类型
             all_success = True
             
-            # 跳过tv类型的同步，因为它会在movie同步时被处理
-            sync_types = [t for t in self.sync_types if t != "tv" or "movie" not in self.sync_types]
-            for content_type in sync_types:
-                result = self.sync_data_by_type(content_type, incremental)
-                if not result:
-                    all_success = False
-                    logger.warning(f"类型 {content_type} 同步未完全成功")
+            # 一次查询取得所有类型和状态的本地统计，供各类型预检使用
+            sync_stats = self.db.get_sync_stats() if incremental else None
+            
+            # 各类型互不依赖，并发同步，API请求数由信号量限制
+            with ThreadPoolExecutor(max_workers=self.SYNC_WORKERS) as executor:
+                futures = {
+                    executor.submit(self.sync_data_by_type, content_type, incremental, sync_stats): content_type
+                    for content_type in self._sync_types_frozen
+                }
+                for future in as_completed(futures):
+                    if not future.result():
+                        all_success = False
+                        logger.warning(f"类型 {futures[future]} 同步未完全成功")
             
             # 如果配置了图片服务，同步图片 - 改为使用image_service的download_covers属性
             if self.image_service:
                 if self.image_service.download_covers:  # 使用image_service的属性而非scheduler的
-                    from services.sync.sync_manager import sync_images
                     logger.info("开始同步封面图片...")
                     sync_images(self.db, self, self.image_service)
                     logger.info("封面图片同步完成")
@@ -133,47 +240,65 @@ class Scheduler:
                     logger.info("图片下载功能已禁用（DOWNLOAD_COVERS=false），跳过图片同步")
             
             logger.info("所有数据同步完成")
+            
+            # 只有同步全部成功时才记录同步时间，失败后的下次同步仍按原计划执行
+            if all_success:
+                self._record_sync_completed(is_full=not incremental)
             return all_success
         except Exception as e:
             logger.error(f"同步过程中发生错误: {e}")
             return False
         finally:
-            self._set_sync_state(False, not incremental)
+            self._set_sync_state(False)
     
-    def _pre_check_updates(self, type_: str, status: str, latest_timestamp: str) -> Tuple[bool, int, int]:
-        """预检是否有新数据"""
+    def _pre_check_updates(self, type_: str, status: str, latest_timestamp: str,
+                           sync_stats: Dict[Tuple[str, str], Tuple[int, str]]) -> Tuple[bool, int, int]:
+        """预检是否有新数据
+        
+        参数:
+            type_: 内容类型
+            status: 状态 ('mark', 'doing', 或 'done')
+            latest_timestamp: 本地该类型和状态的最新时间戳
+            sync_stats: Database.get_sync_stats 返回的本地条目数和最新时间戳
+            
+        返回:
+            (是否有更新, API条目数, 本地条目数)
+        """
         if not latest_timestamp:
             logger.info(f"{type_} {status} 没有历史数据，需要完整同步")
             return True, 0, 0
         
         try:
-            # 只获取第一页数据进行预检
+            # 只获取第一页数据进行预检，带上上次的校验头，第一页没有变化时服务端直接返回304
             logger.info(f"{type_} {status} 执行预检，最新时间戳: {latest_timestamp}")
-            first_page = self.api.get_interests_page(self.user_id, type_, status, page=1)
+            etag = self.db.get_watermark(f"etag:{type_}:{status}") or ""
+            last_modified = self.db.get_watermark(f"last_modified:{type_}:{status}") or ""
+            with self._api_semaphore:
+                first_page = self.api.get_interests_page(self.user_id, type_, status, page=1,
+                                                         etag=etag, last_modified=last_modified)
+            
+            if first_page is None:
+                logger.info(f"{type_} {status} 预检: 第一页未变化(304)，没有新数据")
+                return False, 0, 0
+            
+            # 校验头在该状态同步成功后才保存，避免同步失败后的下次预检被304跳过
+            validators = (first_page.get('etag', ''), first_page.get('last_modified', ''))
+            if any(validators):
+                self._pending_validators[(type_, status)] = validators
             
-            if not first_page or not first_page.get('interests'):
+            if not first_page.get('interests'):
                 logger.info(f"{type_} {status} 预检: API返回空结果")
+                self._save_validators(type_, status)
                 return False, 0, 0
             
             # 获取总条目数
             total_count = first_page.get('total', 0)
             
-            # 特殊处理movie类型，需要考虑tv类型
-            if type_ == "movie":
-                # 获取本地计数
-                local_movie_count = self.db.get_interest_count("movie", status)
-                local_tv_count = self.db.get_interest_count("tv", status)
-                local_count = local_movie_count + local_tv_count
-                logger.info(f"{type_} {status} 预检: API返回 {total_count} 条，本地 movie({local_movie_count})+tv({local_tv_count})={local_count} 条")
-                
-                # 同时获取movie和tv类型的最新时间戳，使用较新的那个
-                tv_timestamp = self.db.get_latest_timestamps("tv").get(status, "")
-                if tv_timestamp and tv_timestamp > latest_timestamp:
-                    logger.info(f"使用tv类型的时间戳 {tv_timestamp} 代替 movie类型时间戳 {latest_timestamp} 进行比较")
-                    latest_timestamp = tv_timestamp
-            else:
-                local_count = self.db.get_interest_count(type_, status)
-                logger.info(f"{type_} {status} 预检: API返回 {total_count} 条，本地 {local_count} 条")
+            # movie类型的数据在本地分为movie和tv，合并计数并使用其中较新的时间戳
+            local_types = _LOCAL_TYPES.get(type_, (type_,))
+            local_count, local_latest = _combined_stats(sync_stats, local_types, status)
+            latest_timestamp = max(latest_timestamp, local_latest)
+            logger.info(f"{type_} {status} 预检: API返回 {total_count} 条，本地 {'+'.join(local_types)} 共 {local_count} 条")
             
             # 如果数量不一致，认为有更新
             if total_count != local_count:
@@ -186,17 +311,14 @@ class Scheduler:
                     logger.info(f"{type_} {status} 预检: 条目数不一致，需要同步")
                     return True, total_count, local_count
             
-            # 获取前几条记录并比对时间戳
-            interests = first_page.get('interests', [])
-            for i, item in enumerate(interests[:self.PRE_CHECK_SAMPLE_SIZE]):
-                item_time = item.get("create_time", "")
-                
-                # 如果有任何一条记录比最新时间戳新，则有更新
-                if item_time > latest_timestamp:
-                    logger.info(f"{type_} {status} 预检: 发现新数据，时间戳 {item_time} > {latest_timestamp}")
-                    return True, total_count, local_count
+            # API按 create_time 降序返回，只需比较第一条：最新的一条不比本地新，其余也不会更新
+            newest_time = first_page['interests'][0].get("create_time", "")
+            if newest_time > latest_timestamp:
+                logger.info(f"{type_} {status} 预检: 发现新数据，时间戳 {newest_time} > {latest_timestamp}")
+                return True, total_count, local_count
             
             logger.info(f"{type_} {status} 预检: 没有发现新数据")
+            self._save_validators(type_, status)
             return False, total_count, local_count
             
         except Exception as e:
@@ -204,12 +326,186 @@ class Scheduler:
             # 预检失败时保守起见认为有更新
             return True, 0, 0
     
-    def sync_data_by_type(self, type_: str, incremental: bool = True) -> bool:
+    def _save_validators(self, type_: str, status: str):
+        """保存预检时取得的第一页校验头，供下次预检发送条件请求
+        
+        参数:
+            type_: 内容类型
+            status: 状态 ('mark', 'doing', 或 'done')
+        """
+        validators = self._pending_validators.pop((type_, status), None)
+        if not validators:
+            return
+        etag, last_modified = validators
+        if etag:
+            self.db.set_watermark(f"etag:{type_}:{status}", etag)
+        if last_modified:
+            self.db.set_watermark(f"last_modified:{type_}:{status}", last_modified)
+    
+    def _save_batch(self, batch: List[Dict[str, Any]], existing_ids: set) -> Tuple[int, int]:
+        """批量保存一批记录
+        
+        参数:
+            batch: API返回的兴趣数据列表
+            existing_ids: 数据库中已有的记录ID，保存后会加入新记录的ID
+            
+        返回:
+            (新增数, 更新数)
+        """
+        saved_ids = [str(interest_id) for interest_id in self.db.save_interests_bulk(batch)]
+        new_count = sum(1 for interest_id in saved_ids if interest_id not in existing_ids)
+        existing_ids.update(saved_ids)
+        return new_count, len(saved_ids) - new_count
+    
+    def _limit_api_pages(self, pages: Iterator[Tuple[int, List[Dict[str, Any]]]]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """逐页获取时只在请求页面期间占用API并发名额，处理页面数据时释放
+        
+        参数:
+            pages: 按需请求的页面迭代器
+            
+        返回:
+            与 pages 相同的页面迭代器
+        """
+        while True:
+            with self._api_semaphore:
+                page = next(pages, None)
+            if page is None:
+                return
+            yield page
+    
+    def _sync_status(self, type_: str, status: str, incremental: bool,
+                     latest_timestamps: Dict[str, str],
+                     sync_stats: Dict[Tuple[str, str], Tuple[int, str]],
+                     existing_ids: set) -> bool:
+        """同步指定类型下某一状态的数据
+        
+        参数:
+            type_: 内容类型
+            status: 状态 ('mark', 'doing', 或 'done')
+            incremental: 是否使用增量更新
+            latest_timestamps: 该类型各状态在数据库中的最新时间戳
+            sync_stats: 本地各类型和状态的条目数与最新时间戳
+            existing_ids: 数据库中已有的记录ID，用于区分新增和更新
+            
+        返回:
+            bool: 同步是否成功
+        """
+        try:
+            logger.info(f"同步{type_}状态: {status}")
+            
+            # 增量模式下进行预检
+            has_updates = True
+            total_count = 0
+            local_count = 0
+            
+            if incremental:
+                last_time = latest_timestamps.get(status, "")
+                has_updates, total_count, local_count = self._pre_check_updates(type_, status, last_time, sync_stats)
+                
+                # 如果没有更新，跳过此状态
+                if not has_updates:
+                    logger.info(f"{type_}状态 {status} 没有新数据，跳过同步")
+                    return True
+            
+            # 增量模式逐页获取，遇到连续旧页面时停止翻页；全量模式一次性并发获取全部数据
+            if incremental:
+                pages = self._limit_api_pages(self.api.iter_interests_pages(self.user_id, type_, status))
+            else:
+                # 并发获取的每一页各自占用一个API并发名额
+                all_interests = self.api.get_interests(self.user_id, type_, status, request_slot=self._api_semaphore)
+                pages = enumerate([all_interests], 1)
+            
+            # 获取上次同步时间，用于增量更新
+            last_time = latest_timestamps.get(status, "")
+            
+            # 计数器
+            fetched_count = 0
+            new_count = 0
+            update_count = 0
+            skip_count = 0
+            
+            # 连续旧条目页面计数
+            consecutive_old_pages = 0
+            batch = []
+            
+            # 循环中反复使用的属性和方法绑定为局部变量
+            check_time = incremental and bool(last_time)
+            batch_extend = batch.extend
+            batch_size = self.SYNC_BATCH_SIZE
+            old_pages_threshold = self.CONSECUTIVE_OLD_PAGES_THRESHOLD
+            min_pages = self.MIN_PAGES_TO_CHECK
+            save_batch = self._save_batch
+            
+            # 遍历并保存/更新记录
+            for page_number, page_items in pages:
+                fetched_count += len(page_items)
+                
+                # 整页过滤无效数据和没有ID的条目
+                items = [item for item in page_items if isinstance(item, dict) and item.get("id")]
+                if len(items) < len(page_items):
+                    logger.warning(f"跳过 {len(page_items) - len(items)} 条无效或没有ID的数据")
+                
+                # 增量更新：整页取出时间戳，只保留比上次同步新的记录，整页都不新时无需逐条比较
+                if check_time and items:
+                    times = _page_create_times(items)
+                    if max(times) <= last_time:
+                        new_items = []
+                    else:
+                        new_items = [item for item, ts in zip(items, times) if ts > last_time]
+                    skip_count += len(items) - len(new_items)
+                    items = new_items
+                
+                # 当前页没有需要保存的记录时视为全是旧数据
+                current_page_all_old = not items
+                
+                # 累积待保存的记录，达到批量大小时统一写入
+                batch_extend(items)
+                while len(batch) >= batch_size:
+                    added, updated = save_batch(batch[:batch_size], existing_ids)
+                    new_count += added
+                    update_count += updated
+                    del batch[:batch_size]
+                
+                if incremental:
+                    # 如果当前页全是旧数据，增加连续旧页面计数
+                    if current_page_all_old:
+                        consecutive_old_pages += 1
+                    else:
+                        consecutive_old_pages = 0
+                    
+                    # 如果连续多页都是旧数据，且已经检查了最小页数，提前终止，后续页面不再请求
+                    if consecutive_old_pages >= old_pages_threshold and page_number >= min_pages:
+                        logger.info(f"连续 {consecutive_old_pages} 页都是旧数据，提前终止同步")
+                        break
+            
+            if batch:
+                added, updated = save_batch(batch, existing_ids)
+                new_count += added
+                update_count += updated
+            
+            self._save_validators(type_, status)
+            
+            if not fetched_count:
+                logger.info(f"{type_}状态 {status} 没有数据")
+                return True
+            
+            logger.info(f"获取到 {fetched_count} 条{type_}记录")
+            logger.info(f"{type_}状态 {status} 同步完成: 新增 {new_count}, 更新 {update_count}, 跳过 {skip_count}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"同步{type_}状态 {status} 失败: {e}")
+            self._pending_validators.pop((type_, status), None)
+            return False
+    
+    def sync_data_by_type(self, type_: str, incremental: bool = True,
+                          sync_stats: Optional[Dict[Tuple[str, str], Tuple[int, str]]] = None) -> bool:
         """同步指定类型的数据
         
         参数:
             type_: 内容类型 ('movie', 'book', 'tv', 'music', 'game', 'drama' 等)
             incremental: 是否使用增量更新
+            sync_stats: 预先查询的本地同步统计，为None时自动查询
             
         返回:
             bool: 同步是否成功
@@ -219,112 +515,24 @@ class Scheduler:
         # 获取当前数据库中的最新时间戳
         latest_timestamps = {}
         if incremental:
-            latest_timestamps = self.db.get_latest_timestamps(type_)
+            if sync_stats is None:
+                sync_stats = self.db.get_sync_stats()
+            latest_timestamps = {status: sync_stats.get((type_, status), (0, ""))[1] for status in _STATUSES}
             logger.info(f"{type_}数据最新时间戳: {latest_timestamps}")
         
-        # 状态映射 - 所有类型都使用这三种状态
-        statuses = ["mark", "doing", "done"]
-        overall_success = True
+        # 一次性取出已有记录的ID，movie同步时也会返回tv条目
+        existing_ids = set()
+        for local_type in _LOCAL_TYPES.get(type_, (type_,)):
+            existing_ids |= self.db.get_all_ids(local_type)
         
-        # 遍历每种状态
-        for status in statuses:
-            try:
-                logger.info(f"同步{type_}状态: {status}")
-                
-                # 增量模式下进行预检
-                has_updates = True
-                total_count = 0
-                local_count = 0
+        # 各状态互不依赖，并发同步
+        with ThreadPoolExecutor(max_workers=len(_STATUSES)) as executor:
+            results = list(executor.map(
+                lambda status: self._sync_status(type_, status, incremental, latest_timestamps, sync_stats, existing_ids),
+                _STATUSES
+            ))
                 
-                if incremental:
-                    last_time = latest_timestamps.get(status, "")
-                    has_updates, total_count, local_count = self._pre_check_updates(type_, status, last_time)
-                    
-                    # 如果没有更新，跳过此状态
-                    if not has_updates:
-                        logger.info(f"{type_}状态 {status} 没有新数据，跳过同步")
-                        continue
-                
-                # 获取完整数据
-                interests = self.api.get_interests(self.user_id, type_, status)
-                
-                if not interests:
-                    logger.info(f"{type_}状态 {status} 没有数据")
-                    continue
-                
-                logger.info(f"获取到 {len(interests)} 条{type_}记录")
-                
-                # 获取上次同步时间，用于增量更新
-                last_time = latest_timestamps.get(status, "")
-                
-                # 计数器
-                new_count = 0
-                update_count = 0
-                skip_count = 0
-                
-                # 连续旧条目页面计数
-                consecutive_old_pages = 0
-                current_page = 1
-                page_size = 20  # 假设API一页返回20条
-                current_page_all_old = True
-                
-                # 遍历并保存/更新记录
-                for i, item in enumerate(interests):
-                    if not isinstance(item, dict):
-                        logger.warning(f"跳过无效数据: {type(item)}")
-                        continue
-                        
-                    # 检测页面边界，用于智能终止
-                    if incremental and i > 0 and i % page_size == 0:
-                        current_page += 1
-                        
-                        # 如果上一页全是旧数据，增加连续旧页面计数
-                        if current_page_all_old:
-                            consecutive_old_pages += 1
-                        else:
-                            consecutive_old_pages = 0
-                        
-                        # 重置当前页标记
-                        current_page_all_old = True
-                        
-                        # 如果连续多页都是旧数据，且已经检查了最小页数，提前终止
-                        if consecutive_old_pages >= self.CONSECUTIVE_OLD_PAGES_THRESHOLD and current_page > self.MIN_PAGES_TO_CHECK:
-                            logger.info(f"连续 {consecutive_old_pages} 页都是旧数据，提前终止同步")
-                            break
-                        
-                    item_time = item.get("create_time", "")
-                    interest_id = item.get("id")
-
-                    if not interest_id:
-                        logger.warning("跳过没有ID的条目")
-                        continue
-                        
-                    # 增量更新：如果有上次同步时间，且当前记录不比它新，则跳过
-                    if incremental and last_time and item_time <= last_time:
-                        skip_count += 1
-                        continue
-                    else:
-                        # 有新数据，当前页不全是旧数据
-                        current_page_all_old = False
-                    
-                    # 判断记录是否已存在
-                    existing = self.db.get_interest_by_id(interest_id) if interest_id else None
-                    
-                    # 保存或更新记录
-                    result = self.db.save_interest(item)
-                    if result:
-                        if existing:
-                            update_count += 1
-                        else:
-                            new_count += 1
-                
-                logger.info(f"{type_}状态 {status} 同步完成: 新增 {new_count}, 更新 {update_count}, 跳过 {skip_count}")
-                
-            except Exception as e:
-                logger.error(f"同步{type_}状态 {status} 失败: {e}")
-                overall_success = False
-                
-        return overall_success
+        return all(results)
     
     def start_async_sync(self, incremental: bool = True):
         """异步启动同步过程
@@ -356,7 +564,7 @@ class Scheduler:
     def _async_sync_worker(self, incremental: bool):
         """异步同步工作线程"""
         try:
-            self._set_sync_state(True, not incremental)
+            self._set_sync_state(True)
             
             # 同步所有数据
             self.sync_all_data(incremental)
@@ -365,7 +573,7 @@ class Scheduler:
         except Exception as e:
             logger.error(f"异步同步任务失败: {e}")
         finally:
-            self._set_sync_state(False, not incremental)
+            self._set_sync_state(False)
     
     def schedule_periodic_sync(self, interval_hours: int = 24):
         """启动定期同步调度器
@@ -388,15 +596,32 @@ class Scheduler:
         
         logger.info(f"定期同步调度器已启动，间隔: {interval_hours}小时")
     
+    def wait_for_shutdown(self, timeout: float) -> bool:
+        """等待关闭信号，供定期任务在两次执行之间休眠
+        
+        参数:
+            timeout: 最长等待秒数，小于等于0时立即返回
+            
+        返回:
+            bool: 是否已收到关闭信号
+        """
+        return self._stop_event.wait(max(0, timeout))
+    
+    def shutdown(self):
+        """通知所有定期同步线程退出"""
+        self._stop_event.set()
+        logger.info("已通知定期同步任务停止")
+    
     def _periodic_sync_worker(self, interval_hours: int):
         """定期同步工作线程"""
         interval_seconds = interval_hours * 3600
         
-        # 第一次启动时等待一段时间
+        # 第一次启动时等待10秒，之后按固定时间表执行，同步耗时不会累积到间隔中
         logger.info(f"定期同步调度器已启动，间隔: {interval_hours}小时")
-        time.sleep(10)  # 等待10秒
+        next_run = time.monotonic() + 10
         
-        while True:
+        while not self.wait_for_shutdown(next_run - time.monotonic()):
+            next_run += interval_seconds
             try:
                 # 使用原子操作检查并设置同步状态
                 can_sync = False
@@ -409,9 +634,9 @@ class Scheduler:
                     # 检查是否需要全量同步
                     do_incremental = True
                     if self._last_full_sync:
-                        days_since_full_sync = (datetime.now() - self._last_full_sync).days
-                        if days_since_full_sync >= self.FULL_SYNC_DAYS:
-                            logger.info(f"距离上次全量同步已有 {days_since_full_sync} 天，将执行全量同步")
+                        since_full_sync = datetime.now() - self._last_full_sync
+                        if since_full_sync >= self._full_sync_delta:
+                            logger.info(f"距离上次全量同步已有 {since_full_sync.days} 天，将执行全量同步")
                             do_incremental = False
                     
                     # 执行同步
@@ -421,11 +646,7 @@ class Scheduler:
                         logger.info("定期同步任务完成")
                     finally:
                         # 确保同步状态被重置
-                        with self._sync_lock:
-                            self._is_syncing = False
-                            self._last_sync = datetime.now()
-                            if not do_incremental:
-                                self._last_full_sync = datetime.now()
+                        self._set_sync_state(False)
                 else:
                     logger.warning("上一次同步任务仍在进行中，跳过本次定期同步")
                     
@@ -435,9 +656,9 @@ class Scheduler:
                 with self._sync_lock:
                     self._is_syncing = False
             
-            # 休眠指定时间
             logger.info(f"下一次定期同步将在 {interval_hours} 小时后执行")
-            time.sleep(interval_seconds)
+        
+        logger.info("定期同步调度器已停止")
             
     def get_sync_status(self) -> Dict[str, Any]:
         """获取同步状态信息
@@ -445,35 +666,39 @@ class Scheduler:
         返回:
             包含同步状态的字典，不包含统计数据
         """
+        # 只在锁内取一致的状态快照，时间计算和格式化在锁外完成
         with self._sync_lock:
-            # 计算自上次同步以来的时间
-            time_since_last_sync = None
-            if self._last_sync:
-                time_since_last_sync = int((datetime.now() - self._last_sync).total_seconds())
-                
-            # 计算距离下次建议全量同步的时间
-            next_full_sync = None
-            days_to_next_full = None
-            if self._last_full_sync:
-                next_full_sync = self._last_full_sync + timedelta(days=self.FULL_SYNC_DAYS)
-                days_to_next_full = (next_full_sync - datetime.now()).days
-                next_full_sync = next_full_sync.isoformat()
-            
-            status = {
-                # 同步状态信息
-                "is_syncing": self._is_syncing,
-                "last_sync": self._last_sync.isoformat() if self._last_sync else None,
-                "last_full_sync": self._last_full_sync.isoformat() if self._last_full_sync else None,
-                "time_since_last_sync_seconds": time_since_last_sync,
-                
-                # 配置信息
-                "user_id": self.user_id,
-                "download_covers": self.download_covers,
-                "sync_types": self.sync_types,
-                
-                # 下次同步计划
-                "next_full_sync": next_full_sync,
-                "days_to_next_full_sync": days_to_next_full
-            }
+            is_syncing = self._is_syncing
+            last_sync = self._last_sync
+            last_full_sync = self._last_full_sync
+            
+        # 计算自上次同步以来的时间
+        now = datetime.now()
+        time_since_last_sync = None
+        if last_sync:
+            time_since_last_sync = int((now - last_sync).total_seconds())
+            
+        # 计算距离下次建议全量同步的时间
+        next_full_sync = None
+        days_to_next_full = None
+        if last_full_sync:
+            next_full_sync = last_full_sync + self._full_sync_delta
+            days_to_next_full = (next_full_sync - now).days
+            next_full_sync = next_full_sync.isoformat()
+        
+        return {
+            # 同步状态信息
+            "is_syncing": is_syncing,
+            "last_sync": last_sync.isoformat() if last_sync else None,
+            "last_full_sync": last_full_sync.isoformat() if last_full_sync else None,
+            "time_since_last_sync_seconds": time_since_last_sync,
+            
+            # 配置信息
+            "user_id": self.user_id,
+            "download_covers": self.download_covers,
+            "sync_types": self.sync_types,
             
-        return status
\ No newline at end of file
+            # 下次同步计划
+            "next_full_sync": next_full_sync,
+            "days_to_next_full_sync": days_to_next_full
+        }
@@ -55,40 +55,6 @@ def sync_images_override(db, scheduler, image_service, max_items=None):
         return 0, 0
 
 
-def sync_all(scheduler, incremental: bool = True) -> bool:
-    """同步所有数据和图片
-    
-    参数:
-        scheduler: 调度器实例
-        incremental: 是否增量更新
-        
-    返回:
-        是否全部成功
-    """
-    if not scheduler:
-        logger.error("调度器未初始化，无法执行同步")
-        return False
-        
-    try:
-        # 首先同步数据
-        data_success = scheduler.sync_all_data(incremental)
-        
-        # 然后同步图片 - 使用image_service.download_covers属性判断
-        if scheduler.image_service:
-            if scheduler.image_service.download_covers:
-                logger.info("开始同步封面图片...")
-                sync_images(scheduler.db, scheduler, scheduler.image_service)
-                logger.info("封面图片同步完成")
-            else:
-                logger.info("图片下载功能已禁用（DOWNLOAD_COVERS=false），跳过图片同步")
-        else:
-            logger.warning("图片服务未初始化，无法同步图片")
-        
-        return data_success
-    except Exception as e:
-        logger.error(f"全面同步过程中发生错误: {e}")
-        return False
-
 def schedule_sync_tasks(scheduler, data_interval_hours: int = 24, 
                        image_interval_hours: int = 48, startup_delay: int = 10):
     """安排定期同步任务
@@ -124,11 +90,12 @@ def _periodic_image_sync_worker(scheduler, interval_hours: int, startup_delay: i
     """定期图片同步工作线程"""
     interval_seconds = interval_hours * 3600
     
-    # 启动时等待一段时间
+    # 启动时等待一段时间，之后按固定时间表执行，同步耗时不会累积到间隔中
     logger.info(f"定期图片同步调度器已启动，间隔: {interval_hours}小时，启动延迟: {startup_delay}秒")
-    time.sleep(startup_delay)
+    next_run = time.monotonic() + startup_delay
     
-    while True:
+    while not scheduler.wait_for_shutdown(next_run - time.monotonic()):
+        next_run += interval_seconds
         try:
             # 检查是否可以执行同步并且图片下载仍然启用
             if not scheduler.is_syncing and scheduler.image_service.download_covers:
@@ -143,6 +110,6 @@ def _periodic_image_sync_worker(scheduler, interval_hours: int, startup_delay: i
         except Exception as e:
             logger.error(f"定期图片同步失败: {e}")
             
-        # 休眠指定时间
         logger.info(f"下一次图片同步将在 {interval_hours} 小时后执行")
-        time.sleep(interval_seconds)
\ No newline at end of file
+    
+    logger.info("定期图片同步调度器已停止")
\ No newline at end of file
@@ -1,29 +1,43 @@
 # logger.py 实现概述
 import os
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from dotenv import load_dotenv
 
-# 加载环境变量
-load_dotenv()
-
-# 获取配置
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
-LOG_FILE = os.getenv("LOG_FILE", "backend/data/douban-sync.log")
-
-# 确保日志目录存在
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+# 后台写日志的监听线程，业务线程只负责把日志记录放入队列
+_listener = None
 
 # 配置根记录器
+@lru_cache(maxsize=1)
 def setup_logger():
-    """配置并返回根记录器"""
+    """配置并返回根记录器，首次获取记录器时才执行
+    
+    控制台和文件输出由后台监听线程完成，记录日志的线程不会阻塞在磁盘写入上
+    """
+    global _listener
+    
+    # 加载环境变量并获取配置
+    load_dotenv()
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    log_file = os.getenv("LOG_FILE", "backend/data/douban-sync.log")
+    
+    # 确保日志目录存在
+    log_dir = os.path.dirname(log_file)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    
     # 创建记录器
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, LOG_LEVEL))
+    root_logger.setLevel(getattr(logging, log_level))
     
     # 清除现有处理器(避免重复)
     if root_logger.handlers:
         root_logger.handlers.clear()
+    if _listener is not None:
+        _listener.stop()
     
     # 创建格式化器
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -31,23 +45,34 @@ def setup_logger():
     # 添加控制台处理器
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
     
     # 添加文件处理器
     file_handler = RotatingFileHandler(
-        LOG_FILE, 
+        log_file, 
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5,           # 保留5个备份
         encoding='utf-8'
     )
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+    
+    # 记录器只向无界队列投递日志，由监听线程写入控制台和文件
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
     
     return root_logger
 
-# 初始化根记录器
-logger = setup_logger()
+
+def _stop_listener():
+    """进程退出前写完队列中剩余的日志"""
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
 
 def get_logger(name):
-    """获取指定名称的记录器"""
-    return logging.getLogger(name)
\ No newline at end of file
+    """获取指定名称的记录器，首次调用时初始化日志配置"""
+    setup_logger()
+    return logging.getLogger(name)
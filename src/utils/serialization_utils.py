@@ -1,16 +1,69 @@
 import json
 import datetime
+import operator
 import decimal
 import uuid
-from typing import Any, Dict, List, Set, Tuple, Union, Optional
-from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple, Union, Optional
+from pathlib import Path, PosixPath, WindowsPath
 import sqlite3
 import logging
 import re
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
+
+def _decode_bytes(obj: bytes) -> str:
+    """将字节串按UTF-8解码，无法解码的字节替换为U+FFFD"""
+    return obj.decode('utf-8', 'replace')
+
+
+def _row_to_dict(obj: sqlite3.Row) -> Dict[str, Any]:
+    """将SQLite行对象转换为字典，行对象按列顺序迭代出各列的值"""
+    return dict(zip(obj.keys(), obj))
+
+
+def serialize_rows(rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+    """将同一查询返回的多行转换为字典列表，列名只读取一次
+    
+    参数:
+        rows: 同一查询的 sqlite3.Row 结果
+        
+    返回:
+        每行对应一个字典的列表
+    """
+    if not rows:
+        return []
+    keys = rows[0].keys()
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def _pattern_str(obj: re.Pattern) -> str:
+    """返回正则表达式的模式字符串"""
+    return obj.pattern
+
+
+# 按精确类型查找的转换函数，命中时无需逐个 isinstance 判断；子类仍走 isinstance 分支
+_CONVERTERS = {
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: datetime.time.isoformat,
+    decimal.Decimal: float,
+    uuid.UUID: str,
+    set: list,
+    bytes: _decode_bytes,
+    PosixPath: str,
+    WindowsPath: str,
+    sqlite3.Row: _row_to_dict,
+    re.Pattern: _pattern_str,
+}
+
+
 class SafeJSONEncoder(json.JSONEncoder):
     """扩展的JSON编码器，能处理更多类型"""
     
@@ -23,6 +76,10 @@ class SafeJSONEncoder(json.JSONEncoder):
         返回:
             可序列化的值
         """
+        converter = _CONVERTERS.get(type(obj))
+        if converter is not None:
+            return converter(obj)
+            
         # 日期时间类型
         if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
             return obj.isoformat()
@@ -41,10 +98,7 @@ class SafeJSONEncoder(json.JSONEncoder):
             
         # 字节类型
         elif isinstance(obj, bytes):
-            try:
-                return obj.decode('utf-8')
-            except UnicodeDecodeError:
-                return str(obj)
+            return _decode_bytes(obj)
                 
         # 路径类型
         elif isinstance(obj, Path):
@@ -52,11 +106,7 @@ class SafeJSONEncoder(json.JSONEncoder):
             
         # SQLite行类型
         elif isinstance(obj, sqlite3.Row):
-            return {key: obj[key] for key in obj.keys()}
-            
-        # 正则表达式模式
-        elif isinstance(obj, re.Pattern):
-            return obj.pattern
+            return _row_to_dict(obj)
             
         # 异常类型
         elif isinstance(obj, Exception):
@@ -80,32 +130,32 @@ class SafeJSONEncoder(json.JSONEncoder):
             return f"<不可序列化对象: {type(obj).__name__}>"
 
 
-def safe_serialize(obj: Any) -> Any:
-    """递归地将对象转换为可序列化的形式
+# orjson 不支持的类型交给扩展编码器处理
+_orjson_default = SafeJSONEncoder().default
+
+
+# 无需转换即可序列化的基本类型
+_LEAF_TYPES = (str, int, float, bool, type(None))
+
+# 标准库json可直接编码的基本类型（精确类型，子类交给扩展编码器）
+_PURE_LEAF_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# 需要逐个展开子元素的容器类型
+_CONTAINER_TYPES = (dict, list, tuple, set)
+
+
+def _convert_value(obj: Any) -> Any:
+    """将非基本类型、非容器的对象转换为可序列化的值
     
     参数:
         obj: 要处理的对象
         
     返回:
-        转换后的可序列化对象
+        基本类型的值，或仍需继续展开的字典
     """
-    # 处理基本类型
-    if obj is None or isinstance(obj, (str, int, float, bool)):
-        return obj
-    
-    # 处理列表或元组
-    if isinstance(obj, (list, tuple)):
-        return [safe_serialize(item) for item in obj]
-        
-    # 处理字典
-    if isinstance(obj, dict):
-        result = {}
-        for key, value in obj.items():
-            # 确保键是字符串
-            if not isinstance(key, str):
-                key = str(key)
-            result[key] = safe_serialize(value)
-        return result
+    converter = _CONVERTERS.get(type(obj))
+    if converter is not None:
+        return converter(obj)
         
     # 处理日期时间类型
     if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
@@ -119,16 +169,9 @@ def safe_serialize(obj: Any) -> Any:
     if isinstance(obj, uuid.UUID):
         return str(obj)
         
-    # 处理集合
-    if isinstance(obj, set):
-        return [safe_serialize(item) for item in obj]
-        
     # 处理字节类型
     if isinstance(obj, bytes):
-        try:
-            return obj.decode('utf-8')
-        except UnicodeDecodeError:
-            return str(obj)
+        return _decode_bytes(obj)
             
     # 处理路径
     if isinstance(obj, Path):
@@ -136,26 +179,21 @@ def safe_serialize(obj: Any) -> Any:
         
     # 处理SQLite行对象
     if isinstance(obj, sqlite3.Row):
-        return safe_serialize({key: obj[key] for key in obj.keys()})
-        
-    # 处理正则表达式模式
-    if isinstance(obj, re.Pattern):
-        return obj.pattern
+        return _row_to_dict(obj)
         
     # 处理异常类型
     if isinstance(obj, Exception):
         return {
             'error_type': obj.__class__.__name__,
             'error_message': str(obj),
-            'error_args': safe_serialize(obj.args)
+            'error_args': obj.args
         }
         
     # 处理具有__dict__属性的对象
     if hasattr(obj, '__dict__'):
-        try:
-            return safe_serialize(obj.__dict__)
-        except Exception as e:
-            logger.debug(f"无法使用__dict__序列化对象: {e}")
+        obj = obj.__dict__
+        if isinstance(obj, dict):
+            return obj
             
     # 尝试转为字符串作为最后手段
     try:
@@ -165,8 +203,160 @@ def safe_serialize(obj: Any) -> Any:
         return f"<不可序列化对象: {type(obj).__name__}>"
 
 
-def safe_json_dumps(obj: Any, indent: Optional[int] = None, ensure_ascii: bool = False) -> str:
-    """安全地将对象序列化为JSON字符串
+def safe_serialize(obj: Any) -> Any:
+    """将对象转换为可序列化的形式
+    
+    使用显式栈逐层展开容器，嵌套层级不受递归深度限制，循环引用替换为占位字符串。
+    
+    参数:
+        obj: 要处理的对象
+        
+    返回:
+        转换后的可序列化对象
+    """
+    root = [None]
+    # 栈中每一项为 (父容器, 键或下标, 待处理对象)；父容器为None时表示某个容器已展开完毕
+    stack = [(root, 0, obj)]
+    # 正在展开的容器id，用于发现循环引用
+    active = set()
+    
+    while stack:
+        parent, key, value = stack.pop()
+        if parent is None:
+            active.discard(key)
+            continue
+        
+        # 处理基本类型
+        if isinstance(value, _LEAF_TYPES):
+            parent[key] = value
+            continue
+        
+        if not isinstance(value, _CONTAINER_TYPES):
+            # 其他类型先转换，转换结果可能是仍需展开的字典
+            converted = _convert_value(value)
+            if not isinstance(converted, dict):
+                parent[key] = converted
+                continue
+            value = converted
+        
+        value_id = id(value)
+        if value_id in active:
+            parent[key] = f"<循环引用: {type(value).__name__}>"
+            continue
+        active.add(value_id)
+        stack.append((None, value_id, None))
+        
+        if isinstance(value, dict):
+            # 处理字典，确保键是字符串；先按原顺序占位，保持输出的键顺序
+            result = {}
+            children = []
+            for child_key, child in value.items():
+                if not isinstance(child_key, str):
+                    child_key = str(child_key)
+                result[child_key] = None
+                children.append((result, child_key, child))
+        else:
+            # 处理列表、元组或集合
+            result = [None] * len(value)
+            children = [(result, index, child) for index, child in enumerate(value)]
+        
+        parent[key] = result
+        # 逆序入栈，使子元素按原顺序处理，重复的键仍以最后一个值为准
+        children.reverse()
+        stack.extend(children)
+    
+    return root[0]
+
+
+def safe_serialize_many(records: List[Any]) -> List[Any]:
+    """批量转换结构相同的记录，如同一查询返回的多条数据
+    
+    键与第一条记录相同的字典记录只需检查一次键类型，值为基本类型时直接使用，
+    其余值和结构不同的记录仍交给 safe_serialize 处理。
+    
+    参数:
+        records: 记录列表
+        
+    返回:
+        转换后的可序列化记录列表
+    """
+    if not records:
+        return []
+    
+    template = records[0]
+    if type(template) is not dict or not all(type(key) is str for key in template):
+        return [safe_serialize(record) for record in records]
+    
+    keys = template.keys()
+    leaf_types = _PURE_LEAF_TYPES
+    result = []
+    for record in records:
+        if type(record) is dict and record.keys() == keys:
+            result.append({
+                key: value if type(value) in leaf_types else safe_serialize(value)
+                for key, value in record.items()
+            })
+        else:
+            result.append(safe_serialize(record))
+    return result
+
+
+def _orjson_dumps(obj: Any, indent: Optional[int]) -> Optional[bytes]:
+    """使用 orjson 序列化，失败时预处理后再试一次
+    
+    参数:
+        obj: 待序列化的对象
+        indent: JSON缩进值，None表示不缩进，否则缩进两格
+        
+    返回:
+        JSON字节串，仍然失败时返回None
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, option=option, default=_orjson_default)
+    except TypeError as e:
+        logger.debug("orjson序列化失败: %s，尝试预处理...", e)
+    try:
+        return orjson.dumps(safe_serialize(obj), option=option)
+    except TypeError as e:
+        logger.debug("orjson序列化预处理后的对象失败: %s，回退到标准库json", e)
+        return None
+
+
+def _is_pure_json(obj: Any, max_depth: int = 8) -> bool:
+    """检查对象是否只由标准库json可直接编码的基本类型、列表和字典组成
+    
+    参数:
+        obj: 待检查的对象
+        max_depth: 最多检查的嵌套层数，超过时视为不是纯JSON数据
+        
+    返回:
+        是否无需扩展编码器即可序列化
+    """
+    stack = [(obj, 0)]
+    while stack:
+        value, depth = stack.pop()
+        value_type = type(value)
+        if value_type in _PURE_LEAF_TYPES:
+            continue
+        if depth >= max_depth:
+            return False
+        if value_type is dict:
+            for key, child in value.items():
+                if type(key) not in _PURE_LEAF_TYPES:
+                    return False
+                stack.append((child, depth + 1))
+        elif value_type is list or value_type is tuple:
+            stack.extend((child, depth + 1) for child in value)
+        else:
+            return False
+    return True
+
+
+def _stdlib_json_dumps(obj: Any, indent: Optional[int], ensure_ascii: bool) -> str:
+    """使用标准库json序列化，失败时预处理后再试
     
     参数:
         obj: 待序列化的对象
@@ -176,11 +366,15 @@ def safe_json_dumps(obj: Any, indent: Optional[int] = None, ensure_ascii: bool =
     返回:
         JSON字符串
     """
+    # 纯JSON数据直接使用标准库默认编码器，不经过扩展编码器的 default 回调
+    if _is_pure_json(obj):
+        return json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii)
+    
     try:
         # 尝试直接使用扩展的编码器
         return json.dumps(obj, cls=SafeJSONEncoder, indent=indent, ensure_ascii=ensure_ascii)
     except (TypeError, ValueError, OverflowError) as e:
-        logger.debug(f"使用SafeJSONEncoder序列化失败: {e}，尝试预处理...")
+        logger.debug("使用SafeJSONEncoder序列化失败: %s，尝试预处理...", e)
         
         # 如果直接序列化失败，预处理后再尝试
         safe_obj = safe_serialize(obj)
@@ -197,6 +391,70 @@ def safe_json_dumps(obj: Any, indent: Optional[int] = None, ensure_ascii: bool =
             }, ensure_ascii=ensure_ascii)
 
 
+def safe_json_bytes(obj: Any, indent: Optional[int] = None, ensure_ascii: bool = False) -> bytes:
+    """安全地将对象序列化为UTF-8编码的JSON字节串，写入文件或网络时无需再编码
+    
+    参数:
+        obj: 待序列化的对象
+        indent: JSON缩进值，None表示不缩进
+        ensure_ascii: 是否确保ASCII输出
+        
+    返回:
+        JSON字节串
+    """
+    # orjson 只支持两格缩进且不转义非ASCII字符，其余情况使用标准库
+    if orjson is not None and not ensure_ascii and indent in (None, 2):
+        result = _orjson_dumps(obj, indent)
+        if result is not None:
+            return result
+    
+    return _stdlib_json_dumps(obj, indent, ensure_ascii).encode('utf-8')
+
+
+def safe_json_dumps(obj: Any, indent: Optional[int] = None, ensure_ascii: bool = False) -> str:
+    """安全地将对象序列化为JSON字符串
+    
+    参数:
+        obj: 待序列化的对象
+        indent: JSON缩进值，None表示不缩进
+        ensure_ascii: 是否确保ASCII输出
+        
+    返回:
+        JSON字符串
+    """
+    # orjson 只支持两格缩进且不转义非ASCII字符，其余情况使用标准库
+    if orjson is not None and not ensure_ascii and indent in (None, 2):
+        result = _orjson_dumps(obj, indent)
+        if result is not None:
+            return result.decode('utf-8')
+    
+    return _stdlib_json_dumps(obj, indent, ensure_ascii)
+
+
+# 标准库解析时复用的短键字符串，多次解析结构相同的数据时共享同一个键对象
+_KEY_CACHE: Dict[str, str] = {}
+_KEY_CACHE_LIMIT = 10000
+_KEY_MAX_LENGTH = 32
+
+
+def _intern_pairs(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """标准库json解析对象时的钩子，短键从缓存中取出已有的字符串对象
+    
+    参数:
+        pairs: 解析出的键值对
+        
+    返回:
+        键已复用缓存的字典
+    """
+    if len(_KEY_CACHE) > _KEY_CACHE_LIMIT:
+        _KEY_CACHE.clear()
+    cached = _KEY_CACHE.setdefault
+    return {
+        (cached(key, key) if len(key) < _KEY_MAX_LENGTH else key): value
+        for key, value in pairs
+    }
+
+
 def safe_json_loads(json_str: str) -> Any:
     """安全地解析JSON字符串为Python对象
     
@@ -206,8 +464,19 @@ def safe_json_loads(json_str: str) -> Any:
     返回:
         解析后的Python对象，解析失败则返回None
     """
+    if not json_str:
+        return None
+    
+    # orjson 自身会缓存短键，无需额外处理
+    if orjson is not None:
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            # orjson 不接受 NaN/Infinity 等标准库允许的写法，交给标准库再解析一次
+            pass
+    
     try:
-        return json.loads(json_str) if json_str else None
+        return json.loads(json_str, object_pairs_hook=_intern_pairs)
     except json.JSONDecodeError as e:
         logger.warning(f"JSON解析失败: {e}")
         return None
@@ -225,6 +494,62 @@ def sanitize_for_json(obj: Any) -> Any:
     return safe_serialize(obj)
 
 
+# 按类缓存的转换方式：'dict' 读取实例 __dict__，'to_dict' 调用 to_dict，'slots' 读取 __slots__，'serialize' 直接安全序列化
+_STRATEGY_CACHE: Dict[type, str] = {}
+
+# 按类缓存生成的 __slots__ 转换函数，值为None表示无法生成
+_CONVERTER_CACHE: Dict[type, Optional[Callable[[Any], Dict[str, Any]]]] = {}
+
+
+def _conversion_strategy(obj: Any) -> str:
+    """取得对象所属类的转换方式，每个类只检查一次
+    
+    参数:
+        obj: 该类的一个实例
+        
+    返回:
+        转换方式名称
+    """
+    cls = type(obj)
+    strategy = _STRATEGY_CACHE.get(cls)
+    if strategy is None:
+        if hasattr(obj, '__dict__'):
+            strategy = 'dict'
+        elif hasattr(obj, 'to_dict'):
+            strategy = 'to_dict'
+        elif hasattr(obj, '__slots__'):
+            strategy = 'slots'
+        else:
+            strategy = 'serialize'
+        _STRATEGY_CACHE[cls] = strategy
+    return strategy
+
+
+def _build_slots_converter(obj: Any) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    """为只通过 __slots__ 保存属性的类生成一次性读取各公开属性的转换函数
+    
+    参数:
+        obj: 该类的一个实例
+        
+    返回:
+        转换函数，__slots__ 不是属性名序列或没有公开属性时返回None
+    """
+    slots = obj.__slots__
+    if not isinstance(slots, (tuple, list)) or not all(isinstance(slot, str) and slot.isidentifier() for slot in slots):
+        return None
+    
+    names = tuple(slot for slot in slots if not slot.startswith('_'))
+    if not names:
+        return None
+    
+    getter = operator.attrgetter(*names)
+    if len(names) == 1:
+        # 只有一个属性名时 attrgetter 直接返回属性值而不是元组
+        name = names[0]
+        return lambda obj: {name: safe_serialize(getter(obj))}
+    return lambda obj: dict(zip(names, map(safe_serialize, getter(obj))))
+
+
 def convert_to_serializable_dict(obj: Any) -> Dict[str, Any]:
     """将对象转换为可序列化的字典
     
@@ -236,22 +561,36 @@ def convert_to_serializable_dict(obj: Any) -> Dict[str, Any]:
     """
     if isinstance(obj, dict):
         return {str(k): safe_serialize(v) for k, v in obj.items()}
-        
+    
     # 尝试将对象转换为字典
     try:
-        if hasattr(obj, '__dict__'):
+        strategy = _conversion_strategy(obj)
+        
+        if strategy == 'dict':
             return {k: safe_serialize(v) for k, v in obj.__dict__.items() 
                    if not k.startswith('_')}
                    
-        elif hasattr(obj, 'to_dict'):
+        elif strategy == 'to_dict':
             return safe_serialize(obj.to_dict())
             
-        elif hasattr(obj, '__slots__'):
+        elif strategy == 'slots':
+            # 同一个类重复转换时使用生成的函数直接读取 __slots__ 属性
+            cls = type(obj)
+            try:
+                converter = _CONVERTER_CACHE[cls]
+            except KeyError:
+                converter = _CONVERTER_CACHE[cls] = _build_slots_converter(obj)
+            if converter is not None:
+                try:
+                    return converter(obj)
+                except AttributeError:
+                    # 有未赋值的属性时按常规方式逐个检查
+                    pass
             return {slot: safe_serialize(getattr(obj, slot)) for slot in obj.__slots__ 
                    if hasattr(obj, slot) and not slot.startswith('_')}
                    
     except Exception as e:
-        logger.debug(f"转换对象到字典失败: {e}")
+        logger.debug("转换对象到字典失败: %s", e)
         
     # 最后尝试使用安全序列化
     serialized = safe_serialize(obj)
@@ -259,4 +598,4 @@ def convert_to_serializable_dict(obj: Any) -> Dict[str, Any]:
         return serialized
     
     # 如果不是字典，包装在一个字典中返回
-    return {"value": serialized}
\ No newline at end of file
+    return {"value": serialized}
@@ -1,4 +1,7 @@
+import json
 import logging
+import os
+import re
 from datetime import datetime
 from typing import Any, List, Dict, Union, Optional, Tuple, TypeVar, Callable, Type, Set
 
@@ -8,6 +11,29 @@ logger = logging.getLogger(__name__)
 # 类型变量定义
 T = TypeVar('T')
 
+# 表示真假的字符串（小写、无首尾空白）
+_TRUE_STRINGS = frozenset(('true', 'yes', '1', 'y', 'on'))
+_FALSE_STRINGS = frozenset(('false', 'no', '0', 'n', 'off'))
+
+# 可转换为浮点数的十进制字符串，可带符号、小数部分和指数
+_FLOAT_RE = re.compile(r'[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?')
+
+# 预编译的校验和清理用正则表达式
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_URL_RE = re.compile(r'^(https?|ftp):\/\/[^\s/$.?#].[^\s]*$')
+# 简单的中国大陆手机号（开头为1，共11位）
+_PHONE_CN_RE = re.compile(r'^1[3-9]\d{9}$')
+# 国际通用格式（更宽松）
+_PHONE_INTL_RE = re.compile(r'^\+?[\d\s()-]{8,20}$')
+# HTML中需要移除的内容：脚本标签及内容、样式标签及内容、事件属性，合并为一个模式单次扫描
+_UNSAFE_HTML_RE = re.compile(
+    r'<script[^>]*>[\s\S]*?</script>'
+    r'|<style[^>]*>[\s\S]*?</style>'
+    r'| on\w+=["\'][^"\']*["\']',
+    re.IGNORECASE
+)
+
+
 def validate_type(value: Any, expected_type: Union[Type, Tuple[Type, ...]], 
                   param_name: str = "parameter", 
                   default: Any = None,
@@ -33,8 +59,8 @@ def validate_type(value: Any, expected_type: Union[Type, Tuple[Type, ...]],
         return value
         
     # 记录类型不匹配警告
-    logger.warning(f"参数 '{param_name}' 类型不匹配: 期望 {expected_type.__name__ if hasattr(expected_type, '__name__') else str(expected_type)}, "
-                  f"实际 {type(value).__name__}")
+    logger.warning("参数 '%s' 类型不匹配: 期望 %s, 实际 %s", param_name,
+                   getattr(expected_type, '__name__', expected_type), type(value).__name__)
     
     # 尝试类型转换
     if convert:
@@ -44,10 +70,10 @@ def validate_type(value: Any, expected_type: Union[Type, Tuple[Type, ...]],
                 converted = expected_type[0](value)
             else:
                 converted = expected_type(value)
-            logger.debug(f"参数 '{param_name}' 成功转换为 {type(converted).__name__}")
+            logger.debug("参数 '%s' 成功转换为 %s", param_name, type(converted).__name__)
             return converted
         except (TypeError, ValueError) as e:
-            logger.debug(f"参数 '{param_name}' 类型转换失败: {e}")
+            logger.debug("参数 '%s' 类型转换失败: %s", param_name, e)
     
     # 转换失败或不尝试转换，返回默认值
     return default
@@ -69,8 +95,13 @@ def validate_string(value: Any, param_name: str = "string_parameter",
     返回:
         验证后的字符串
     """
-    # 首先验证类型
-    result = validate_type(value, str, param_name, default, True)
+    # 常见类型直接处理，其余类型交给通用类型验证
+    if type(value) is str:
+        result = value
+    elif value is None and default is not None:
+        result = default
+    else:
+        result = validate_type(value, str, param_name, default, True)
     
     if not isinstance(result, str):
         return default
@@ -81,7 +112,7 @@ def validate_string(value: Any, param_name: str = "string_parameter",
     
     # 检查是否为空字符串
     if not allow_empty and not result:
-        logger.warning(f"参数 '{param_name}' 不允许为空字符串，使用默认值")
+        logger.warning("参数 '%s' 不允许为空字符串，使用默认值", param_name)
         return default
     
     # 转换为小写
@@ -106,32 +137,32 @@ def validate_int(value: Any, param_name: str = "int_parameter",
     返回:
         验证后的整数
     """
-    # 首先验证类型
-    result = validate_type(value, int, param_name, None, True)
-    
-    # 如果类型转换失败，尝试从字符串转换
-    if result is None and isinstance(value, str):
-        try:
-            value = value.strip()
-            if value.isdigit() or (value.startswith('-') and value[1:].isdigit()):
-                result = int(value)
-                logger.debug(f"参数 '{param_name}' 从字符串成功转换为整数: {result}")
-        except (ValueError, TypeError):
-            pass
+    # 常见类型直接处理，其余类型交给通用类型验证
+    if type(value) is int:
+        result = value
+    elif value is None:
+        result = None
+    elif type(value) is str:
+        # 先检查格式再转换，无效字符串不产生异常
+        value = value.strip()
+        digits = value[1:] if value[:1] in ('-', '+') else value
+        result = int(value) if digits.isdecimal() else None
+    else:
+        result = validate_type(value, int, param_name, None, True)
     
     # 如果仍然失败，返回默认值
     if result is None:
-        logger.warning(f"参数 '{param_name}' 无法转换为整数，使用默认值 {default}")
+        logger.warning("参数 '%s' 无法转换为整数，使用默认值 %s", param_name, default)
         return default
     
     # 检查最小值
     if min_value is not None and result < min_value:
-        logger.warning(f"参数 '{param_name}' 值 {result} 小于最小值 {min_value}，使用最小值")
+        logger.warning("参数 '%s' 值 %s 小于最小值 %s，使用最小值", param_name, result, min_value)
         return min_value
         
     # 检查最大值
     if max_value is not None and result > max_value:
-        logger.warning(f"参数 '{param_name}' 值 {result} 大于最大值 {max_value}，使用最大值")
+        logger.warning("参数 '%s' 值 %s 大于最大值 %s，使用最大值", param_name, result, max_value)
         return max_value
         
     return result
@@ -152,25 +183,21 @@ def validate_float(value: Any, param_name: str = "float_parameter",
     返回:
         验证后的浮点数
     """
-    # 首先验证类型
-    result = validate_type(value, (float, int), param_name, None, True)
-    
-    # 如果类型转换失败，尝试从字符串转换
-    if result is None and isinstance(value, str):
-        try:
-            value = value.strip()
-            if value and (
-                value.replace('.', '', 1).isdigit() or 
-                (value.startswith('-') and value[1:].replace('.', '', 1).isdigit())
-            ):
-                result = float(value)
-                logger.debug(f"参数 '{param_name}' 从字符串成功转换为浮点数: {result}")
-        except (ValueError, TypeError):
-            pass
+    # 常见类型直接处理，其余类型交给通用类型验证
+    if type(value) is float or type(value) is int:
+        result = value
+    elif value is None:
+        result = None
+    elif type(value) is str:
+        # 先检查格式再转换，无效字符串不产生异常
+        value = value.strip()
+        result = float(value) if _FLOAT_RE.fullmatch(value) else None
+    else:
+        result = validate_type(value, (float, int), param_name, None, True)
     
     # 如果仍然失败，返回默认值
     if result is None:
-        logger.warning(f"参数 '{param_name}' 无法转换为浮点数，使用默认值 {default}")
+        logger.warning("参数 '%s' 无法转换为浮点数，使用默认值 %s", param_name, default)
         return default
     
     # 确保结果是浮点数
@@ -178,12 +205,12 @@ def validate_float(value: Any, param_name: str = "float_parameter",
     
     # 检查最小值
     if min_value is not None and result < min_value:
-        logger.warning(f"参数 '{param_name}' 值 {result} 小于最小值 {min_value}，使用最小值")
+        logger.warning("参数 '%s' 值 %s 小于最小值 %s，使用最小值", param_name, result, min_value)
         return min_value
         
     # 检查最大值
     if max_value is not None and result > max_value:
-        logger.warning(f"参数 '{param_name}' 值 {result} 大于最大值 {max_value}，使用最大值")
+        logger.warning("参数 '%s' 值 %s 大于最大值 %s，使用最大值", param_name, result, max_value)
         return max_value
         
     return result
@@ -202,15 +229,19 @@ def validate_bool(value: Any, param_name: str = "bool_parameter",
         验证后的布尔值
     """
     # 直接布尔类型
-    if isinstance(value, bool):
+    if type(value) is bool:
         return value
         
-    # 字符串类型的布尔值
+    # 字符串类型的布尔值，已是规范写法时无需再转换大小写和去除空白
     if isinstance(value, str):
+        if value in _TRUE_STRINGS:
+            return True
+        if value in _FALSE_STRINGS:
+            return False
         value = value.lower().strip()
-        if value in ('true', 'yes', '1', 'y', 'on'):
+        if value in _TRUE_STRINGS:
             return True
-        if value in ('false', 'no', '0', 'n', 'off'):
+        if value in _FALSE_STRINGS:
             return False
     
     # 数值类型
@@ -218,7 +249,7 @@ def validate_bool(value: Any, param_name: str = "bool_parameter",
         return bool(value)
     
     # 其他类型，返回默认值
-    logger.warning(f"参数 '{param_name}' 无法转换为布尔值，使用默认值 {default}")
+    logger.warning("参数 '%s' 无法转换为布尔值，使用默认值 %s", param_name, default)
     return default
 
 
@@ -249,7 +280,6 @@ def validate_list(value: Any, param_name: str = "list_parameter",
         try:
             if isinstance(value, str):
                 # 尝试解析JSON字符串
-                import json
                 try:
                     parsed = json.loads(value)
                     if isinstance(parsed, list):
@@ -263,34 +293,43 @@ def validate_list(value: Any, param_name: str = "list_parameter",
                 # 其他类型尝试转换为列表
                 value = list(value)
         except (TypeError, ValueError):
-            logger.warning(f"参数 '{param_name}' 无法转换为列表，使用默认值")
+            logger.warning("参数 '%s' 无法转换为列表，使用默认值", param_name)
             return default
     
     # 转换为列表类型
     result = list(value)
     
-    # 验证列表项类型
+    # 验证列表项类型：转为字符串在C层一次完成；所有项都已是目标类型时无需逐项处理
+    if item_type is str:
+        try:
+            result = list(map(str, result))
+            item_type = None
+        except Exception:
+            pass
+    elif item_type is not None and all(isinstance(item, item_type) for item in result):
+        item_type = None
+    
     if item_type is not None:
         valid_items = []
         for i, item in enumerate(result):
             if not isinstance(item, item_type):
                 try:
                     item = item_type(item)
-                    logger.debug(f"列表参数 '{param_name}' 的项 {i} 成功转换为 {item_type.__name__}")
+                    logger.debug("列表参数 '%s' 的项 %s 成功转换为 %s", param_name, i, item_type.__name__)
                 except (TypeError, ValueError):
-                    logger.warning(f"列表参数 '{param_name}' 的项 {i} 无法转换为 {item_type.__name__}，跳过")
+                    logger.warning("列表参数 '%s' 的项 %s 无法转换为 %s，跳过", param_name, i, item_type.__name__)
                     continue
             valid_items.append(item)
         result = valid_items
     
     # 检查最小长度
     if min_length is not None and len(result) < min_length:
-        logger.warning(f"列表参数 '{param_name}' 长度 {len(result)} 小于最小长度 {min_length}，使用默认值")
+        logger.warning("列表参数 '%s' 长度 %s 小于最小长度 %s，使用默认值", param_name, len(result), min_length)
         return default
         
     # 检查最大长度
     if max_length is not None and len(result) > max_length:
-        logger.warning(f"列表参数 '{param_name}' 长度 {len(result)} 大于最大长度 {max_length}，截断")
+        logger.warning("列表参数 '%s' 长度 %s 大于最大长度 %s，截断", param_name, len(result), max_length)
         result = result[:max_length]
         
     return result
@@ -319,7 +358,6 @@ def validate_dict(value: Any, param_name: str = "dict_parameter",
         try:
             if isinstance(value, str):
                 # 尝试解析JSON字符串
-                import json
                 try:
                     parsed = json.loads(value)
                     if isinstance(parsed, dict):
@@ -331,19 +369,56 @@ def validate_dict(value: Any, param_name: str = "dict_parameter",
             else:
                 raise TypeError(f"无法将类型 {type(value).__name__} 转换为字典")
         except (TypeError, ValueError) as e:
-            logger.warning(f"参数 '{param_name}' 无法转换为字典: {e}，使用默认值")
+            logger.warning("参数 '%s' 无法转换为字典: %s，使用默认值", param_name, e)
             return default
     
     # 检查必须的键
     if required_keys:
         missing_keys = required_keys - set(value.keys())
         if missing_keys:
-            logger.warning(f"字典参数 '{param_name}' 缺少必需键: {missing_keys}，使用默认值")
+            logger.warning("字典参数 '%s' 缺少必需键: %s，使用默认值", param_name, missing_keys)
             return default
             
     return value
 
 
+# 按可选值元组缓存的查找表：(可选值元组, 可选值集合, 小写字符串到可选值, 类型到{可选值: 首次出现位置})
+_CHOICE_LOOKUP_CACHE: Dict[tuple, Tuple[tuple, frozenset, Dict[str, Any], Dict[type, Dict[Any, int]]]] = {}
+_CHOICE_LOOKUP_CACHE_LIMIT = 256
+
+
+def _choice_lookup(choices: List[Any]) -> Optional[Tuple[tuple, frozenset, Dict[str, Any], Dict[type, Dict[Any, int]]]]:
+    """取得可选值列表对应的查找表，相同的可选值只构建一次
+    
+    参数:
+        choices: 可选值列表
+        
+    返回:
+        查找表，可选值不可哈希时返回None
+    """
+    # 缓存键包含类型，避免相等但类型不同的可选值（如 1、1.0、True）共用同一查找表
+    key = tuple((type(choice), choice) for choice in choices)
+    try:
+        return _CHOICE_LOOKUP_CACHE[key]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+    
+    choice_tuple = tuple(choices)
+    lower_map = {}
+    by_type = {}
+    for index, choice in enumerate(choice_tuple):
+        if isinstance(choice, str):
+            lower_map.setdefault(choice.lower(), choice)
+        by_type.setdefault(type(choice), {}).setdefault(choice, index)
+    
+    if len(_CHOICE_LOOKUP_CACHE) >= _CHOICE_LOOKUP_CACHE_LIMIT:
+        _CHOICE_LOOKUP_CACHE.clear()
+    lookup = _CHOICE_LOOKUP_CACHE[key] = (choice_tuple, frozenset(choice_tuple), lower_map, by_type)
+    return lookup
+
+
 def validate_choice(value: Any, choices: List[T], param_name: str = "choice_parameter",
                    default: Optional[T] = None, case_sensitive: bool = False) -> T:
     """验证选择参数
@@ -360,17 +435,49 @@ def validate_choice(value: Any, choices: List[T], param_name: str = "choice_para
     """
     # 确保有choices可选
     if not choices:
-        logger.error(f"参数 '{param_name}' 的choices列表为空")
+        logger.error("参数 '%s' 的choices列表为空", param_name)
         return default
         
     # 设置默认值为第一个选项（如果未提供）
     if default is None:
         default = choices[0]
     elif default not in choices:
-        logger.warning(f"默认值 {default} 不在choices列表中，使用第一个选项")
+        logger.warning("默认值 %s 不在choices列表中，使用第一个选项", default)
         default = choices[0]
     
-    # 检查value是否在choices中
+    lookup = _choice_lookup(choices)
+    if lookup is not None:
+        choice_tuple, choice_set, lower_map, by_type = lookup
+        
+        # 检查value是否在choices中
+        try:
+            if value in choice_set:
+                return value
+        except TypeError:
+            pass
+        
+        # 字符串特殊处理（不区分大小写比较）
+        if isinstance(value, str) and not case_sensitive:
+            choice = lower_map.get(value.lower())
+            if choice is not None:
+                return choice
+        
+        # 按每种可选值的类型转换一次再查找，多个类型都命中时取列表中靠前的选项
+        best_index = None
+        for choice_type, indexes in by_type.items():
+            try:
+                index = indexes.get(choice_type(value))
+            except (TypeError, ValueError):
+                continue
+            if index is not None and (best_index is None or index < best_index):
+                best_index = index
+        if best_index is not None:
+            return choice_tuple[best_index]
+        
+        logger.warning("参数 '%s' 值 %s 不在可选值 %s 中，使用默认值 %s", param_name, value, choices, default)
+        return default
+    
+    # 可选值不可哈希时逐个比较
     if value in choices:
         return value
         
@@ -389,7 +496,7 @@ def validate_choice(value: Any, choices: List[T], param_name: str = "choice_para
         except (TypeError, ValueError):
             continue
     
-    logger.warning(f"参数 '{param_name}' 值 {value} 不在可选值 {choices} 中，使用默认值 {default}")
+    logger.warning("参数 '%s' 值 %s 不在可选值 %s 中，使用默认值 %s", param_name, value, choices, default)
     return default
 
 
@@ -424,20 +531,20 @@ def validate_date(value: Any, param_name: str = "date_parameter",
             try:
                 result = datetime.strptime(value, format_str)
             except ValueError:
-                logger.warning(f"参数 '{param_name}' 无法按格式 '{format_str}' 解析日期，使用默认值")
+                logger.warning("参数 '%s' 无法按格式 '%s' 解析日期，使用默认值", param_name, format_str)
                 return default
         else:
-            logger.warning(f"参数 '{param_name}' 类型 {type(value).__name__} 无法转换为日期，使用默认值")
+            logger.warning("参数 '%s' 类型 %s 无法转换为日期，使用默认值", param_name, type(value).__name__)
             return default
     
     # 检查最小日期
     if min_date is not None and result < min_date:
-        logger.warning(f"参数 '{param_name}' 日期 {result} 早于最小日期 {min_date}，使用最小日期")
+        logger.warning("参数 '%s' 日期 %s 早于最小日期 %s，使用最小日期", param_name, result, min_date)
         return min_date
         
     # 检查最大日期
     if max_date is not None and result > max_date:
-        logger.warning(f"参数 '{param_name}' 日期 {result} 晚于最大日期 {max_date}，使用最大日期")
+        logger.warning("参数 '%s' 日期 %s 晚于最大日期 %s，使用最大日期", param_name, result, max_date)
         return max_date
         
     return result
@@ -452,9 +559,7 @@ def is_valid_email(email: str) -> bool:
     返回:
         是否为有效邮箱
     """
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def is_valid_url(url: str) -> bool:
@@ -466,9 +571,7 @@ def is_valid_url(url: str) -> bool:
     返回:
         是否为有效URL
     """
-    import re
-    pattern = r'^(https?|ftp):\/\/[^\s/$.?#].[^\s]*$'
-    return bool(re.match(pattern, url))
+    return bool(_URL_RE.match(url))
 
 
 def is_valid_phone(phone: str, region: str = 'CN') -> bool:
@@ -481,39 +584,78 @@ def is_valid_phone(phone: str, region: str = 'CN') -> bool:
     返回:
         是否为有效手机号
     """
-    import re
-    # 简单的中国大陆手机号验证（开头为1，共11位）
     if region == 'CN':
-        pattern = r'^1[3-9]\d{9}$'
-        return bool(re.match(pattern, phone))
+        return bool(_PHONE_CN_RE.match(phone))
     
-    # 国际通用格式验证（更宽松）
-    pattern = r'^\+?[\d\s()-]{8,20}$'
-    return bool(re.match(pattern, phone))
+    return bool(_PHONE_INTL_RE.match(phone))
 
 
-def sanitize_html(html: str) -> str:
-    """清理HTML内容，移除潜在危险标签
+def _match_batch(pattern: re.Pattern, values: List[str]) -> List[bool]:
+    """用同一个正则表达式批量匹配，逐项调用由 map 在C层完成
     
     参数:
-        html: HTML内容
+        pattern: 预编译的正则表达式
+        values: 待验证的字符串列表
         
     返回:
-        清理后的HTML
+        与 values 一一对应的匹配结果
     """
-    # 简单实现，移除脚本和样式标签及其内容
-    import re
+    return [match is not None for match in map(pattern.match, values)]
+
+
+def is_valid_email_batch(emails: List[str]) -> List[bool]:
+    """批量验证邮箱格式
     
-    # 移除脚本标签及内容
-    html = re.sub(r'<script[^>]*>[\s\S]*?</script>', '', html)
+    参数:
+        emails: 待验证的邮箱地址列表
+        
+    返回:
+        与 emails 一一对应的验证结果
+    """
+    return _match_batch(_EMAIL_RE, emails)
+
+
+def is_valid_url_batch(urls: List[str]) -> List[bool]:
+    """批量验证URL格式
     
-    # 移除样式标签及内容
-    html = re.sub(r'<style[^>]*>[\s\S]*?</style>', '', html)
+    参数:
+        urls: 待验证的URL列表
+        
+    返回:
+        与 urls 一一对应的验证结果
+    """
+    return _match_batch(_URL_RE, urls)
+
+
+def is_valid_phone_batch(phones: List[str], region: str = 'CN') -> List[bool]:
+    """批量验证手机号格式
     
-    # 移除事件属性
-    html = re.sub(r' on\w+=["\'][^"\']*["\']', '', html)
+    参数:
+        phones: 待验证的手机号列表
+        region: 国家/地区代码，默认中国大陆
+        
+    返回:
+        与 phones 一一对应的验证结果
+    """
+    return _match_batch(_PHONE_CN_RE if region == 'CN' else _PHONE_INTL_RE, phones)
+
+
+def sanitize_html(html: str) -> str:
+    """清理HTML内容，移除潜在危险标签
     
-    return html
+    参数:
+        html: HTML内容
+        
+    返回:
+        清理后的HTML
+    """
+    # 简单实现，一次扫描移除脚本和样式标签及其内容，以及事件属性
+    return _UNSAFE_HTML_RE.sub('', html)
+
+
+# 按允许列表缓存的小写扩展名集合
+_EXTENSION_CACHE: Dict[tuple, frozenset] = {}
+_EXTENSION_CACHE_LIMIT = 64
 
 
 def validate_file_extension(filename: str, allowed_extensions: List[str]) -> bool:
@@ -526,11 +668,18 @@ def validate_file_extension(filename: str, allowed_extensions: List[str]) -> boo
     返回:
         扩展名是否有效
     """
-    import os
     extension = os.path.splitext(filename)[1].lower()
     
     # 移除点号
     if extension.startswith('.'):
         extension = extension[1:]
+    
+    # 相同的允许列表只转换一次小写
+    key = tuple(allowed_extensions)
+    allowed = _EXTENSION_CACHE.get(key)
+    if allowed is None:
+        if len(_EXTENSION_CACHE) >= _EXTENSION_CACHE_LIMIT:
+            _EXTENSION_CACHE.clear()
+        allowed = _EXTENSION_CACHE[key] = frozenset(ext.lower() for ext in key)
         
-    return extension.lower() in [ext.lower() for ext in allowed_extensions]
\ No newline at end of file
+    return extension in allowed
\ No newline at end of file